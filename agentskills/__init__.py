@@ -36,18 +36,9 @@ from .validator import validate, validate_metadata
 # Discovery
 from .discovery import discover_skills
 
-# Agent Model
-from .agent_model import get_bedrock_agent_model
-
 # Prompt generation
 from .prompt import generate_skills_prompt, generate_default_system_prompt, generate_skill_instructions_prompt
 
-# Tool (Inline Mode)
-from .tool import create_skill_tool
-
-# Agent Tool (Agent as Tool Mode)
-from .tool import create_skill_agent_tool
-
 # Errors
 from .errors import (
     SkillError,
@@ -59,6 +50,29 @@ from .errors import (
 
 __version__ = "1.0.0"
 
+# Exports that depend on strands are imported on first access, so importing
+# agentskills (e.g. for agentskills.prompt paths) doesn't pull in the SDK
+_LAZY_EXPORTS = {
+    # Agent Model
+    "get_bedrock_agent_model": ".agent_model",
+    # Tool (Inline Mode)
+    "create_skill_tool": ".tool",
+    # Agent Tool (Agent as Tool Mode)
+    "create_skill_agent_tool": ".tool",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value  # Cache so __getattr__ runs once per name
+    return value
+
+
 __all__ = [
     # Models
     "SkillProperties",
@@ -12,9 +12,11 @@ ROOT_DIR = Path(__file__).parent.parent  # Project root
 SCRATCH_DIR = ROOT_DIR / "_scratch"
 OUTPUT_DIR = ROOT_DIR / "_output"
 
-# Ensure directories exist
-SCRATCH_DIR.mkdir(parents=True, exist_ok=True)
-OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+def ensure_work_dirs() -> None:
+    """Create the scratch and output directories (on first use, not at import)"""
+    SCRATCH_DIR.mkdir(parents=True, exist_ok=True)
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 
 DEFAULT_SYSTEM_PROMPT = """
@@ -130,6 +132,8 @@ def generate_skills_prompt(skills: List[SkillProperties]) -> str:
 
 def generate_default_system_prompt() -> str:
     """Generate default system prompt"""
+    # The prompt points the agent at these directories, so make sure they exist
+    ensure_work_dirs()
     return DEFAULT_SYSTEM_PROMPT.format(
         root_dir=str(ROOT_DIR.resolve())
     )
@@ -142,4 +146,4 @@ def generate_skill_instructions_prompt(instructions: str) -> str:
     )
 
 
-__all__ = ["generate_skills_prompt", "generate_default_system_prompt", "generate_skill_instructions_prompt"]
+__all__ = ["ensure_work_dirs", "generate_skills_prompt", "generate_default_system_prompt", "generate_skill_instructions_prompt"]
@@ -10,7 +10,7 @@ import logging
 from pathlib import Path
 from typing import List, Optional, Any, AsyncIterator
 
-from strands import tool, Agent
+from strands import tool, Agent, ToolContext
 from strands.models import Model
 
 from ..models import SkillProperties
@@ -56,8 +56,8 @@ def create_skill_agent_tool(
     # Default model
     model = base_agent_model or get_bedrock_agent_model(thinking=True)
 
-    @tool
-    async def use_skill(skill_name: str, request: str) -> AsyncIterator:
+    @tool(context=True)
+    async def use_skill(skill_name: str, request: str, tool_context: ToolContext) -> AsyncIterator:
         """Execute a skill in an isolated sub-agent with real-time streaming.
 
         This tool activates a specialized skill and runs it in a separate agent
@@ -94,7 +94,8 @@ def create_skill_agent_tool(
 
             # Stream events from sub-agent and yield them wrapped in dict
             # This pattern is from Strands SDK documentation: "Sub-Agent Streaming Example"
-            async for event in sub_agent.stream_async(request):
+            # The parent's cancel signal also stops the sub-agent (e.g. on client disconnect)
+            async for event in sub_agent.stream_async(request, cancel_signal=tool_context.cancel_signal):
                 # Yield each event wrapped in dict for main agent to process
                 yield {
                     "skill_name": skill_name,
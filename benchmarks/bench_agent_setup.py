@@ -0,0 +1,58 @@
+"""
+Benchmark per-request agent setup overhead in the AgentCore entrypoint
+
+Compares building a new BedrockModel + Agent per request (previous behaviour)
+with checking a prepared agent out of AGENT_POOL (current behaviour).
+No model calls are made, so no AWS credentials are needed.
+
+Usage:
+    python benchmarks/bench_agent_setup.py [iterations]
+"""
+import os
+import sys
+import time
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("AWS_REGION", "ap-northeast-1")
+
+from agentcore_entrypoint import DEFAULT_MODEL_ID, DEFAULT_PROFILE
+from utils.agent_profiles import PROFILES
+from utils.agent_pool import AgentPool
+
+
+def measure(label, setup, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        setup()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<28} mean {statistics.mean(timings):8.3f} ms   p50 {statistics.median(timings):8.3f} ms   p95 {p95:8.3f} ms")
+    return statistics.mean(timings)
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(f"Per-request agent setup ({iterations} iterations, profile {DEFAULT_PROFILE}, model {DEFAULT_MODEL_ID})")
+    print("=" * 80)
+
+    key = (DEFAULT_PROFILE, DEFAULT_MODEL_ID)
+    before = measure("fresh Agent per request", lambda: PROFILES.build_agent(key), iterations)
+
+    pool = AgentPool(PROFILES.build_agent)
+
+    def pooled():
+        agent = pool.checkout(key)
+        pool.checkin(key, agent)
+
+    pooled()  # Warm the pool (first request pays for construction)
+    after = measure("AgentPool checkout/checkin", pooled, iterations)
+
+    print("=" * 80)
+    print(f"Speedup: {before / after:.1f}x (created {pool.created}, reused {pool.reused})")
+
+
+if __name__ == "__main__":
+    main()
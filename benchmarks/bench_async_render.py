@@ -0,0 +1,112 @@
+"""
+Benchmark of BaseStreamRenderer.aprocess against a slow sink
+
+Replays the synthetic stream of bench_stream_dispatch.py as an async model
+stream (one event every --event-delay ms) into a sink that costs --write-delay
+ms per write (a slow SSE client, a Streamlit placeholder update), and compares:
+
+    sync:   for event in stream: for out in renderer.process(event): await sink(out)
+    aprocess: async for out in renderer.aprocess(stream): await sink(out)
+
+Reports total time, sink writes, and how long the model stream was stalled
+(time from yielding an event until the consumer asked for the next one).
+Outputs are checked to carry the same content. No model calls are made, so no AWS credentials are needed.
+
+Usage:
+    python benchmarks/bench_async_render.py [--turns N] [--event-delay MS] [--write-delay MS]
+                                       [--renderer sse|streamlit] [--flush-interval MS]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_stream_dispatch import synthetic_turn
+from utils.strands_stream import SSEStreamRenderer, StreamlitStreamRenderer, StrandsEventParser
+
+RENDERERS = {"sse": SSEStreamRenderer, "streamlit": StreamlitStreamRenderer}
+
+
+class ModelStream:
+    """Async event stream paced like a model; records time spent waiting for the consumer"""
+
+    def __init__(self, events, event_delay):
+        self.events = events
+        self.event_delay = event_delay
+        self.stalled = 0.0
+
+    async def __aiter__(self):
+        for event in self.events:
+            await asyncio.sleep(self.event_delay)
+            # Time suspended at yield is time the model stream waits for the consumer
+            ready = time.perf_counter()
+            yield event
+            self.stalled += time.perf_counter() - ready
+
+
+class SlowSink:
+    def __init__(self, write_delay):
+        self.write_delay = write_delay
+        self.writes = 0
+        self.content = []
+
+    async def write(self, output):
+        self.writes += 1
+        self.content.append(output if isinstance(output, str) else output.content)
+        await asyncio.sleep(self.write_delay)
+
+
+async def run_sync(renderer, stream, sink):
+    async for event in stream.__aiter__():
+        for output in renderer.process(event):
+            await sink.write(output)
+
+
+async def run_async(renderer, stream, sink, flush_interval):
+    async for output in renderer.aprocess(stream.__aiter__(), flush_interval=flush_interval):
+        await sink.write(output)
+
+
+async def measure(label, runner, events, args):
+    renderer = RENDERERS[args.renderer](StrandsEventParser())
+    stream = ModelStream(events, args.event_delay / 1000)
+    sink = SlowSink(args.write_delay / 1000)
+    start = time.perf_counter()
+    await runner(renderer, stream, sink)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<9} total {elapsed:7.2f} s   writes {sink.writes:6d}   "
+        f"model stream stalled {stream.stalled:7.2f} s"
+    )
+    return "".join(sink.content)
+
+
+async def main_async(args):
+    events = [event for turn in range(args.turns) for event in synthetic_turn(turn)]
+    print(
+        f"Async rendering ({len(events)} events, {args.renderer}, event every {args.event_delay} ms, "
+        f"{args.write_delay} ms per sink write)"
+    )
+    print("=" * 80)
+    before = await measure("sync", run_sync, events, args)
+    after = await measure(
+        "aprocess", lambda r, s, k: run_async(r, s, k, args.flush_interval / 1000), events, args
+    )
+    assert before == after, "aprocess changed the rendered content"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--event-delay", type=float, default=1, help="Milliseconds between model events")
+    parser.add_argument("--write-delay", type=float, default=3, help="Milliseconds per sink write")
+    parser.add_argument("--renderer", choices=sorted(RENDERERS), default="sse")
+    parser.add_argument("--flush-interval", type=float, default=20, help="aprocess flush interval in ms")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Benchmark of StreamChannels with a chatty sub-agent and a slow sub-agent sink
+
+Streams main-agent text deltas interleaved with --sub-ratio sub-agent deltas
+(use_skill's tool_stream_event) per main delta, one main delta every --tick
+ms, into two sinks: the main agent's (fast) and the sub-agent's, which costs
+--sub-write ms per write (e.g. a slow expander). Compares:
+
+    flat:     one consumer, renderer.process per raw event, writes in order
+    channels: StreamChannels, one consumer per source (renderer.handle)
+
+and reports the latency of main-agent text (model output to sink write),
+when each sink finished, and the sub-agent channel's buffer high water and
+coalesced deltas. The text written per source is checked to be identical.
+No model calls are made, so no AWS credentials are needed.
+
+Usage:
+    python benchmarks/bench_channels.py [--main N] [--sub-ratio R] [--tick MS] [--sub-write MS] [--max-buffer N]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.strands_stream import StreamChannels, StreamlitStreamRenderer, StrandsEventParser
+
+SKILL_USE = {"toolUseId": "skill_0", "name": "use_skill", "input": {"skill_name": "pptx"}}
+
+
+def events(main, sub_ratio):
+    """(is_main, raw event) pairs: each main delta followed by sub_ratio sub-agent deltas"""
+    stream = []
+    for i in range(main):
+        text = f"m{i} "
+        stream.append((True, {"data": text, "delta": {"text": text}}))
+        for j in range(sub_ratio):
+            sub = f"s{i}.{j} "
+            sub_event = {"data": sub, "delta": {"text": sub}}
+            stream.append((False, {"tool_stream_event": {"tool_use": SKILL_USE, "data": {"skill_name": "pptx", "event": sub_event}}}))
+    return stream
+
+
+class Source:
+    """Raw stream on the model's timeline; records when each main delta was produced
+
+    A consumer that reads late does not shift the timeline (the model keeps
+    generating), so the wait shows up as latency.
+    """
+
+    def __init__(self, stream, tick):
+        self.stream = stream
+        self.tick = tick
+        self.arrived: dict[str, float] = {}
+
+    async def __aiter__(self):
+        due = time.perf_counter()
+        for is_main, raw in self.stream:
+            if is_main:
+                due += self.tick
+                wait = due - time.perf_counter()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self.arrived[raw["data"]] = due
+            yield raw
+
+
+class Sink:
+    def __init__(self, write_delay, arrived=None):
+        self.write_delay = write_delay
+        self.arrived = arrived
+        self.text = []
+        self.latencies = []
+        self.finished = 0.0
+
+    async def write(self, output):
+        self.text.append(output.content)
+        if self.arrived is not None:
+            self.latencies.append(time.perf_counter() - self.arrived[output.content])
+        await asyncio.sleep(self.write_delay)
+        self.finished = time.perf_counter()
+
+
+async def run_flat(source, sinks, args):
+    renderer = StreamlitStreamRenderer(StrandsEventParser())
+    async for raw in source.__aiter__():
+        for output in renderer.process(raw):
+            await sinks[output.source].write(output)
+    return None
+
+
+async def run_channels(source, sinks, args):
+    channels = StreamChannels(source.__aiter__(), max_buffer=args.max_buffer)
+
+    async def drain(name):
+        renderer = StreamlitStreamRenderer(StrandsEventParser())
+        async for event in channels.channel(name):
+            for output in renderer.handle(event):
+                await sinks[output.source].write(output)
+
+    async with channels:
+        tasks = [asyncio.create_task(drain(name)) async for name in channels.sources()]
+        await asyncio.gather(*tasks)
+    return channels.stats()["pptx"]
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+async def measure(label, runner, stream, args):
+    source = Source(stream, args.tick / 1000)
+    sinks = {None: Sink(0, source.arrived), "pptx": Sink(args.sub_write / 1000)}
+    start = time.perf_counter()
+    stats = await runner(source, sinks, args)
+    main, sub = sinks[None], sinks["pptx"]
+    line = (
+        f"{label:<9} main latency p50 {percentile(main.latencies, 0.5) * 1000:7.1f} p99 "
+        f"{percentile(main.latencies, 0.99) * 1000:7.1f} max {max(main.latencies) * 1000:7.1f} ms   "
+        f"main done {main.finished - start:6.2f} s   sub done {sub.finished - start:6.2f} s   "
+        f"sub writes {len(sub.text):5d}"
+    )
+    if stats:
+        line += f"   sub buffer high water {stats['high_water']}, coalesced {stats['coalesced']}"
+    print(line)
+    return "".join(main.text), "".join(sub.text)
+
+
+async def main_async(args):
+    stream = events(args.main, args.sub_ratio)
+    print(
+        f"Per-source channels ({args.main} main deltas every {args.tick} ms, {args.sub_ratio} sub-agent deltas each, "
+        f"{args.sub_write} ms per sub-agent write, max_buffer {args.max_buffer})"
+    )
+    print("=" * 80)
+    before = await measure("flat", run_flat, stream, args)
+    after = await measure("channels", run_channels, stream, args)
+    assert before == after, "channels changed the text of a source"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--main", type=int, default=500, help="Main-agent text deltas")
+    parser.add_argument("--sub-ratio", type=int, default=3, help="Sub-agent deltas per main delta")
+    parser.add_argument("--tick", type=float, default=2, help="Milliseconds between main deltas")
+    parser.add_argument("--sub-write", type=float, default=2, help="Milliseconds per sub-agent sink write")
+    parser.add_argument("--max-buffer", type=int, default=64, help="StreamChannels max_buffer")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark of CompactStreamRenderer against SSEStreamRenderer
+
+Renders the trace of bench_sse_encoding.py (synthetic, or a recorded trace
+from benchmarks/traces/) with both renderers and reports
+bytes on the wire (raw and gzip), server encode rate, and client decode rate:
+splitting SSE frames + json.loads versus CompactStreamDecoder fed in chunks of
+--chunk bytes (so messages straddle reads). Decoded compact payloads are
+checked to equal the SSE payloads. Uses msgpack when installed, otherwise the
+pure-Python codec in utils/strands_stream/wire.py.
+No model calls are made, so no AWS credentials are needed.
+
+Usage:
+    python benchmarks/bench_compact_wire.py [--turns N | --trace FILE] [--repeat R] [--chunk BYTES]
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_sse_encoding import trace
+from utils.strands_stream import CompactStreamDecoder, CompactStreamRenderer, SSEStreamRenderer
+from utils.strands_stream.wire import MSGPACK_AVAILABLE
+
+
+def encode(renderer_cls, events, repeat):
+    best = 0.0
+    for _ in range(repeat):
+        renderer = renderer_cls()
+        start = time.perf_counter()
+        outputs = [output for event in events for output in renderer.process(event)]
+        best = max(best, len(events) / (time.perf_counter() - start))
+    return best, outputs
+
+
+def decode_sse(stream: bytes, chunk: int) -> list[dict]:
+    payloads = []
+    pending = b""
+    for i in range(0, len(stream), chunk):
+        pending += stream[i:i + chunk]
+        frames = pending.split(b"\n\n")
+        pending = frames.pop()
+        for frame in frames:
+            payloads.append(json.loads(frame[len(b"data: "):]))
+    return payloads
+
+
+def decode_compact(stream: bytes, chunk: int) -> list[dict]:
+    decoder = CompactStreamDecoder()
+    payloads = []
+    for i in range(0, len(stream), chunk):
+        payloads.extend(decoder.feed(stream[i:i + chunk]))
+    return payloads
+
+
+def timed(decode, stream, chunk, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        payloads = decode(stream, chunk)
+        best = min(best, time.perf_counter() - start)
+    return best, payloads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--trace", help="Recorded trace (e.g. benchmarks/traces/pptx_skill.trace) instead of synthetic turns")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--chunk", type=int, default=4096, help="Bytes per client read")
+    args = parser.parse_args()
+
+    events = trace(args.turns, args.trace)
+    print(
+        f"Compact wire format ({args.trace or f'{args.turns} turns'}, {len(events)} events, best of {args.repeat}, "
+        f"msgpack {'C extension' if MSGPACK_AVAILABLE else 'pure Python'})"
+    )
+    print("=" * 80)
+
+    sse_rate, sse_out = encode(SSEStreamRenderer, events, args.repeat)
+    compact_rate, compact_out = encode(CompactStreamRenderer, events, args.repeat)
+    sse_stream = "".join(sse_out).encode("utf-8")
+    compact_stream = b"".join(compact_out)
+
+    sse_time, sse_payloads = timed(decode_sse, sse_stream, args.chunk, args.repeat)
+    compact_time, compact_payloads = timed(decode_compact, compact_stream, args.chunk, args.repeat)
+    assert compact_payloads == sse_payloads, "compact payloads differ from SSE"
+
+    for label, rate, stream, decode_time in (
+        ("sse", sse_rate, sse_stream, sse_time),
+        ("compact", compact_rate, compact_stream, compact_time),
+    ):
+        print(
+            f"{label:<8} {len(stream) / 1024:9.1f} KiB ({len(gzip.compress(stream)) / 1024:7.1f} KiB gzip)   "
+            f"encode {rate:10,.0f} events/s   decode {len(sse_payloads) / decode_time:10,.0f} payloads/s"
+        )
+    print(f"bytes: compact / sse = {len(compact_stream) / len(sse_stream):.2f}")
+
+
+if __name__ == "__main__":
+    main()
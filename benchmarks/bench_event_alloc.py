@@ -0,0 +1,129 @@
+"""
+Allocation benchmark of the event classes on the per-token path
+
+Compares the slotted event classes with the previous __dict__-based ones:
+
+    sizes:  bytes allocated per instance of every event class
+    tokens: StreamlitStreamRenderer on text deltas, with every output held
+            (like a backed-up aprocess buffer or sink); events/s and memory
+            retained per 1000 tokens
+
+before: __dict__ events and StreamOutputs (previous behaviour).
+after: slotted events and StreamOutputs.
+No model calls are made, so no AWS credentials are needed.
+
+Usage:
+    python benchmarks/bench_event_alloc.py [--tokens N] [--repeat R]
+"""
+import argparse
+import dataclasses
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_stream_dispatch import ANSWER, text_deltas
+from utils.strands_stream import StrandsEventParser, StreamlitStreamRenderer, events
+from utils.strands_stream.events import BaseEvent, StreamOutput, TextEvent
+
+EVENT_CLASSES = [
+    cls for cls in vars(events).values()
+    if isinstance(cls, type) and dataclasses.is_dataclass(cls) and cls.__module__ == events.__name__
+]
+
+
+def dict_twin(cls):
+    """The same dataclass without slots (the previous definition)"""
+    namespace = {name: value for name, value in vars(cls).items() if isinstance(value, property)}
+    fields = [(f.name, f.type, dataclasses.field(default=f.default)) for f in dataclasses.fields(cls)]
+    bases = (BaseEvent,) if issubclass(cls, BaseEvent) else ()
+    return dataclasses.make_dataclass(cls.__name__, fields, bases=bases, namespace=namespace)
+
+
+DictTextEvent = dict_twin(TextEvent)
+DictStreamOutput = dict_twin(StreamOutput)
+
+
+def instance_size(cls, count=1000):
+    """Traced bytes per instance with all fields set (field values are shared)"""
+    kwargs = {f.name: "x" for f in dataclasses.fields(cls)}
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    instances = [cls(**kwargs) for _ in range(count)]
+    size = tracemalloc.get_traced_memory()[0] - baseline - sys.getsizeof(instances)
+    tracemalloc.stop()
+    return size // count
+
+
+class BaselineParser(StrandsEventParser):
+    """Text fast path creating __dict__ TextEvents"""
+
+    def parse(self, event, debug=False):
+        delta = event.get("delta")
+        if delta.__class__ is dict and "text" in delta and "data" in event:
+            chunk_text = event["data"]
+            return [DictTextEvent(data=chunk_text, source=None)] if chunk_text else []
+        return self._parse_event(event)
+
+
+class BaselineStreamlit(StreamlitStreamRenderer):
+    """Wraps every text chunk in a __dict__ StreamOutput"""
+
+    HANDLERS = {**StreamlitStreamRenderer.HANDLERS, DictTextEvent: "on_text"}
+
+    def on_text(self, event):
+        if event.source in self.current_reasoning_active:
+            self.current_reasoning_active[event.source] = False
+        return DictStreamOutput(content=event.data, source=event.source, event_type="text")
+
+
+def run(make_renderer, tokens, repeat):
+    best = 0.0
+    for _ in range(repeat):
+        process = make_renderer().process
+        start = time.perf_counter()
+        held = [process(event) for event in tokens]
+        best = max(best, len(tokens) / (time.perf_counter() - start))
+    del held
+
+    process = make_renderer().process
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    held = [process(event) for event in tokens]
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    content = "".join(output.content for outputs in held for output in outputs)
+    return best, retained / len(tokens) * 1000 / 1024, content
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print("Bytes allocated per instance (all fields set)")
+    print("=" * 80)
+    for cls in EVENT_CLASSES:
+        before, after = instance_size(dict_twin(cls)), instance_size(cls)
+        print(f"{cls.__name__:<28} before {before:4d} B   after {after:4d} B")
+
+    deltas = text_deltas(ANSWER * 4)
+    tokens = (deltas * (args.tokens // len(deltas) + 1))[:args.tokens]
+    print(f"\nStreamlitStreamRenderer, {len(tokens)} text deltas, outputs held (best of {args.repeat})")
+    print("=" * 80)
+    results = {}
+    for label, make_renderer in (
+        ("before", lambda: BaselineStreamlit(BaselineParser())),
+        ("after", lambda: StreamlitStreamRenderer(StrandsEventParser())),
+    ):
+        rate, per_1000, content = run(make_renderer, tokens, args.repeat)
+        results[label] = content
+        print(f"{label:<7} {rate:10,.0f} events/s   retained {per_1000:6.1f} KiB per 1000 tokens")
+    assert results["before"] == results["after"], "rendered text differs"
+
+
+if __name__ == "__main__":
+    main()
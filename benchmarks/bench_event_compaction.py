@@ -0,0 +1,91 @@
+"""
+Benchmark wire volume of the entrypoint stream in verbose vs compact mode
+
+Replays a synthetic invocation shaped like a real deck-generation turn
+(token-level text deltas, streamed tool input JSON, shell output chunks as
+tool_stream_events) through EventCompactor and reports events and SSE bytes.
+No model calls are made, so no AWS credentials are needed.
+
+Usage:
+    python benchmarks/bench_event_compaction.py [turns]
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.event_compaction import EventCompactor
+
+ANSWER = "富士山についてのプレゼンテーションを作成しました。基本情報、歴史と文化、登山情報の3スライド構成です。" * 4
+COMMAND = (
+    'node /app/skills/pptx/scripts/create_ppt.js output.pptx "富士山について" '
+    '"基本情報\\n・標高3,776m\\n・日本最高峰" "歴史\\n・信仰の対象\\n・世界文化遺産" "登山情報\\n・7月〜9月\\n・4つの登山ルート"'
+)
+
+
+def chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def synthetic_turn(turn):
+    """Events of one turn: text, a shell tool call with streamed output, final text"""
+    tool_use_id = f"tooluse_{turn}"
+    tool_input = {"command": COMMAND}
+    events = [{"event": {"messageStart": {"role": "assistant"}}}]
+    events += [{"event": {"contentBlockDelta": {"delta": {"text": c}, "contentBlockIndex": 0}}} for c in chunks(ANSWER[:40], 3)]
+    events.append({"event": {"contentBlockStop": {"contentBlockIndex": 0}}})
+    events.append({"event": {"contentBlockStart": {"start": {"toolUse": {"name": "execute_shell_command", "toolUseId": tool_use_id}}, "contentBlockIndex": 1}}})
+    events += [
+        {"event": {"contentBlockDelta": {"delta": {"toolUse": {"input": c}}, "contentBlockIndex": 1}}}
+        for c in chunks(json.dumps(tool_input, ensure_ascii=False), 12)
+    ]
+    events.append({"event": {"contentBlockStop": {"contentBlockIndex": 1}}})
+    events.append({"event": {"messageStop": {"stopReason": "tool_use"}}})
+    tool_use = {"toolUseId": tool_use_id, "name": "execute_shell_command", "input": tool_input}
+    for i in range(20):
+        data = {"stream": "stdout", "data": f"Processing slide {i}...\n"}
+        events.append({"type": "tool_stream", "tool_stream_event": {"tool_use": tool_use, "data": data}})
+    events.append({"event": {"messageStart": {"role": "assistant"}}})
+    events += [{"event": {"contentBlockDelta": {"delta": {"text": c}, "contentBlockIndex": 0}}} for c in chunks(ANSWER, 3)]
+    events.append({"event": {"contentBlockStop": {"contentBlockIndex": 0}}})
+    events.append({"event": {"messageStop": {"stopReason": "end_turn"}}})
+    events.append({"event": {"metadata": {"usage": {"inputTokens": 5120, "outputTokens": 410, "totalTokens": 5530}}}})
+    return events
+
+
+def sse_bytes(messages):
+    return sum(len(f"data: {json.dumps(m, ensure_ascii=False)}\n\n".encode("utf-8")) for m in messages)
+
+
+async def replay(events, compact):
+    async def source():
+        for event in events:
+            yield event
+
+    stream = EventCompactor(max_delay_seconds=1.0).compact(source()) if compact else source()
+    return [msg async for msg in stream]
+
+
+def main():
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    events = [event for turn in range(turns) for event in synthetic_turn(turn)]
+    print(f"Entrypoint stream wire volume ({turns} turns, {len(events)} events)")
+    print("=" * 80)
+
+    results = {}
+    for mode, compact in (("verbose", False), ("compact", True)):
+        start = time.perf_counter()
+        out = asyncio.run(replay(events, compact))
+        elapsed = (time.perf_counter() - start) * 1000
+        results[mode] = sse_bytes(out)
+        print(f"{mode:<8} events {len(out):6d}   SSE bytes {results[mode]:9d}   stage time {elapsed:7.1f} ms")
+
+    print("=" * 80)
+    print(f"Bytes saved: {1 - results['compact'] / results['verbose']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Import-time profile of the container entrypoints
+
+Runs each target in a fresh interpreter with `python -X importtime`, then
+reports the total import time, the heaviest top-level packages (cumulative)
+and the modules with the largest self time, in the same units as -X importtime
+(microseconds). With --first-use, also times building the first agent after
+import (for targets with an AGENT_POOL, i.e. the entrypoints), the cost that
+lazy imports move off the cold-start path.
+No model calls are made, so no AWS credentials are needed.
+
+Usage:
+    python benchmarks/bench_import_time.py [--top N] [--first-use] [module ...]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_TARGETS = ["agentcore_entrypoint", "agent.__main__", "my_tools", "agentskills", "utils"]
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+FIRST_USE_SNIPPET = """
+import time
+start = time.perf_counter()
+import {module} as target
+imported = time.perf_counter()
+if hasattr(target, "AGENT_POOL"):
+    target.AGENT_POOL.factory((target.DEFAULT_PROFILE, target.DEFAULT_MODEL_ID))
+    built = time.perf_counter()
+    print(f"{{(imported - start) * 1e6:.0f}} {{(built - imported) * 1e6:.0f}}")
+"""
+
+
+def profile(module):
+    """Return [(self_us, cumulative_us, depth, name)] for importing `module` in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "AWS_REGION": os.environ.get("AWS_REGION", "ap-northeast-1")},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((int(self_us), int(cumulative_us), len(indent) // 2, name))
+    return rows
+
+
+def first_use(module):
+    """Return (import_us, first_agent_us) measured in a fresh interpreter
+
+    None for modules without an AGENT_POOL (only the entrypoints build agents).
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_USE_SNIPPET.format(module=module)],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "AWS_REGION": os.environ.get("AWS_REGION", "ap-northeast-1")},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    if not result.stdout.strip():
+        return None
+    import_us, build_us = result.stdout.split()
+    return int(import_us), int(build_us)
+
+
+def report(module, rows, top):
+    target = next((r for r in reversed(rows) if r[3] == module), None)
+    total = target[1] if target else sum(r[0] for r in rows)
+    print(f"{module}: {total / 1000:.1f} ms total, {len(rows)} modules")
+
+    # Rows are in post-order (children first); walk backwards to know each module's
+    # importer and charge a package where it is entered from another package
+    packages = {}
+    importers = {}
+    root = module.split(".")[0]
+    for _, cumulative_us, depth, name in reversed(rows):
+        importers[depth] = name
+        top_level = name.split(".")[0]
+        importer = importers.get(depth - 1, "") if depth else ""
+        if top_level != root and top_level != importer.split(".")[0]:
+            packages[top_level] = packages.get(top_level, 0) + cumulative_us
+    print(f"  {'cumulative [us]':>15} | top-level package")
+    for name, cumulative_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {cumulative_us:>15} | {name}")
+
+    print(f"  {'self [us]':>15} | module")
+    for self_us, _, _, name in sorted(rows, key=lambda row: -row[0])[:top]:
+        print(f"  {self_us:>15} | {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_TARGETS)
+    parser.add_argument("--top", type=int, default=10, help="Rows per table")
+    parser.add_argument("--first-use", action="store_true", help="Also time building the first agent")
+    args = parser.parse_args()
+
+    print("Import-time profile (python -X importtime, fresh interpreter per target)")
+    print("=" * 80)
+    for module in args.modules:
+        try:
+            report(module, profile(module), args.top)
+        except RuntimeError as e:
+            print(f"{module}: import failed ({e})")
+        print("-" * 80)
+
+    if args.first_use:
+        for module in args.modules:
+            try:
+                timings = first_use(module)
+            except RuntimeError as e:
+                print(f"{module:<22} import failed ({e})")
+                continue
+            if timings is None:
+                print(f"{module:<22} no AGENT_POOL, first agent not measured")
+                continue
+            import_us, build_us = timings
+            print(f"{module:<22} import {import_us / 1000:8.1f} ms   first agent {build_us / 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
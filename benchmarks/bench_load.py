@@ -0,0 +1,235 @@
+"""
+Load test of the AgentCore entrypoint with a scripted model and stubbed tools
+
+Runs agentcore_entrypoint.entrypoint in-process under configurable concurrency.
+The Bedrock model is replaced by a scripted strands Model that streams token
+deltas at a fixed pace and calls the agent's tools in turn (search_web,
+execute_shell_command, upload_to_s3); the tools are stubs that sleep and return
+canned output, or with --real-shell the sandboxed shell tool runs `echo`.
+Everything else (agent pool, sessions, admission control, event compaction,
+telemetry) is the production code path.
+
+Reports request latency p50/p95/p99, time to first event (TTFE), events/sec
+and process RSS. Requests rejected by admission control are counted separately;
+raise ADMISSION_MAX_CONCURRENT / ADMISSION_MAX_QUEUE to test past the defaults.
+No model calls are made, so no AWS credentials are needed.
+
+Usage:
+    python benchmarks/bench_load.py [--requests N] [--concurrency C] [--tool-calls K]
+                               [--token-delay MS] [--tool-delay MS] [--real-shell]
+                               [--stream-mode compact|verbose]
+"""
+import argparse
+import asyncio
+import inspect
+import json
+import logging
+import os
+import resource
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("AWS_REGION", "ap-northeast-1")
+os.environ.setdefault("WARMUP_ENABLED", "0")
+os.environ.setdefault("SESSION_BACKEND", "none")
+# Usage counters are still recorded; only the per-invocation EMF lines would flood the report
+os.environ.setdefault("USAGE_EMF_NAMESPACE", "")
+
+from strands import Agent, tool
+from strands.models import Model
+
+import agentcore_entrypoint as ep
+from utils.agent_profiles import PROFILES, resolve_tool
+
+# Spans are still recorded and batched; their JSON lines would flood the report
+logging.getLogger("strands_agent.telemetry.spans").setLevel(logging.WARNING)
+
+ANSWER = "富士山についてのプレゼンテーションを作成しました。基本情報、歴史と文化、登山情報の3スライド構成です。"
+TOOL_SCRIPT = [
+    ("search_web", {"query": "富士山 標高 歴史"}),
+    ("execute_shell_command", {"command": 'node /app/skills/pptx/scripts/create_ppt.js output.pptx "富士山について" "基本情報"'}),
+    ("upload_to_s3", {"file_path": "output.pptx"}),
+]
+
+
+class ScriptedModel(Model):
+    """Model that calls `tool_calls` tools of `script` (default TOOL_SCRIPT) in turn, then streams ANSWER
+
+    structured_output() answers with `structured` (field values) validated against the requested model.
+    """
+
+    def __init__(self, tool_calls=2, token_delay=0.005, chunk_chars=3, script=None, structured=None):
+        self.config = {"tool_calls": tool_calls, "token_delay": token_delay, "chunk_chars": chunk_chars}
+        self.script = script or TOOL_SCRIPT
+        self.structured = structured or {}
+
+    def get_config(self):
+        return self.config
+
+    def update_config(self, **model_config):
+        self.config.update(model_config)
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        await asyncio.sleep(self.config["token_delay"])
+        yield {"output": output_model.model_validate(self.structured)}
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+        # Tool results since the latest user prompt decide the next step
+        done = 0
+        for message in reversed(messages):
+            if message["role"] == "user" and not any("toolResult" in c for c in message["content"]):
+                break
+            done += sum("toolResult" in c for c in message["content"])
+
+        yield {"messageStart": {"role": "assistant"}}
+        if done < self.config["tool_calls"]:
+            name, tool_input = self.script[done % len(self.script)]
+            yield {"contentBlockStart": {"start": {"toolUse": {"name": name, "toolUseId": f"tooluse_{done}"}}}}
+            encoded = json.dumps(tool_input, ensure_ascii=False)
+            for i in range(0, len(encoded), 12):
+                await asyncio.sleep(self.config["token_delay"])
+                yield {"contentBlockDelta": {"delta": {"toolUse": {"input": encoded[i:i + 12]}}}}
+            yield {"contentBlockStop": {}}
+            yield {"messageStop": {"stopReason": "tool_use"}}
+        else:
+            size = self.config["chunk_chars"]
+            for i in range(0, len(ANSWER), size):
+                await asyncio.sleep(self.config["token_delay"])
+                yield {"contentBlockDelta": {"delta": {"text": ANSWER[i:i + size]}}}
+            yield {"contentBlockStop": {}}
+            yield {"messageStop": {"stopReason": "end_turn"}}
+        yield {"metadata": {"usage": {"inputTokens": 5120, "outputTokens": 410, "totalTokens": 5530}, "metrics": {"latencyMs": 0}}}
+
+
+def stub_tools(tool_delay):
+    """Stand-ins for my_tools with the same names and signatures"""
+
+    @tool
+    async def search_web(query: str) -> str:
+        """Search the web (stub)"""
+        await asyncio.sleep(tool_delay)
+        return f"Search results for: {query}\n\n1. 富士山 - 標高3,776m、日本最高峰"
+
+    @tool(name="execute_shell_command")
+    async def execute_shell_command_stub(command: str):
+        """Execute a shell command (stub)"""
+        for i in range(5):
+            await asyncio.sleep(tool_delay / 5)
+            yield {"stream": "stdout", "data": f"Processing slide {i}...\n"}
+        yield "Command succeeded: output.pptx created"
+
+    @tool
+    async def upload_to_s3(file_path: str, bucket_name: str = None, s3_key: str = None) -> str:
+        """Upload a file to S3 (stub)"""
+        await asyncio.sleep(tool_delay)
+        return f"Uploaded {file_path} to s3://bench-bucket/{s3_key or file_path}"
+
+    return [search_web, execute_shell_command_stub, upload_to_s3]
+
+
+def rss_mb():
+    """Current resident set size (Linux), else peak RSS"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+def percentile(values, q):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+async def one_request(index, stream_mode, results):
+    context = SimpleNamespace(session_id=f"bench-{index}", request=None)
+    payload = {"prompt": "富士山についてのプレゼンを作って", "stream_mode": stream_mode}
+    start = time.perf_counter()
+    first = None
+    events = 0
+    try:
+        stream = await ep.entrypoint(payload, context)
+        if not inspect.isasyncgen(stream):
+            # Not admitted: answered with a 503 response instead of an event stream
+            results["rejected"] += 1
+            return
+        async for _ in stream:
+            if first is None:
+                first = time.perf_counter()
+            events += 1
+    except Exception as e:
+        results["errors"].append(f"{type(e).__name__}: {e}")
+        return
+    results["latency"].append((time.perf_counter() - start) * 1000)
+    results["ttfe"].append(((first or time.perf_counter()) - start) * 1000)
+    results["events"] += events
+
+
+async def run(args):
+    results = {"latency": [], "ttfe": [], "events": 0, "rejected": 0, "errors": [], "peak_rss": rss_mb()}
+    queue = asyncio.Queue()
+    for i in range(args.requests):
+        queue.put_nowait(i)
+
+    async def client():
+        while not queue.empty():
+            await one_request(queue.get_nowait(), args.stream_mode, results)
+            results["peak_rss"] = max(results["peak_rss"], rss_mb())
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(args.concurrency)))
+    results["elapsed"] = time.perf_counter() - start
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--tool-calls", type=int, default=2, help="Tool calls per request")
+    parser.add_argument("--token-delay", type=float, default=5, help="Milliseconds between model deltas")
+    parser.add_argument("--tool-delay", type=float, default=50, help="Milliseconds per stub tool call")
+    parser.add_argument("--real-shell", action="store_true", help="Use the sandboxed shell tool (runs echo)")
+    parser.add_argument("--stream-mode", choices=("compact", "verbose"), default="compact")
+    args = parser.parse_args()
+
+    model = lambda: ScriptedModel(args.tool_calls, args.token_delay / 1000)
+    tools = stub_tools(args.tool_delay / 1000)
+    if args.real_shell:
+        TOOL_SCRIPT[1] = ("execute_shell_command", {"command": "echo slide 1; echo slide 2"})
+        tools[1] = resolve_tool("execute_shell_command")
+    ep.AGENT_POOL.factory = lambda model_id: Agent(
+        model=model(), tools=tools, system_prompt=PROFILES.get(ep.DEFAULT_PROFILE).system_prompt, callback_handler=None
+    )
+
+    print(
+        f"Entrypoint load test ({args.requests} requests, concurrency {args.concurrency}, "
+        f"{args.tool_calls} tool calls, stream_mode {args.stream_mode})"
+    )
+    print("=" * 80)
+    rss_before = rss_mb()
+    results = asyncio.run(run(args))
+    completed = len(results["latency"])
+
+    print(f"completed {completed}   rejected {results['rejected']}   errors {len(results['errors'])}")
+    for label, values in (("latency", results["latency"]), ("TTFE", results["ttfe"])):
+        print(
+            f"{label:<8} p50 {percentile(values, 0.50):8.1f} ms   p95 {percentile(values, 0.95):8.1f} ms   "
+            f"p99 {percentile(values, 0.99):8.1f} ms"
+        )
+    print(
+        f"throughput {completed / results['elapsed']:8.1f} req/s   "
+        f"{results['events'] / results['elapsed']:8.1f} events/s   ({results['events']} events in {results['elapsed']:.2f} s)"
+    )
+    print(f"RSS before {rss_before:.1f} MB   peak {results['peak_rss']:.1f} MB   after {rss_mb():.1f} MB")
+    print(f"agents created {ep.AGENT_POOL.created}, reused {ep.AGENT_POOL.reused}")
+    for error in sorted(set(results["errors"]))[:5]:
+        print(f"  error: {error}")
+
+
+if __name__ == "__main__":
+    main()
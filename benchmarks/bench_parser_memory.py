@@ -0,0 +1,89 @@
+"""
+Memory of a long-lived StrandsEventParser
+
+Feeds one parser a long multi-turn session (the synthetic turns of
+bench_stream_dispatch.py: streamed tool input, tool and sub-agent results) with
+a large tool input per turn, and reports at checkpoints the parser state from
+memory_report():
+
+    before: per-tool state kept until reset() (previous behaviour)
+    after:  state dropped at each tool result, capped at max_tool_calls
+
+Parsed output is checked to be identical.
+No model calls are made, so no AWS credentials are needed.
+
+Usage:
+    python benchmarks/bench_parser_memory.py [turns] [input_kib]
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_stream_dispatch import synthetic_turn
+from utils.strands_stream import StrandsEventParser
+
+
+class NoEviction(StrandsEventParser):
+    """Previous behaviour: per-tool state is only cleared by reset()"""
+
+    def __init__(self):
+        super().__init__(max_tool_calls=sys.maxsize)
+
+    def _finish_tool(self, tool_use_id, source):
+        pass
+
+
+def session_turn(turn, input_kib):
+    """A synthetic turn whose tool input is ~input_kib KiB and whose skill call gets a result"""
+    events = synthetic_turn(turn)
+    command = "x" * (input_kib * 1024)
+    raw_input = json.dumps({"command": command})
+    tool_use_id = f"bigtool_{turn}"
+    for i in range(4096, len(raw_input) + 4096, 4096):
+        events.append({
+            "type": "tool_use_stream",
+            "delta": {"toolUse": {"input": raw_input[i - 4096:i]}},
+            "current_tool_use": {"toolUseId": tool_use_id, "name": "file_write", "input": raw_input[:i]},
+        })
+    tool_use = {"toolUseId": tool_use_id, "name": "file_write", "input": {"command": command}}
+    events.append({"message": {"role": "assistant", "content": [{"toolUse": tool_use}]}})
+    for tool_id in (tool_use_id, f"skill_{turn}"):
+        result = {"toolUseId": tool_id, "status": "success", "content": [{"text": "ok"}]}
+        events.append({"message": {"role": "user", "content": [{"toolResult": result}]}})
+    return events
+
+
+def run(parser, turns, input_kib, checkpoints):
+    outputs = []
+    rows = []
+    for turn in range(1, turns + 1):
+        events = session_turn(turn, input_kib)
+        outputs.append([parser.parse(event) for event in events])
+        del events
+        if turn in checkpoints:
+            rows.append((turn, parser.memory_report()))
+    return outputs, rows
+
+
+def main():
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    input_kib = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    checkpoints = {max(1, turns * i // 5) for i in range(1, 6)}
+    print(f"Parser memory over a {turns}-turn session ({input_kib} KiB tool input per turn)")
+    print("=" * 80)
+    before_out, before = run(NoEviction(), turns, input_kib, checkpoints)
+    after_out, after = run(StrandsEventParser(), turns, input_kib, checkpoints)
+    assert before_out == after_out, "eviction changed the parsed output"
+    tracked = lambda report: sum(v["entries"] for v in report.values() if isinstance(v, dict))
+    for (turn, report_before), (_, report_after) in zip(before, after):
+        print(
+            f"turn {turn:5d}   before {report_before['total_bytes'] / 1024:8.1f} KiB ({tracked(report_before):5d} entries)   "
+            f"after {report_after['total_bytes'] / 1024:8.1f} KiB ({tracked(report_after):5d} entries, "
+            f"{report_after['evicted_on_result']} evicted on result)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Benchmark of the parser and renderers on recorded stream traces
+
+Replays the traces in benchmarks/traces/ (raw Agent.stream_async events recorded
+with utils/strands_stream/trace.py) through StrandsEventParser and each
+renderer at full speed, and reports per renderer:
+
+    events/s         best of --repeat runs over the whole trace
+    latency          p50 / p99 / max microseconds spent per raw event
+    peak / retained  tracemalloc peak during one run, and memory still held
+                     by the renderer (parser state included) after it
+
+With --speed, each trace is also replayed at that multiple of its recorded pace
+through renderer.aprocess and the wall time is compared to the recording.
+
+--record regenerates the checked-in traces from a real strands Agent driven by
+the scripted model of bench_load.py with stubbed tools: "pptx_basic" calls
+search_web, execute_shell_command (streams output) and upload_to_s3;
+"pptx_skill" runs use_skill, whose sub-agent streams its own text and shell
+calls as tool_stream_event, then upload_to_s3.
+No model calls are made, so no AWS credentials are needed.
+
+Usage:
+    python benchmarks/bench_replay.py [--traces DIR] [--repeat R] [--speed X]
+    python benchmarks/bench_replay.py --record [--traces DIR]
+"""
+import argparse
+import asyncio
+import io
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.strands_stream import (
+    CompactStreamRenderer,
+    SSEStreamRenderer,
+    StrandsEventParser,
+    StreamlitStreamRenderer,
+    TerminalStreamRenderer,
+)
+from utils.strands_stream.trace import TraceRecorder, read_trace, replay
+
+TRACES_DIR = Path(__file__).parent / "traces"
+
+SHELL = ("execute_shell_command", {"command": 'node /app/skills/pptx/scripts/create_ppt.js output.pptx "富士山について" "基本情報"'})
+UPLOAD = ("upload_to_s3", {"file_path": "output.pptx"})
+SKILL = ("use_skill", {"skill_name": "pptx", "request": "富士山についての3スライドのプレゼンを作成してください"})
+
+
+class ParserOnly:
+    """Parsing without rendering, as a baseline row"""
+
+    def __init__(self):
+        self.parser = StrandsEventParser()
+
+    def process(self, event):
+        return self.parser.parse(event)
+
+
+def terminal_renderer():
+    renderer = TerminalStreamRenderer(use_colors=False)
+    renderer.out = io.StringIO()
+    return renderer
+
+
+RENDERERS = {
+    "parser": ParserOnly,
+    "sse": SSEStreamRenderer,
+    "compact": CompactStreamRenderer,
+    "streamlit": StreamlitStreamRenderer,
+    "terminal": terminal_renderer,
+}
+
+
+def percentile(values, q):
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def measure(make_renderer, events, repeat):
+    best = 0.0
+    for _ in range(repeat):
+        process = make_renderer().process
+        start = time.perf_counter()
+        for event in events:
+            process(event)
+        best = max(best, len(events) / (time.perf_counter() - start))
+
+    process = make_renderer().process
+    latencies = []
+    for event in events:
+        start = time.perf_counter_ns()
+        process(event)
+        latencies.append((time.perf_counter_ns() - start) / 1000)
+    latencies.sort()
+
+    tracemalloc.start()
+    renderer = make_renderer()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for event in events:
+        renderer.process(event)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, latencies, (peak - baseline) / 1024, (retained - baseline) / 1024
+
+
+async def replay_paced(make_renderer, records, speed):
+    renderer = make_renderer()
+    if not hasattr(renderer, "aprocess"):
+        return None
+    start = time.perf_counter()
+    async for _ in renderer.aprocess(replay(records, speed)):
+        pass
+    return time.perf_counter() - start
+
+
+def run_benchmarks(args):
+    traces = sorted(Path(args.traces).glob("*.trace"))
+    if not traces:
+        sys.exit(f"No traces in {args.traces} (run with --record)")
+    for path in traces:
+        header, records = read_trace(path)
+        events = [event for _, event in records]
+        recorded = sum(delay for delay, _ in records)
+        print(f"\n{path.name}: {len(events)} events, {recorded:.2f} s recorded, {path.stat().st_size / 1024:.1f} KiB, meta {header['meta']}")
+        print("=" * 80)
+        for label, make_renderer in RENDERERS.items():
+            rate, latencies, peak, retained = measure(make_renderer, events, args.repeat)
+            line = (
+                f"{label:<10} {rate:10,.0f} events/s   latency p50 {percentile(latencies, 0.5):6.1f} "
+                f"p99 {percentile(latencies, 0.99):7.1f} max {latencies[-1]:8.1f} us   "
+                f"peak {peak:7.1f} KiB   retained {retained:6.1f} KiB"
+            )
+            if args.speed:
+                elapsed = asyncio.run(replay_paced(make_renderer, records, args.speed))
+                if elapsed is not None:
+                    line += f"   paced x{args.speed:g} {elapsed:.2f} s (recorded {recorded / args.speed:.2f} s)"
+            print(line)
+
+
+async def record_scenario(path, agent, prompt, meta):
+    path.unlink(missing_ok=True)
+    with TraceRecorder(path, meta) as recorder:
+        async for event in agent.stream_async(prompt):
+            recorder.record(event)
+    return recorder.events
+
+
+def record_traces(args):
+    os.environ.setdefault("AWS_REGION", "ap-northeast-1")
+    os.environ.setdefault("WARMUP_ENABLED", "0")
+    os.environ.setdefault("SESSION_BACKEND", "none")
+    from strands import Agent
+
+    from agentskills import discover_skills
+    from agentskills.tool.agent_skill import create_skill_agent_tool
+    from bench_load import ScriptedModel, stub_tools
+    from utils.agent_profiles import SKILLS_DIR
+
+    directory = Path(args.traces)
+    prompt = "富士山についてのプレゼンを作って"
+
+    basic = Agent(model=ScriptedModel(3), tools=stub_tools(0.05), callback_handler=None)
+    use_skill = create_skill_agent_tool(
+        discover_skills(SKILLS_DIR),
+        SKILLS_DIR,
+        base_agent_model=ScriptedModel(2, script=[SHELL]),
+        additional_tools=stub_tools(0.05),
+    )
+    skill = Agent(
+        model=ScriptedModel(2, script=[SKILL, UPLOAD]),
+        tools=[use_skill, *stub_tools(0.05)],
+        callback_handler=None,
+    )
+    for name, agent in (("pptx_basic", basic), ("pptx_skill", skill)):
+        path = directory / f"{name}.trace"
+        events = asyncio.run(record_scenario(path, agent, prompt, {"scenario": name}))
+        print(f"recorded {path} ({events} events, {path.stat().st_size / 1024:.1f} KiB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--traces", default=str(TRACES_DIR), help="Trace directory")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--speed", type=float, default=0, help="Also replay at this multiple of the recorded pace")
+    parser.add_argument("--record", action="store_true", help="Regenerate the traces with the scripted model")
+    args = parser.parse_args()
+    if args.record:
+        record_traces(args)
+    else:
+        run_benchmarks(args)
+
+
+if __name__ == "__main__":
+    main()
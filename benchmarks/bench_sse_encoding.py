@@ -0,0 +1,156 @@
+"""
+Benchmark of SSEStreamRenderer encoding
+
+Renders the synthetic stream of bench_stream_dispatch.py (token text deltas,
+streamed tool input, tool results, sub-agent events, lifecycle results), or a
+recorded trace from benchmarks/traces/ with --trace, with:
+
+    baseline:  payload dict + json.dumps per event (previous behaviour)
+    json:      pre-encoded prefixes + standard library encoder
+    orjson:    pre-encoded prefixes + orjson encoder (if installed)
+    batched:   orjson (or json) with batch_deltas, flushed in batches of --batch
+
+and reports events/sec, SSE frames and bytes. Decoded payloads are checked
+against the baseline (batched: the concatenated text per source).
+No model calls are made, so no AWS credentials are needed.
+
+Usage:
+    python benchmarks/bench_sse_encoding.py [--turns N | --trace FILE] [--repeat R] [--batch B]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_stream_dispatch import synthetic_turn
+from utils.strands_stream import SSEStreamRenderer, StrandsEventParser
+from utils.strands_stream.renderers import sse
+from utils.strands_stream.trace import read_trace
+
+
+class BaselineSSE(SSEStreamRenderer):
+    """Previous per-token path: payload dict + json.dumps, double-dumps safe serializer"""
+
+    def __init__(self):
+        super().__init__(encoder=json.dumps)
+
+    def _frame(self, payload):
+        for key in ("result", "node_result"):
+            if key in payload and payload[key] is not None:
+                try:
+                    json.dumps(payload[key])
+                except (TypeError, ValueError):
+                    payload[key] = sse._to_jsonable(payload[key])
+        return f"data: {json.dumps(payload)}\n\n"
+
+    def on_text(self, event):
+        payload = {"type": "text", "data": event.data}
+        if event.source:
+            payload["source"] = event.source
+        return self._frame(payload)
+
+    def on_tool_input_delta(self, event):
+        payload = {
+            "type": "tool_input_delta",
+            "tool_name": event.tool_name,
+            "tool_id": event.tool_id,
+            "delta": event.delta,
+            "offset": event.offset,
+            "checksum": event.checksum,
+        }
+        if event.source:
+            payload["source"] = event.source
+        return self._frame(payload)
+
+
+class AgentResultStub:
+    """Stands in for the SDK result carried by the final lifecycle event"""
+
+    def __init__(self):
+        self.stop_reason = "end_turn"
+        self.message = {"role": "assistant", "content": [{"text": "done"}]}
+        self.metrics = object()
+
+
+def trace(turns, path=None):
+    """Events of a recorded trace file, or `turns` synthetic turns plus a final result"""
+    if path:
+        return [event for _, event in read_trace(path)[1]]
+    events = [event for turn in range(turns) for event in synthetic_turn(turn)]
+    events.append({"complete": True, "result": AgentResultStub()})
+    return events
+
+
+def render(make_renderer, events, batch):
+    renderer = make_renderer()
+    outputs = []
+    for event in events:
+        outputs.extend(renderer.process(event))
+    if batch:
+        outputs = [out for i in range(0, len(outputs), batch) for out in renderer.merge_outputs(outputs[i:i + batch])]
+    return outputs
+
+
+def measure(make_renderer, events, repeat, batch=0):
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        outputs = render(make_renderer, events, batch)
+        best = max(best, len(events) / (time.perf_counter() - start))
+    return best, outputs
+
+
+def payloads(outputs):
+    return [json.loads(frame[len("data: "):]) for chunk in outputs for frame in chunk.split("\n\n") if frame]
+
+
+def text_by_source(outputs):
+    texts = {}
+    for payload in payloads(outputs):
+        if payload["type"] == "text":
+            texts[payload.get("source")] = texts.get(payload.get("source"), "") + payload["data"]
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--trace", help="Recorded trace (e.g. benchmarks/traces/pptx_skill.trace) instead of synthetic turns")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--batch", type=int, default=32, help="Outputs per flush in batched mode")
+    args = parser.parse_args()
+
+    events = trace(args.turns, args.trace)
+    fast = sse.orjson_encoder if sse.ORJSON_AVAILABLE else sse.json_encoder
+    variants = [
+        ("baseline", BaselineSSE, 0),
+        ("json", lambda: SSEStreamRenderer(encoder=sse.json_encoder), 0),
+    ]
+    if sse.ORJSON_AVAILABLE:
+        variants.append(("orjson", lambda: SSEStreamRenderer(encoder=sse.orjson_encoder), 0))
+    variants.append(("batched", lambda: SSEStreamRenderer(encoder=fast, batch_deltas=True), args.batch))
+
+    print(f"SSE encoding ({args.trace or f'{args.turns} turns'}, {len(events)} events, best of {args.repeat}, orjson {'on' if sse.ORJSON_AVAILABLE else 'off'})")
+    print("=" * 80)
+    baseline = None
+    for label, make_renderer, batch in variants:
+        rate, outputs = measure(make_renderer, events, args.repeat, batch)
+        frames = sum(1 for _ in payloads(outputs))
+        size = sum(len(chunk.encode()) for chunk in outputs)
+        if baseline is None:
+            baseline = (rate, outputs)
+        elif batch:
+            assert text_by_source(outputs) == text_by_source(baseline[1]), f"{label} changed the text"
+        else:
+            assert payloads(outputs) == payloads(baseline[1]), f"{label} changed the payloads"
+        print(
+            f"{label:<9} {rate:12,.0f} events/s ({rate / baseline[0]:.2f}x)   "
+            f"{frames:7d} frames   {size / 1024:9.1f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
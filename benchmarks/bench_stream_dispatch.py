@@ -0,0 +1,179 @@
+"""
+Micro-benchmark of StrandsEventParser.parse and BaseStreamRenderer.process
+
+Replays a synthetic stream shaped like Agent.stream_async output (token-level
+text deltas carrying the SDK's invocation-state keys, streamed tool input,
+tool results, sub-agent events from use_skill) and reports events/sec for:
+
+    before: general parse path + isinstance-chain dispatch (previous behaviour)
+    after:  text-delta fast path + precompiled dispatch table (current behaviour)
+
+Rendering is done by a renderer whose handlers return the event unchanged, so
+only parsing and dispatch are measured; SSEStreamRenderer is reported as well.
+No model calls are made, so no AWS credentials are needed.
+
+Usage:
+    python benchmarks/bench_stream_dispatch.py [turns] [repeat]
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.strands_stream import (
+    BaseStreamRenderer,
+    SSEStreamRenderer,
+    StrandsEventParser,
+    TextEvent,
+    CurrentToolUseEvent,
+    ToolInputDeltaEvent,
+    ToolResultEvent,
+    ToolStreamEvent,
+    ReasoningEvent,
+    LifecycleEvent,
+    MultiAgentNodeStartEvent,
+    MultiAgentNodeStreamEvent,
+    MultiAgentNodeStopEvent,
+    MultiAgentHandoffEvent,
+    MultiAgentResultEvent,
+)
+
+ANSWER = "富士山についてのプレゼンテーションを作成しました。基本情報、歴史と文化、登山情報の3スライド構成です。" * 3
+COMMAND = 'node /app/skills/pptx/scripts/create_ppt.js output.pptx "富士山について" "基本情報\\n・標高3,776m"'
+
+# Keys the SDK merges into every callback event (values are shared, as in the SDK)
+INVOCATION_STATE = {
+    "event_loop_cycle_id": "cycle",
+    "request_state": {},
+    "event_loop_cycle_trace": None,
+    "event_loop_cycle_span": None,
+    "model": None,
+    "messages": [],
+    "system_prompt": "",
+    "tool_config": {},
+}
+
+
+def text_deltas(text, size=3, **extra):
+    return [
+        {"data": text[i:i + size], "delta": {"text": text[i:i + size]}, **INVOCATION_STATE, **extra}
+        for i in range(0, len(text), size)
+    ]
+
+
+def synthetic_turn(turn):
+    tool_use_id = f"tooluse_{turn}"
+    raw_input = json.dumps({"command": COMMAND}, ensure_ascii=False)
+    events = [{"init_event_loop": True}, {"start_event_loop": True}]
+    events += text_deltas(ANSWER[:30])
+    for i in range(12, len(raw_input) + 12, 12):
+        events.append({
+            "type": "tool_use_stream",
+            "delta": {"toolUse": {"input": raw_input[i - 12:i]}},
+            "current_tool_use": {"toolUseId": tool_use_id, "name": "execute_shell_command", "input": raw_input[:i]},
+            **INVOCATION_STATE,
+        })
+    tool_use = {"toolUseId": tool_use_id, "name": "execute_shell_command", "input": {"command": COMMAND}}
+    events.append({"message": {"role": "assistant", "content": [{"toolUse": tool_use}]}})
+    for i in range(5):
+        events.append({"tool_stream_event": {"tool_use": tool_use, "data": {"stream": "stdout", "data": f"slide {i}\n"}}})
+    skill_use = {"toolUseId": f"skill_{turn}", "name": "use_skill", "input": {"skill_name": "pptx"}}
+    for sub_event in text_deltas(ANSWER[:60]):
+        events.append({"tool_stream_event": {"tool_use": skill_use, "data": {"skill_name": "pptx", "event": sub_event}}})
+    result = {"toolUseId": tool_use_id, "status": "success", "content": [{"text": "output.pptx created"}]}
+    events.append({"message": {"role": "user", "content": [{"toolResult": result}]}})
+    events += text_deltas(ANSWER)
+    return events
+
+
+class EchoRenderer(BaseStreamRenderer):
+    """Renderer whose handlers return the parsed event (measures parse + dispatch only)"""
+
+    def on_text(self, event):
+        return event
+
+    def on_tool_use(self, event):
+        return event
+
+    def on_tool_result(self, event):
+        return event
+
+    def on_reasoning(self, event):
+        return event
+
+
+def legacy(renderer_cls):
+    """Renderer using the general parse path and the isinstance-chain dispatch"""
+
+    class Legacy(renderer_cls):
+        def process(self, event):
+            parsed_events = self.parser._parse_event(event) if isinstance(event, dict) else []
+            results = []
+            for parsed_event in parsed_events:
+                if isinstance(parsed_event, TextEvent):
+                    result = self.on_text(parsed_event)
+                elif isinstance(parsed_event, CurrentToolUseEvent):
+                    result = self.on_tool_use(parsed_event)
+                elif isinstance(parsed_event, ToolInputDeltaEvent):
+                    result = self.on_tool_input_delta(parsed_event)
+                elif isinstance(parsed_event, ToolResultEvent):
+                    result = self.on_tool_result(parsed_event)
+                elif isinstance(parsed_event, ToolStreamEvent):
+                    result = self.on_tool_stream(parsed_event)
+                elif isinstance(parsed_event, ReasoningEvent):
+                    result = self.on_reasoning(parsed_event)
+                elif isinstance(parsed_event, LifecycleEvent):
+                    result = self.on_lifecycle(parsed_event)
+                elif isinstance(parsed_event, MultiAgentNodeStartEvent):
+                    result = self.on_multiagent_node_start(parsed_event)
+                elif isinstance(parsed_event, MultiAgentNodeStreamEvent):
+                    result = self.on_multiagent_node_stream(parsed_event)
+                elif isinstance(parsed_event, MultiAgentNodeStopEvent):
+                    result = self.on_multiagent_node_stop(parsed_event)
+                elif isinstance(parsed_event, MultiAgentHandoffEvent):
+                    result = self.on_multiagent_handoff(parsed_event)
+                elif isinstance(parsed_event, MultiAgentResultEvent):
+                    result = self.on_multiagent_result(parsed_event)
+                else:
+                    result = None
+                if result is not None:
+                    if isinstance(result, list):
+                        results.extend(result)
+                    else:
+                        results.append(result)
+            return results
+
+    return Legacy
+
+
+def measure(make_renderer, events, repeat):
+    """Best events/sec over `repeat` runs, plus the outputs of the last run"""
+    best = 0.0
+    for _ in range(repeat):
+        renderer = make_renderer()
+        process = renderer.process
+        start = time.perf_counter()
+        outputs = [process(event) for event in events]
+        best = max(best, len(events) / (time.perf_counter() - start))
+    return best, outputs
+
+
+def main():
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    events = [event for turn in range(turns) for event in synthetic_turn(turn)]
+    text_share = sum("data" in e for e in events) / len(events)
+    print(f"Parse + dispatch throughput ({turns} turns, {len(events)} events, {text_share:.0%} text deltas, best of {repeat})")
+    print("=" * 80)
+
+    for label, renderer_cls in (("parse + dispatch", EchoRenderer), ("SSEStreamRenderer", SSEStreamRenderer)):
+        before, before_out = measure(lambda: legacy(renderer_cls)(StrandsEventParser()), events, repeat)
+        after, after_out = measure(lambda: renderer_cls(StrandsEventParser()), events, repeat)
+        assert before_out == after_out, "fast path changed the output"
+        print(f"{label:<18} before {before:12,.0f} events/s   after {after:12,.0f} events/s   ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
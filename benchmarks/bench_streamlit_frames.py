@@ -0,0 +1,163 @@
+"""
+Benchmark of StreamlitStreamRenderer frames (max_updates_per_second)
+
+Replays the synthetic stream of bench_stream_dispatch.py, preceded by streamed
+reasoning, at a model-like pace (one event every --event-delay ms) into a
+model of a Streamlit app: one markdown placeholder per source, re-rendered
+with its whole accumulated markdown on every update. Reports per mode:
+
+    updates        placeholder updates (st.markdown calls)
+    re-rendered    characters of markdown re-rendered over the stream
+    tool inputs    tool inputs pretty-printed (json.dumps with indent=2)
+
+    per event:     max_updates_per_second=0 (one output per event)
+    N fps:         max_updates_per_second=N, process() + flush()
+    N fps aprocess the same through renderer.aprocess (idle frames on a timer)
+
+The stream also has a tool call whose input arrives as growing dicts. The
+final markdown is checked to be identical apart from the tool input blocks:
+per event, every input update is printed; in frames, each input once.
+No model calls are made, so no AWS credentials are needed.
+
+Usage:
+    python benchmarks/bench_streamlit_frames.py [--turns N] [--event-delay MS] [--fps N]
+"""
+import argparse
+import asyncio
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_stream_dispatch import synthetic_turn
+from utils.strands_stream import StreamlitStreamRenderer, StrandsEventParser
+
+REASONING = "ユーザーは富士山のプレゼンを求めている。\n構成: 基本情報、歴史、登山情報。\ncreate_ppt.js を使う。\n"
+
+
+INPUT_BLOCK = re.compile(r"\n```json\n.*?\n```\n\n", re.S)
+
+
+def partial_inputs(turn, steps=10):
+    """A tool call whose input arrives as growing dicts (a provider sending partially parsed input)"""
+    tool_use_id = f"upload_{turn}"
+    key = "output.pptx の説明: " + "富士山について、基本情報、歴史と文化、登山情報の3スライド。" * 2
+    events = []
+    for step in range(1, steps + 1):
+        tool_input = {"file_path": "output.pptx", "description": key[:len(key) * step // steps]}
+        events.append({
+            "type": "tool_use_stream",
+            "current_tool_use": {"toolUseId": tool_use_id, "name": "upload_to_s3", "input": tool_input},
+        })
+    result = {"toolUseId": tool_use_id, "status": "success", "content": [{"text": "uploaded"}]}
+    events.append({"message": {"role": "user", "content": [{"toolResult": result}]}})
+    return events
+
+
+def stream(turns):
+    events = []
+    for turn in range(turns):
+        events += [{"reasoningText": REASONING[i:i + 4], "reasoning": True} for i in range(0, len(REASONING), 4)]
+        events += synthetic_turn(turn)
+        # Finish use_skill (while a sub-agent is active the parser skips main-agent tool calls)
+        result = {"toolUseId": f"skill_{turn}", "status": "success", "content": [{"text": "done"}]}
+        events.append({"message": {"role": "user", "content": [{"toolResult": result}]}})
+        events += partial_inputs(turn)
+    return events
+
+
+class App:
+    """Streamlit app model: a placeholder per source, re-rendered in full on every update"""
+
+    def __init__(self):
+        self.markdown: dict[str | None, str] = {}
+        self.updates = 0
+        self.rendered = 0
+
+    def update(self, output):
+        text = self.markdown[output.source] = self.markdown.get(output.source, "") + output.content
+        self.updates += 1
+        self.rendered += len(text)
+
+
+def count_input_prints(renderer):
+    """Count the tool inputs the renderer pretty-prints"""
+    counter = {"prints": 0}
+    tool_input_output = renderer._tool_input_output
+
+    def counting(event):
+        counter["prints"] += 1
+        return tool_input_output(event)
+
+    renderer._tool_input_output = counting
+    return counter
+
+
+def without_inputs(markdown):
+    return {source: INPUT_BLOCK.sub("", text) for source, text in markdown.items()}
+
+
+class Timed:
+    """Async source that sleeps between events"""
+
+    def __init__(self, events, delay):
+        self.events = events
+        self.delay = delay
+
+    async def __aiter__(self):
+        for event in self.events:
+            await asyncio.sleep(self.delay)
+            yield event
+
+
+def run_sync(renderer, events, delay, app):
+    for event in events:
+        time.sleep(delay)
+        for output in renderer.process(event):
+            app.update(output)
+    for output in renderer.flush():
+        app.update(output)
+
+
+async def run_async(renderer, events, delay, app):
+    async for output in renderer.aprocess(Timed(events, delay).__aiter__(), flush_interval=0):
+        app.update(output)
+
+
+def measure(label, fps, events, args, use_aprocess=False):
+    renderer = StreamlitStreamRenderer(StrandsEventParser(), max_updates_per_second=fps)
+    counter = count_input_prints(renderer)
+    app = App()
+    delay = args.event_delay / 1000
+    if use_aprocess:
+        asyncio.run(run_async(renderer, events, delay, app))
+    else:
+        run_sync(renderer, events, delay, app)
+    print(
+        f"{label:<16} updates {app.updates:6d}   re-rendered {app.rendered / 1e6:7.2f} M chars   "
+        f"tool inputs pretty-printed {counter['prints']:4d}"
+    )
+    return app.markdown
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--event-delay", type=float, default=2, help="Milliseconds between model events")
+    parser.add_argument("--fps", type=float, default=10, help="max_updates_per_second of the throttled runs")
+    args = parser.parse_args()
+
+    events = stream(args.turns)
+    print(f"Streamlit frames ({len(events)} events, event every {args.event_delay} ms)")
+    print("=" * 80)
+    before = measure("per event", 0, events, args)
+    after = measure(f"{args.fps:g} fps", args.fps, events, args)
+    after_async = measure(f"{args.fps:g} fps aprocess", args.fps, events, args, use_aprocess=True)
+    # Per event, every input update is printed; frames print each input once, when it is complete
+    assert without_inputs(before) == without_inputs(after) == without_inputs(after_async), "frames changed the markdown"
+
+
+if __name__ == "__main__":
+    main()
@@ -5,23 +5,16 @@ import json
 import subprocess
 
 # Ensure project root is in path
-sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from strands import Agent
-# IMPORT NOTE: Do NOT import shell from strands_tools as it breaks on Windows (termios dependency)
-from strands_tools import file_read, file_write 
-from agentskills import discover_skills, create_skill_tool, generate_skills_prompt, get_bedrock_agent_model
+# Model, tools (skill, file_read/file_write, sandboxed shell) and prompt:
+# "local" profile in agent/profiles.toml
+from utils.agent_profiles import PROFILES
 
 # Import custom parser/events to bypass potential renderer issues
 from utils.strands_stream.parser import StrandsEventParser
 from utils.strands_stream.events import TextEvent, ToolStreamEvent, CurrentToolUseEvent, ToolResultEvent, ReasoningEvent
 
-# --- Windows Compatible Tools ---
-
-from my_tools import execute_shell_command as shell_cmd # Rename back to shell or keep verify
-
-
-
 
 # --- Custom Renderer ---
 
@@ -59,44 +52,8 @@ class SimpleTerminalRenderer:
 async def main():
     print("--- PowerPoint Agent (Local Phase 1 - Windows Compatible) ---")
     
-    # 1. Discover Skills
-    skills_dir = Path(__file__).parent / "skills"
-    if not skills_dir.exists():
-        print(f"Error: Skills directory not found at {skills_dir}")
-        return
-        
-    skills = discover_skills(skills_dir)
-    print(f"Loaded {len(skills)} skills.")
-    
-    # 2. Create Skill Tool
-    skill_tool = create_skill_tool(skills, skills_dir)
-    
-    # 3. System Prompt
-    base_prompt = """あなたはPowerPoint作成・編集の専門エージェントです。
-`pptx` スキルを活用して、ユーザーの要望に応じたプレゼンテーションを作成します。
-
-**重要な指示:**
-1. **日本語対応**: ユーザーとの対話および、作成するスライドのコンテンツは原則として **日本語** を使用してください。
-2. **スキル利用**: `skill` ツールを使用して `pptx` スキルの詳細な手順(Instructions)を読み込んでください。
-3. **実行**: スキルの指示に従い、`shell` ツール等を使ってコマンドを実行し、成果物を作成してください。
-4. **スクリプトパス**: PPTXスクリプトは `/app/skills/pptx/scripts/` にあります。
-   - 例: `node /app/skills/pptx/scripts/create_ppt.js "タイトル" "内容"`
-5. **ファイル出力**: PPTXファイルを生成したら、`upload_to_s3` ツールを使ってS3にアップロードしてください。
-6. **エラー対応**: 依存関係のエラーが発生した場合は、その内容をユーザーに報告してください。
-"""
-
-    skills_prompt = generate_skills_prompt(skills)
-    full_prompt = f"{base_prompt}\n\n[Available Skills Metadata]\n{skills_prompt}"
-    
-    # 4. Create Agent
-    agent_model = get_bedrock_agent_model(thinking=True)
-    
-    agent = Agent(
-        system_prompt=full_prompt,
-        tools=[skill_tool, file_read, file_write, shell_cmd],
-        model=agent_model,
-        callback_handler=None
-    )
+    # 1. Create Agent (skills are discovered from /skills when the profile is compiled)
+    agent = PROFILES.get("local").build_agent(callback_handler=None)
     
     print("\nPPTXエージェントが起動しました。")
     print("入力例: 'AIエージェントについてのスライドを3枚作成して'")
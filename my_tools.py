@@ -1,13 +1,19 @@
 from strands import tool
-import subprocess
+import asyncio
+import codecs
 import json
 import boto3
 import os
+import signal
+import time
+from contextlib import aclosing
 from datetime import datetime
-try:
-    from ddgs import DDGS
-except ImportError:
-    DDGS = None
+from typing import AsyncIterator
+from utils.admission import ADMISSION, classify_command
+from utils.cancellation import current_cancel_scope
+from utils.sandbox import SANDBOX_POOL, ResourceLimits, SessionWorkspace, current_workspace
+from utils.telemetry import TELEMETRY, ToolSpan
+from utils.web_search import WEB_SEARCHER, dedupe_by_url, format_result
 
 @tool
 def search_web(query: str) -> str:
@@ -19,69 +25,256 @@ def search_web(query: str) -> str:
     Returns:
         Search results as string
     """
-    if DDGS is None:
+    if not getattr(WEB_SEARCHER.provider, "available", True):
         return "Search tool not available: duckduckgo_search package missing."
         
-    try:
-        results = []
-        with DDGS() as ddgs:
-            for r in ddgs.text(query, max_results=5):
-                results.append(f"Title: {r['title']}\nSnippet: {r['body']}\nURL: {r['href']}")
+    with TELEMETRY.span("search_web", bytes_in=len(query)) as span:
+        try:
+            results = [format_result(r) for r in WEB_SEARCHER.search(query, max_results=5)]
+            output = "\n\n".join(results) if results else "No results found."
+            span.bytes_out = len(output)
+            return output
+        except Exception as e:
+            span.status = "error"
+            span.error = str(e)
+            return f"Search Error: {e}"
+
+
+@tool
+async def search_web_many(queries: list[str]) -> str:
+    """Search the web for several queries at once using DuckDuckGo.
+    
+    Prefer this over repeated search_web calls when researching a topic from
+    multiple angles. Results are de-duplicated by URL across queries.
+    
+    Args:
+        queries: List of search queries
         
-        return "\n\n".join(results) if results else "No results found."
-    except Exception as e:
-        return f"Search Error: {e}"
+    Returns:
+        Search results grouped by query as string
+    """
+    if not getattr(WEB_SEARCHER.provider, "available", True):
+        return "Search tool not available: duckduckgo_search package missing."
+    
+    with TELEMETRY.span("search_web_many", queries=len(queries)) as span:
+        async with ADMISSION.tool_slot("search_web_many"):
+            outcomes = await WEB_SEARCHER.search_many(queries, max_results=5)
+        span.attributes["failed"] = sum(isinstance(r, Exception) for r in outcomes.values())
+    succeeded = {q: r for q, r in outcomes.items() if not isinstance(r, Exception)}
+    
+    sections = {}
+    for query, result in dedupe_by_url(succeeded):
+        sections.setdefault(query, []).append(format_result(result))
+    
+    output = []
+    for query, outcome in outcomes.items():
+        if isinstance(outcome, Exception):
+            output.append(f"## {query}\nSearch Error: {outcome}")
+        elif sections.get(query):
+            output.append(f"## {query}\n" + "\n\n".join(sections[query]))
+        else:
+            output.append(f"## {query}\nNo new results found.")
+    return "\n\n".join(output)
+
+
+SHELL_READ_CHUNK_BYTES = 4096
+
+
+class _CappedOutput:
+    """Keeps at most `limit` bytes of a stream while counting everything read"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.total_bytes = 0
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._parts: list[str] = []
+
+    @property
+    def truncated(self) -> bool:
+        return self.total_bytes > self.limit
+
+    def append(self, chunk: bytes) -> str:
+        """Store the part of `chunk` that fits under the cap and return it decoded"""
+        remaining = self.limit - self.total_bytes
+        self.total_bytes += len(chunk)
+        if remaining <= 0:
+            return ""
+        text = self._decoder.decode(chunk[:remaining])
+        self._parts.append(text)
+        return text
+
+    def text(self) -> str:
+        return "".join(self._parts) + self._decoder.decode(b"", final=True)
+
+
+def _kill_process_tree(process: asyncio.subprocess.Process) -> None:
+    """Kill a shell subprocess together with the commands it spawned"""
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
 
 
 @tool
-def execute_shell_command(command: str) -> str:
+async def execute_shell_command(command: str) -> AsyncIterator:
     """Run a shell command.
-    
+
     Args:
         command: Command to execute
-        
+
     Returns:
         Output of the command
     """
+    # The subprocess runs under asyncio
+    # in the session's sandbox workspace (see utils.sandbox), stdout/stderr chunks are
+    # yielded as tool stream events and only the first limits.output_bytes of each
+    # stream are kept for the final result.
+    # Expensive command classes (e.g. soffice) additionally wait for their own cap.
+    with TELEMETRY.span("execute_shell_command", bytes_in=len(command)) as span:
+        async with ADMISSION.tool_slot("execute_shell_command", *classify_command(command)):
+            async with SANDBOX_POOL.slot() as workspace:
+                # aclosing: if this generator is closed early, the runner's cleanup kills the command
+                async with aclosing(_run_sandboxed(command, workspace, SANDBOX_POOL.limits, span)) as runner:
+                    async for item in runner:
+                        yield item
+
+
+async def _run_sandboxed(
+    command: str, workspace: SessionWorkspace, limits: ResourceLimits, span: ToolSpan
+) -> AsyncIterator:
+    """Run `command` in `workspace` under `limits`, yielding output chunks then the result"""
+    cancel_scope = current_cancel_scope()
     try:
-        # Log the command being executed
-        print(f"[execute_shell_command] Executing: {command}", flush=True)
-        
-        # Use shell=True for windows command compatibility
-        result = subprocess.run(
-            command, 
-            shell=True, 
-            capture_output=True, 
-            text=True, 
-            encoding='utf-8', # Explicit encoding
-            errors='replace',
-            timeout=60  # 60 second timeout
+        process = await asyncio.create_subprocess_shell(
+            command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=workspace.scratch_dir,
+            # Temporary files go to the invocation's own directory (removed when it ends)
+            env=workspace.env(cancel_scope.tmp_dir if cancel_scope is not None else None),
+            preexec_fn=limits.preexec_fn(),
+            start_new_session=(os.name == "posix"),  # Own process group so the whole tree can be killed
         )
-        
-        print(f"[execute_shell_command] Exit code: {result.returncode}", flush=True)
-        print(f"[execute_shell_command] Stdout length: {len(result.stdout)}", flush=True)
-        print(f"[execute_shell_command] Stderr length: {len(result.stderr)}", flush=True)
-        
-        output = result.stdout.strip()
-        if result.stderr:
-            output += f"\n[Stderr]\n{result.stderr.strip()}"
-            
-        if result.returncode != 0:
-            error_msg = f"Command fail (Exit {result.returncode}):\n{output}"
-            print(f"[execute_shell_command] ERROR: {error_msg}", flush=True)
-            return error_msg
-        
-        print(f"[execute_shell_command] Success! Output: {output[:200]}...", flush=True)    
-        return output if output else "(No output)"
-        
-    except subprocess.TimeoutExpired:
-        error_msg = f"Command timeout after 60 seconds: {command}"
-        print(f"[execute_shell_command] TIMEOUT: {error_msg}", flush=True)
-        return error_msg
     except Exception as e:
-        error_msg = f"Execution Error: {e}"
-        print(f"[execute_shell_command] EXCEPTION: {error_msg}", flush=True)
-        return error_msg
+        span.status = "error"
+        span.error = str(e)
+        yield f"Execution Error: {e}"
+        return
+
+    outputs = {
+        "stdout": _CappedOutput(limits.output_bytes),
+        "stderr": _CappedOutput(limits.output_bytes),
+    }
+    # Bounded queue gives back-pressure: pipes are not read faster than events are consumed
+    queue: asyncio.Queue = asyncio.Queue(maxsize=16)
+
+    async def pump(stream_name: str, stream: asyncio.StreamReader) -> None:
+        while True:
+            chunk = await stream.read(SHELL_READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            text = outputs[stream_name].append(chunk)
+            if text:
+                await queue.put((stream_name, text))
+        await queue.put((stream_name, None))
+
+    async def kill_on_cancel() -> None:
+        # Client went away: stop the command now instead of letting it run to the timeout
+        await cancel_scope.wait()
+        _kill_process_tree(process)
+
+    readers = [
+        asyncio.create_task(pump("stdout", process.stdout)),
+        asyncio.create_task(pump("stderr", process.stderr)),
+    ]
+    killer = asyncio.create_task(kill_on_cancel()) if cancel_scope is not None else None
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + limits.timeout_seconds
+    open_streams = len(readers)
+    timed_out = False
+
+    try:
+        while open_streams:
+            try:
+                stream_name, text = await asyncio.wait_for(queue.get(), deadline - loop.time())
+            except asyncio.TimeoutError:
+                timed_out = True
+                break
+            if text is None:
+                open_streams -= 1
+                continue
+            yield {"stream": stream_name, "data": text}
+
+        if not timed_out:
+            try:
+                await asyncio.wait_for(process.wait(), max(deadline - loop.time(), 0))
+            except asyncio.TimeoutError:
+                timed_out = True
+    finally:
+        if killer is not None:
+            killer.cancel()
+        if process.returncode is None:
+            _kill_process_tree(process)
+            await process.wait()
+        for reader in readers:
+            reader.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+
+    stdout, stderr = outputs["stdout"], outputs["stderr"]
+    span.exit_code = process.returncode
+    span.bytes_out = stdout.total_bytes + stderr.total_bytes
+
+    if cancel_scope is not None and cancel_scope.cancelled:
+        span.status = "cancelled"
+        yield f"Command cancelled: {command}"
+        return
+
+    if timed_out:
+        span.status = "timeout"
+        yield f"Command timeout after {limits.timeout_seconds} seconds: {command}"
+        return
+
+    output = stdout.text().strip()
+    if stdout.truncated:
+        output += f"\n...(truncated, {stdout.total_bytes} bytes total)"
+    stderr_text = stderr.text().strip()
+    if stderr_text:
+        output += f"\n[Stderr]\n{stderr_text}"
+        if stderr.truncated:
+            output += f"\n...(truncated, {stderr.total_bytes} bytes total)"
+
+    if process.returncode != 0:
+        span.status = "error"
+        yield f"Command fail (Exit {process.returncode}):\n{output}"
+        return
+
+    yield output if output else "(No output)"
+
+
+def _auto_detect_bucket(s3_client) -> str | None:
+    """Find the first bucket with the 'strands-pptx-output' prefix"""
+    try:
+        response = s3_client.list_buckets()
+        for bucket in response.get('Buckets', []):
+            if bucket['Name'].startswith('strands-pptx-output'):
+                return bucket['Name']
+    except Exception:
+        pass
+    return None
+
+
+def _bucket_exists(s3_client, bucket: str | None) -> bool:
+    """Check that a bucket exists and is accessible"""
+    if bucket is None:
+        return False
+    try:
+        s3_client.head_bucket(Bucket=bucket)
+        return True
+    except Exception:
+        return False
 
 
 @tool
@@ -96,94 +289,57 @@ def upload_to_s3(file_path: str, bucket_name: str = None, s3_key: str = None) ->
     Returns:
         S3 URL or error message
     """
-    try:
-        print(f"[upload_to_s3] Starting upload...", flush=True)
-        print(f"[upload_to_s3] File path: {file_path}", flush=True)
-        print(f"[upload_to_s3] Bucket (requested): {bucket_name}", flush=True)
-        
-        # Function to check if bucket exists
-        def bucket_exists(bucket):
-            if bucket is None:
-                return False
-            try:
-                s3_client = boto3.client('s3')
-                s3_client.head_bucket(Bucket=bucket)
-                print(f"[upload_to_s3] Bucket {bucket} exists", flush=True)
-                return True
-            except Exception as e:
-                print(f"[upload_to_s3] Bucket {bucket} does not exist or access denied: {e}", flush=True)
-                return False
-        
-        # Function to auto-detect bucket
-        def auto_detect_bucket():
-            try:
-                print(f"[upload_to_s3] Attempting auto-detection...", flush=True)
-                s3_client = boto3.client('s3')
-                response = s3_client.list_buckets()
-                
-                # Look for bucket with 'strands-pptx-output' prefix
-                for bucket in response.get('Buckets', []):
-                    if bucket['Name'].startswith('strands-pptx-output'):
-                        detected_bucket = bucket['Name']
-                        print(f"[upload_to_s3] Auto-detected S3 bucket: {detected_bucket}", flush=True)
-                        return detected_bucket
-                
-                print(f"[upload_to_s3] No bucket with 'strands-pptx-output' prefix found", flush=True)
-                return None
-            except Exception as e:
-                print(f"[upload_to_s3] Auto-detection error: {e}", flush=True)
-                return None
-        
-        # Auto-detect bucket if not specified or if specified bucket doesn't exist
-        if bucket_name is None:
-            # Try environment variable first
-            bucket_name = os.environ.get('S3_BUCKET_NAME')
-            print(f"[upload_to_s3] Env S3_BUCKET_NAME: {bucket_name}", flush=True)
-        
-        # Validate bucket exists, otherwise auto-detect
-        if not bucket_exists(bucket_name):
-            print(f"[upload_to_s3] Specified/env bucket invalid, attempting auto-detection...", flush=True)
-            bucket_name = auto_detect_bucket()
-        
-        # Final validation
-        if bucket_name is None:
-            return "Error: No valid S3 bucket found. Please specify bucket_name parameter or create a bucket with 'strands-pptx-output' prefix."
-        
-        # Auto-generate S3 key if not specified
-        if s3_key is None:
-            timestamp = datetime.now().strftime('%Y%m%d-%H%M%S')
-            filename = os.path.basename(file_path)
-            s3_key = f"presentations/{timestamp}-{filename}"
-        
-        print(f"[upload_to_s3] S3 key: {s3_key}", flush=True)
-        
-        # Check if file exists
-        if not os.path.exists(file_path):
-            error_msg = f"Error: File not found: {file_path}"
-            print(f"[upload_to_s3] {error_msg}", flush=True)
-            return error_msg
-        
-        # Get file size
-        file_size = os.path.getsize(file_path)
-        print(f"[upload_to_s3] Uploading {file_path} ({file_size} bytes) to s3://{bucket_name}/{s3_key}", flush=True)
-        
-        # Upload to S3
-        s3_client = boto3.client('s3')
-        s3_client.upload_file(file_path, bucket_name, s3_key)
-        
-        # Generate URL
-        region = os.environ.get('AWS_REGION', 'ap-northeast-1')
-        s3_url = f"https://{bucket_name}.s3.{region}.amazonaws.com/{s3_key}"
-        
-        success_msg = f"Successfully uploaded to S3:\nBucket: {bucket_name}\nKey: {s3_key}\nURL: {s3_url}\nSize: {file_size} bytes"
-        print(f"[upload_to_s3] {success_msg}", flush=True)
-        return success_msg
-        
-    except Exception as e:
-        import traceback
-        error_msg = f"S3 Upload Error: {e}\n{traceback.format_exc()}"
-        print(f"[upload_to_s3] ERROR: {error_msg}", flush=True)
-        return error_msg
+    with TELEMETRY.span("upload_to_s3") as span:
+        try:
+            # Relative paths refer to the session's sandbox workspace
+            file_path = str(current_workspace().resolve(file_path))
+            s3_client = boto3.client('s3')
+            
+            # Auto-detect bucket if not specified or if specified bucket doesn't exist
+            if bucket_name is None:
+                # Try environment variable first
+                bucket_name = os.environ.get('S3_BUCKET_NAME')
+            
+            # Validate bucket exists, otherwise auto-detect
+            if not _bucket_exists(s3_client, bucket_name):
+                bucket_name = _auto_detect_bucket(s3_client)
+            
+            # Final validation
+            if bucket_name is None:
+                span.status = "error"
+                return "Error: No valid S3 bucket found. Please specify bucket_name parameter or create a bucket with 'strands-pptx-output' prefix."
+            
+            # Auto-generate S3 key if not specified
+            if s3_key is None:
+                timestamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+                filename = os.path.basename(file_path)
+                s3_key = f"presentations/{timestamp}-{filename}"
+            
+            # Check if file exists
+            if not os.path.exists(file_path):
+                span.status = "error"
+                return f"Error: File not found: {file_path}"
+            
+            # Get file size
+            file_size = os.path.getsize(file_path)
+            span.bytes_out = file_size
+            
+            # Upload to S3
+            started = time.perf_counter()
+            s3_client.upload_file(file_path, bucket_name, s3_key)
+            span.s3_latency_ms = (time.perf_counter() - started) * 1000
+            
+            # Generate URL
+            region = os.environ.get('AWS_REGION', 'ap-northeast-1')
+            s3_url = f"https://{bucket_name}.s3.{region}.amazonaws.com/{s3_key}"
+            
+            return f"Successfully uploaded to S3:\nBucket: {bucket_name}\nKey: {s3_key}\nURL: {s3_url}\nSize: {file_size} bytes"
+            
+        except Exception as e:
+            import traceback
+            span.status = "error"
+            span.error = str(e)
+            return f"S3 Upload Error: {e}\n{traceback.format_exc()}"
 
 
 @tool
@@ -198,67 +354,43 @@ def download_from_s3(s3_key: str, local_path: str = None, bucket_name: str = Non
     Returns:
         Local file path or error message
     """
-    try:
-        print(f"[download_from_s3] Starting download...", flush=True)
-        print(f"[download_from_s3] S3 key: {s3_key}", flush=True)
-        print(f"[download_from_s3] Bucket (requested): {bucket_name}", flush=True)
-        
-        # Function to auto-detect bucket (reuse logic from upload_to_s3)
-        def auto_detect_bucket():
-            try:
-                print(f"[download_from_s3] Attempting auto-detection...", flush=True)
-                s3_client = boto3.client('s3')
-                response = s3_client.list_buckets()
-                
-                # Look for bucket with 'strands-pptx-output' prefix
-                for bucket in response.get('Buckets', []):
-                    if bucket['Name'].startswith('strands-pptx-output'):
-                        detected_bucket = bucket['Name']
-                        print(f"[download_from_s3] Auto-detected S3 bucket: {detected_bucket}", flush=True)
-                        return detected_bucket
+    with TELEMETRY.span("download_from_s3") as span:
+        try:
+            s3_client = boto3.client('s3')
+            
+            # Auto-detect bucket if not specified
+            if bucket_name is None:
+                bucket_name = os.environ.get('S3_BUCKET_NAME')
                 
-                print(f"[download_from_s3] No bucket with 'strands-pptx-output' prefix found", flush=True)
-                return None
-            except Exception as e:
-                print(f"[download_from_s3] Auto-detection error: {e}", flush=True)
-                return None
-        
-        # Auto-detect bucket if not specified
-        if bucket_name is None:
-            bucket_name = os.environ.get('S3_BUCKET_NAME')
-            print(f"[download_from_s3] Env S3_BUCKET_NAME: {bucket_name}", flush=True)
+                if bucket_name is None:
+                    bucket_name = _auto_detect_bucket(s3_client)
             
+            # Final validation
             if bucket_name is None:
-                bucket_name = auto_detect_bucket()
-        
-        # Final validation
-        if bucket_name is None:
-            return "Error: No valid S3 bucket found. Please specify bucket_name parameter."
-        
-        # Auto-generate local path if not specified
-        if local_path is None:
-            filename = os.path.basename(s3_key)
-            local_path = f"/tmp/{filename}"
-        
-        print(f"[download_from_s3] Local path: {local_path}", flush=True)
-        
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(local_path), exist_ok=True)
-        
-        # Download from S3
-        s3_client = boto3.client('s3')
-        print(f"[download_from_s3] Downloading s3://{bucket_name}/{s3_key} to {local_path}...", flush=True)
-        s3_client.download_file(bucket_name, s3_key, local_path)
-        
-        # Get file size
-        file_size = os.path.getsize(local_path)
-        
-        success_msg = f"Successfully downloaded from S3:\nBucket: {bucket_name}\nKey: {s3_key}\nLocal path: {local_path}\nSize: {file_size} bytes"
-        print(f"[download_from_s3] {success_msg}", flush=True)
-        return success_msg
-        
-    except Exception as e:
-        import traceback
-        error_msg = f"S3 Download Error: {e}\n{traceback.format_exc()}"
-        print(f"[download_from_s3] ERROR: {error_msg}", flush=True)
-        return error_msg
+                span.status = "error"
+                return "Error: No valid S3 bucket found. Please specify bucket_name parameter."
+            
+            # Auto-generate local path if not specified (relative paths refer to the session workspace)
+            if local_path is None:
+                local_path = os.path.basename(s3_key)
+            local_path = str(current_workspace().resolve(local_path))
+            
+            # Ensure directory exists
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            
+            # Download from S3
+            started = time.perf_counter()
+            s3_client.download_file(bucket_name, s3_key, local_path)
+            span.s3_latency_ms = (time.perf_counter() - started) * 1000
+            
+            # Get file size
+            file_size = os.path.getsize(local_path)
+            span.bytes_in = file_size
+            
+            return f"Successfully downloaded from S3:\nBucket: {bucket_name}\nKey: {s3_key}\nLocal path: {local_path}\nSize: {file_size} bytes"
+            
+        except Exception as e:
+            import traceback
+            span.status = "error"
+            span.error = str(e)
+            return f"S3 Download Error: {e}\n{traceback.format_exc()}"
@@ -10,8 +10,14 @@ setup(
         "strands-agents>=1.0.0",
         "strands-agents-tools>=0.2.0",  # Required by internal skills_ref module
         "strictyaml>=1.0.0",  # YAML parsing for SKILL.md frontmatter
+        "tomli>=1.1.0; python_version < '3.11'",  # Agent profiles (tomllib on 3.11+)
     ],
     extras_require={
         "dev": ["pytest>=7.0", "pytest-asyncio>=0.21.0"],
+        # Optional speedups; the code falls back to the standard library without them
+        "speedups": [
+            "orjson>=3.8",  # Faster SSE encoding (SSEStreamRenderer)
+            "msgpack>=1.0",  # Compact binary stream renderer (pure-Python codec otherwise)
+        ],
     },
 )
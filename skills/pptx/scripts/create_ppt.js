@@ -9,13 +9,14 @@
  *   node create_simple_pptx.js /app/output.pptx "Tokyo Tower" "History: Built in 1958" "Structure: 333m tall"
  */
 
-const pptxgen = require('pptxgenjs');
 const path = require('path');
 const fs = require('fs');
 
 async function createSimplePresentation(outputPath, title, slideContents) {
   try {
     console.log('Initializing PowerPoint...');
+    // Loaded lazily so invocations delegated to warm_worker.js skip it
+    const pptxgen = require('pptxgenjs');
     const pptx = new pptxgen();
     pptx.layout = 'LAYOUT_16x9';
     pptx.author = 'Strands Agent';
@@ -108,15 +109,13 @@ async function createSimplePresentation(outputPath, title, slideContents) {
   }
 }
 
-// Main execution
-if (require.main === module) {
-  const args = process.argv.slice(2);
-
+// Main execution (returns the process exit code; also called by warm_worker.js)
+async function main(args) {
   if (args.length < 2) {
     console.error('Usage: node create_simple_pptx.js [output_path] <title> <slide1_content> [slide2_content] ...');
     console.error('Example: node create_simple_pptx.js "My Presentation" "Slide 1 content" "Slide 2 content"');
     console.error('Or: node create_simple_pptx.js output.pptx "My Presentation" "Slide 1 content" "Slide 2 content"');
-    process.exit(1);
+    return 1;
   }
 
   // Smart argument parsing: check if first arg is a file path (ends with .pptx) or a title
@@ -136,21 +135,24 @@ if (require.main === module) {
 
   if (slideContents.length === 0) {
     console.error('Error: At least one slide content is required');
-    process.exit(1);
+    return 1;
   }
 
-  createSimplePresentation(outputPath, title, slideContents)
-    .then(result => {
-      if (result.success) {
-        process.exit(0);
-      } else {
-        process.exit(1);
-      }
-    })
+  const result = await createSimplePresentation(outputPath, title, slideContents);
+  return result.success ? 0 : 1;
+}
+
+if (require.main === module) {
+  const args = process.argv.slice(2);
+
+  // Run inside a warm worker when one is listening, otherwise locally
+  require('./warm_worker').delegate(__filename, args)
+    .then(code => (code === null ? main(args) : code))
+    .then(code => process.exit(code))
     .catch(error => {
       console.error('Unexpected error:', error);
       process.exit(1);
     });
 }
 
-module.exports = { createSimplePresentation };
+module.exports = { createSimplePresentation, main };
@@ -22,6 +22,12 @@ Usage:
     python inventory.py input.pptx output.json
 """
 
+if __name__ == "__main__":
+    # Hand off to a running warm_worker.py before paying for the heavy imports below
+    from warm_worker import delegate
+
+    delegate(__file__)
+
 import argparse
 import json
 import platform
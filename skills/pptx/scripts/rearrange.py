@@ -9,6 +9,12 @@ This will create output.pptx using slides from template.pptx in the specified or
 Slides can be repeated (e.g., 34 appears twice).
 """
 
+if __name__ == "__main__":
+    # Hand off to a running warm_worker.py before paying for the heavy imports below
+    from warm_worker import delegate
+
+    delegate(__file__)
+
 import argparse
 import shutil
 import sys
@@ -9,6 +9,12 @@ ALL text shapes identified by inventory.py will have their text cleared
 unless "paragraphs" is specified in the replacements for that shape.
 """
 
+if __name__ == "__main__":
+    # Hand off to a running warm_worker.py before paying for the heavy imports below
+    from warm_worker import delegate
+
+    delegate(__file__)
+
 import json
 import sys
 from pathlib import Path
@@ -0,0 +1,250 @@
+#!/usr/bin/env node
+/**
+ * Warm Node.js worker for the pptx scripts
+ *
+ * Starting `node create_ppt.js` reloads pptxgenjs on every call. This worker keeps
+ * pptxgenjs (and html2pptx with its dependencies, when installed) loaded and runs
+ * script entry points on request over a local Unix socket.
+ *
+ * Usage:
+ *   node warm_worker.js serve [socket_path]
+ *
+ * Scripts export `main(args)` returning an exit code and call `delegate(__filename, args)`
+ * from their CLI block. When a worker is listening on the socket
+ * (PPTX_NODE_WORKER_SOCKET, default /tmp/pptx_node_worker.sock) the call is forwarded,
+ * otherwise `delegate` resolves to null and the script runs locally.
+ *
+ * Each job runs in its own child process forked from the worker. A spare child
+ * that has already loaded the modules is kept ready, so a job only pays for the
+ * fork. The child runs one script with the caller's working directory and
+ * environment, and then exits. Jobs run concurrently. When a client disconnects
+ * before its job finished (killed by the shell tool's timeout or a cancellation),
+ * only that job's child is killed. Node cannot lower the resource limits of a
+ * running process, so the caller's limits are not applied to the child. Only
+ * ALLOWED_SCRIPTS are run, and the socket is only accessible to the worker's user.
+ *
+ * Protocol (one request per connection, JSON lines):
+ *   request:  {"script": "/abs/path.js", "argv": [...], "cwd": "/abs/dir", "env": {...}}
+ *   response: {"exit_code": 0, "stdout": "...", "stderr": "..."}
+ */
+
+const { fork } = require('child_process');
+const fs = require('fs');
+const net = require('net');
+const path = require('path');
+
+const SOCKET_ENV = 'PPTX_NODE_WORKER_SOCKET';
+const DEFAULT_SOCKET = '/tmp/pptx_node_worker.sock';
+const PRELOAD_MODULES = ['pptxgenjs', './html2pptx'];
+// Scripts the worker runs; anything else sent to the socket is refused
+const ALLOWED_SCRIPTS = new Set(['create_ppt.js'].map((name) => path.join(__dirname, name)));
+
+function socketPath() {
+  return process.env[SOCKET_ENV] || DEFAULT_SOCKET;
+}
+
+/**
+ * Forward a CLI invocation to a running worker.
+ * Resolves to the worker's exit code, or null when no worker is available.
+ */
+function delegate(scriptPath, args) {
+  const sockPath = socketPath();
+  if (process.env.PPTX_WORKER_CHILD || !fs.existsSync(sockPath)) {
+    return Promise.resolve(null);
+  }
+
+  return new Promise((resolve) => {
+    const conn = net.createConnection(sockPath);
+    let buffer = '';
+    conn.setEncoding('utf8');
+    conn.on('connect', () => {
+      const request = { script: path.resolve(scriptPath), argv: args, cwd: process.cwd(), env: process.env };
+      conn.write(JSON.stringify(request) + '\n');
+    });
+    conn.on('data', (chunk) => { buffer += chunk; });
+    conn.on('end', () => {
+      try {
+        const response = JSON.parse(buffer);
+        process.stdout.write(response.stdout || '');
+        process.stderr.write(response.stderr || '');
+        resolve(response.exit_code);
+      } catch (error) {
+        resolve(null);
+      }
+    });
+    // Stale socket or broken worker: fall back to running locally
+    conn.on('error', () => resolve(null));
+  });
+}
+
+/**
+ * Child process side: preload the modules, then run the one job sent by the worker.
+ */
+function runChild() {
+  preload();
+  // Worker gone: nobody is waiting for the result any more
+  process.on('disconnect', () => process.exit(1));
+  process.once('message', async (request) => {
+    let exitCode = 0;
+    try {
+      // This process runs a single job, so it can take over the caller's env and cwd
+      replaceEnv({ ...request.env, PPTX_WORKER_CHILD: '1' });
+      process.chdir(request.cwd);
+      const mod = require(request.script);
+      if (typeof mod.main !== 'function') {
+        throw new Error(`${request.script} does not export main(args)`);
+      }
+      const result = await mod.main(request.argv || []);
+      exitCode = Number.isInteger(result) ? result : 0;
+    } catch (error) {
+      console.error(error.stack || error);
+      exitCode = 1;
+    }
+    process.exit(exitCode);
+  });
+}
+
+function preloadPath(name) {
+  return name.startsWith('.') ? path.join(__dirname, name) : name;
+}
+
+function preload() {
+  // Missing modules are reported once by serve(), not in every job's stderr
+  for (const name of PRELOAD_MODULES) {
+    try {
+      require(preloadPath(name));
+    } catch (error) {
+      // Not installed: the script loads (or reports) it itself
+    }
+  }
+}
+
+function replaceEnv(env) {
+  for (const name of Object.keys(process.env)) {
+    if (!(name in env)) {
+      delete process.env[name];
+    }
+  }
+  Object.assign(process.env, env);
+}
+
+function forkChild() {
+  // silent: the child's stdout/stderr are piped back to the worker
+  const child = fork(__filename, ['child'], { silent: true, env: { ...process.env, PPTX_WORKER_CHILD: '1' } });
+  const stdout = [];
+  const stderr = [];
+  child.stdout.setEncoding('utf8');
+  child.stderr.setEncoding('utf8');
+  child.stdout.on('data', (chunk) => { stdout.push(chunk); });
+  child.stderr.on('data', (chunk) => { stderr.push(chunk); });
+  // Resolves once the child exited and its output pipes are drained
+  child.result = new Promise((resolve) => {
+    child.on('close', (code, signal) => {
+      if (signal) {
+        stderr.push(`Worker child killed by ${signal}\n`);
+      }
+      resolve({ exit_code: code === null ? 1 : code, stdout: stdout.join(''), stderr: stderr.join('') });
+    });
+  });
+  return child;
+}
+
+function serve(sockPath) {
+  for (const name of PRELOAD_MODULES) {
+    try {
+      require.resolve(preloadPath(name));
+    } catch (error) {
+      console.error(`[warm_worker] Skipping preload of ${name}: ${error.message}`);
+    }
+  }
+  if (fs.existsSync(sockPath)) {
+    fs.unlinkSync(sockPath);
+  }
+
+  const running = new Set();
+  let spare = forkChild();
+
+  function takeChild() {
+    const child = spare.exitCode === null && spare.signalCode === null ? spare : forkChild();
+    spare = forkChild();
+    return child;
+  }
+
+  function runJob(request, conn) {
+    const script = path.resolve(request.script || '');
+    if (!ALLOWED_SCRIPTS.has(script)) {
+      conn.end(JSON.stringify({ exit_code: 1, stdout: '', stderr: `Worker error: ${request.script} is not a worker script\n` }) + '\n');
+      return;
+    }
+    const child = takeChild();
+    running.add(child);
+    // The job cannot be stopped from inside: if its client is gone, kill its child
+    conn.on('close', () => child.kill('SIGKILL'));
+    child.send({ script, argv: request.argv || [], cwd: request.cwd || process.cwd(), env: request.env || process.env });
+    child.result.then((response) => {
+      running.delete(child);
+      if (!conn.destroyed) {
+        conn.end(JSON.stringify(response) + '\n');
+      }
+    });
+  }
+
+  const server = net.createServer((conn) => {
+    let buffer = '';
+    let started = false;
+    conn.setEncoding('utf8');
+    conn.on('error', () => {});
+    conn.on('data', (chunk) => {
+      if (started) {
+        return;
+      }
+      buffer += chunk;
+      const newline = buffer.indexOf('\n');
+      if (newline === -1) {
+        return;
+      }
+      started = true;
+      let request;
+      try {
+        request = JSON.parse(buffer.slice(0, newline));
+      } catch (error) {
+        conn.end(JSON.stringify({ exit_code: 1, stdout: '', stderr: `Worker error: ${error.message}\n` }) + '\n');
+        return;
+      }
+      runJob(request, conn);
+    });
+  });
+
+  function cleanup() {
+    for (const child of [spare, ...running]) {
+      child.kill('SIGKILL');
+    }
+    if (fs.existsSync(sockPath)) {
+      fs.unlinkSync(sockPath);
+    }
+    process.exit(0);
+  }
+  process.on('SIGINT', cleanup);
+  process.on('SIGTERM', cleanup);
+
+  // Create the socket accessible to this user only (it runs code on request)
+  const previousUmask = process.umask(0o177);
+  server.listen(sockPath, () => {
+    process.umask(previousUmask);
+    console.log(`[warm_worker] Listening on ${sockPath}`);
+  });
+}
+
+if (require.main === module) {
+  const args = process.argv.slice(2);
+  if (args[0] === 'child') {
+    runChild();
+  } else if (args[0] === 'serve') {
+    serve(args[1] || socketPath());
+  } else {
+    console.error('Usage: node warm_worker.js serve [socket_path]');
+    process.exit(1);
+  }
+}
+
+module.exports = { delegate, socketPath };
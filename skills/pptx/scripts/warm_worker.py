@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Warm interpreter worker for the pptx Python scripts.
+
+Starting inventory.py, replace.py or rearrange.py in a fresh interpreter re-imports
+python-pptx, PIL and lxml every time. This worker imports them once and then runs
+script entry points on request over a local Unix socket. Each request is executed
+in a forked child of the warm process, so scripts stay isolated from each other
+while skipping the import cost.
+
+Usage:
+    python warm_worker.py serve [--socket PATH]
+
+The CLI scripts call delegate(__file__) before their heavy imports. When a worker is
+listening on the socket (PPTX_WORKER_SOCKET, default /tmp/pptx_py_worker.sock) the
+invocation is forwarded to it; otherwise the script simply runs locally.
+
+The child runs like the delegating process would have: with its working directory,
+environment (sandbox variables, TMPDIR) and CPU / address space limits. The client
+stays connected until the child answers; when it goes away (killed by the shell
+tool's timeout or a cancellation) the child is killed too. Only the scripts in
+ALLOWED_SCRIPTS are run, and the socket is only accessible to the worker's user.
+
+Protocol (one request per connection, JSON lines):
+    request:  {"script": "/abs/path.py", "argv": [...], "cwd": "/abs/dir",
+               "env": {...}, "limits": {"RLIMIT_CPU": [soft, hard], ...}}
+    response: {"exit_code": 0, "stdout": "...", "stderr": "..."}
+"""
+
+import argparse
+import importlib
+import io
+import json
+import os
+import runpy
+import select
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+SOCKET_ENV = "PPTX_WORKER_SOCKET"
+DEFAULT_SOCKET = "/tmp/pptx_py_worker.sock"
+# Set inside the worker so delegated scripts do not delegate again
+CHILD_ENV = "PPTX_WORKER_CHILD"
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+# Scripts the worker runs; anything else sent to the socket is refused
+ALLOWED_SCRIPTS = frozenset(str(SCRIPTS_DIR / name) for name in ("inventory.py", "replace.py", "rearrange.py"))
+
+# Resource limits of the delegating process applied to the child
+FORWARDED_LIMITS = ("RLIMIT_CPU", "RLIMIT_AS")
+
+# Modules kept warm in the worker process (script-local modules last)
+PRELOAD_MODULES = [
+    "lxml.etree",
+    "PIL.Image",
+    "PIL.ImageDraw",
+    "PIL.ImageFont",
+    "pptx",
+    "pptx.util",
+    "pptx.dml.color",
+    "pptx.enum.text",
+    "six",
+    "inventory",
+]
+
+
+def socket_path() -> str:
+    """Return the worker socket path from the environment or the default"""
+    return os.environ.get(SOCKET_ENV, DEFAULT_SOCKET)
+
+
+def delegate(script_path: str) -> None:
+    """Forward the current CLI invocation to a running worker, if any
+
+    Exits the process with the worker's exit code when the worker handled the
+    request. Returns normally (so the script runs locally) when no worker is
+    listening or this process already runs inside the worker.
+
+    Args:
+        script_path: Path of the calling script (usually __file__)
+    """
+    if os.environ.get(CHILD_ENV) or not hasattr(socket, "AF_UNIX"):
+        return
+
+    path = socket_path()
+    if not os.path.exists(path):
+        return
+
+    request = {
+        "script": str(Path(script_path).resolve()),
+        "argv": sys.argv[1:],
+        "cwd": os.getcwd(),
+        "env": dict(os.environ),
+        "limits": _current_limits(),
+    }
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.connect(path)
+            conn.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            response = json.loads(_read_line(conn))
+    except (OSError, ValueError):
+        # Stale socket or broken worker: fall back to running locally
+        return
+
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stderr.write(response.get("stderr", ""))
+    sys.stdout.flush()
+    sys.stderr.flush()
+    sys.exit(response.get("exit_code", 1))
+
+
+def _current_limits() -> dict[str, list[int]]:
+    """Soft and hard values of the forwarded resource limits of this process"""
+    try:
+        import resource
+    except ImportError:
+        return {}
+    return {name: list(resource.getrlimit(getattr(resource, name))) for name in FORWARDED_LIMITS}
+
+
+def _apply_limits(limits: dict[str, list[int]]) -> None:
+    """Apply the delegating process's resource limits to this process"""
+    if not limits:
+        return
+    import resource
+
+    for name, (soft, hard) in limits.items():
+        if name in FORWARDED_LIMITS:
+            resource.setrlimit(getattr(resource, name), (soft, hard))
+
+
+def _kill_on_disconnect(conn: socket.socket) -> None:
+    """Kill this process as soon as the client closes its end of the connection
+
+    The client sends nothing after its request, so the connection becoming
+    readable means it hung up (e.g. it was killed by the shell tool's timeout).
+    """
+
+    def watch():
+        select.select([conn], [], [])
+        try:
+            hung_up = not conn.recv(1, socket.MSG_PEEK)
+        except OSError:
+            hung_up = True
+        if hung_up:
+            os.kill(os.getpid(), signal.SIGKILL)
+
+    threading.Thread(target=watch, daemon=True).start()
+
+
+def _read_line(conn: socket.socket) -> bytes:
+    """Read one newline-terminated message from a socket"""
+    chunks = []
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if chunk.endswith(b"\n"):
+            break
+    return b"".join(chunks)
+
+
+def run_script(script: str, argv: list[str], cwd: str, env: dict[str, str] | None = None) -> dict:
+    """Run a script as __main__ in this process and capture its output
+
+    Args:
+        script: Absolute path of the script to run
+        argv: Arguments (without the script name)
+        cwd: Working directory for the script
+        env: Environment for the script (default: keep this process's)
+
+    Returns:
+        Response dict with exit_code, stdout and stderr
+    """
+    stdout, stderr = io.StringIO(), io.StringIO()
+    exit_code = 0
+
+    if env is not None:
+        os.environ.clear()
+        os.environ.update(env)
+        tempfile.tempdir = None  # Re-read TMPDIR
+    os.environ[CHILD_ENV] = "1"
+    os.chdir(cwd)
+    sys.argv = [script, *argv]
+    sys.path[0] = str(Path(script).parent)
+
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        try:
+            runpy.run_path(script, run_name="__main__")
+        except SystemExit as e:
+            if e.code is None:
+                exit_code = 0
+            elif isinstance(e.code, int):
+                exit_code = e.code
+            else:
+                print(e.code, file=sys.stderr)
+                exit_code = 1
+        except BaseException:
+            traceback.print_exc()
+            exit_code = 1
+
+    return {"exit_code": exit_code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Runs in a forked child of the warm worker process"""
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            script = str(Path(request["script"]).resolve())
+            if script not in ALLOWED_SCRIPTS:
+                raise PermissionError(f"{request['script']} is not a worker script")
+            _kill_on_disconnect(self.connection)
+            _apply_limits(request.get("limits") or {})
+            response = run_script(script, request.get("argv", []), request.get("cwd") or os.getcwd(), request.get("env"))
+        except Exception as e:
+            response = {"exit_code": 1, "stdout": "", "stderr": f"Worker error: {e}\n"}
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+class _ForkingUnixServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    pass
+
+
+def preload() -> None:
+    """Import the heavy dependencies once in the parent process"""
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    for module_name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except ImportError as e:
+            print(f"[warm_worker] Skipping preload of {module_name}: {e}", file=sys.stderr)
+
+
+def serve(path: str) -> None:
+    """Preload modules and serve requests on a Unix socket until interrupted"""
+    preload()
+    # Treat SIGTERM like Ctrl+C so the socket file is removed on shutdown
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    if os.path.exists(path):
+        os.unlink(path)
+    # Create the socket accessible to this user only (it runs code on request)
+    previous_umask = os.umask(0o177)
+    try:
+        server = _ForkingUnixServer(path, _RequestHandler)
+    finally:
+        os.umask(previous_umask)
+    with server:
+        print(f"[warm_worker] Listening on {path}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
+
+
+def main():
+    """Main entry point for command-line usage."""
+    parser = argparse.ArgumentParser(description="Warm interpreter worker for pptx scripts.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve_parser = subparsers.add_parser("serve", help="Start the worker")
+    serve_parser.add_argument("--socket", default=socket_path(), help="Unix socket path")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.socket)
+
+
+if __name__ == "__main__":
+    main()
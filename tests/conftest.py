@@ -0,0 +1,13 @@
+"""
+pytest configuration for the unit tests
+
+test_agentcore.py, test_deployment.py and test_template_agentcore.py are
+scripts that invoke a deployed agent (AWS credentials required); run them
+directly, pytest does not collect them.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+collect_ignore = ["test_agentcore.py", "test_deployment.py", "test_template_agentcore.py"]
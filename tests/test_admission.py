@@ -0,0 +1,129 @@
+"""
+Unit tests for invocation admission control and per-tool caps
+"""
+import asyncio
+
+import pytest
+
+from utils.admission import AdmissionController, AdmissionRejected, classify_command, parse_tool_limits
+
+
+async def hold(controller, release, log, name):
+    async with controller.admit():
+        log.append(name)
+        await release.wait()
+
+
+def test_invocations_beyond_the_queue_are_rejected_immediately():
+    async def main():
+        controller = AdmissionController(max_concurrent=2, max_queue=1, queue_timeout_seconds=5)
+        release, log = asyncio.Event(), []
+        tasks = [asyncio.create_task(hold(controller, release, log, i)) for i in range(3)]
+        await asyncio.sleep(0)
+        assert (controller.active, controller.queued) == (2, 1)
+        with pytest.raises(AdmissionRejected) as rejected:
+            async with controller.admit():
+                pass
+        assert rejected.value.reason == "queue full"
+        release.set()
+        await asyncio.gather(*tasks)
+        return controller, log
+
+    controller, log = asyncio.run(main())
+    assert log == [0, 1, 2]  # The queued invocation ran once a slot was free
+    stats = controller.stats()
+    assert (stats["admitted"], stats["rejected"], stats["active"], stats["queued"]) == (3, 1, 0, 0)
+    assert stats["max_queued"] == 1
+
+
+def test_queued_invocation_times_out():
+    async def main():
+        controller = AdmissionController(max_concurrent=1, max_queue=4, queue_timeout_seconds=0.05)
+        release = asyncio.Event()
+        holder = asyncio.create_task(hold(controller, release, [], "holder"))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as rejected:
+            async with controller.admit():
+                pass
+        assert rejected.value.reason == "queue timeout"
+        assert controller.queued == 0
+        release.set()
+        await holder
+        async with controller.admit():  # The slot is free again
+            assert controller.active == 1
+
+    asyncio.run(main())
+
+
+def test_slot_is_released_when_the_invocation_fails():
+    async def main():
+        controller = AdmissionController(max_concurrent=1, max_queue=0)
+        with pytest.raises(RuntimeError):
+            async with controller.admit():
+                raise RuntimeError("model error")
+        async with controller.admit():
+            pass
+        return controller
+
+    assert asyncio.run(main()).stats()["admitted"] == 2
+
+
+def test_tool_slots_cap_only_configured_tools():
+    async def main():
+        controller = AdmissionController(tool_limits={"soffice": 1})
+        running = {"soffice": 0, "max_soffice": 0, "other": 0, "max_other": 0}
+
+        async def tool(*names):
+            key = "soffice" if "soffice" in names else "other"
+            async with controller.tool_slot(*names):
+                running[key] += 1
+                running["max_" + key] = max(running["max_" + key], running[key])
+                await asyncio.sleep(0.01)
+                running[key] -= 1
+
+        await asyncio.gather(
+            *(tool("execute_shell_command", "soffice") for _ in range(3)),
+            *(tool("execute_shell_command") for _ in range(3)),
+        )
+        return running
+
+    running = asyncio.run(main())
+    assert running["max_soffice"] == 1
+    assert running["max_other"] == 3
+
+
+def test_classify_command():
+    assert classify_command("soffice --headless --convert-to pdf output.pptx") == ["soffice"]
+    assert classify_command("python skills/pptx/scripts/thumbnail.py output.pptx") == ["soffice"]
+    assert classify_command("node create_ppt.js") == []
+
+
+def test_parse_tool_limits():
+    assert parse_tool_limits("soffice=2, search_web_many=4,,bad") == {"soffice": 2, "search_web_many": 4}
+    assert parse_tool_limits("") == {}
+
+
+def test_acquired_slot_is_released_once():
+    async def main():
+        controller = AdmissionController(max_concurrent=1, max_queue=0)
+        release = await controller.acquire()
+        with pytest.raises(AdmissionRejected):
+            await controller.acquire()
+        release()
+        release()  # Second call is a no-op
+        assert controller.active == 0
+        second = await controller.acquire()
+        assert controller.active == 1
+        second()
+
+    asyncio.run(main())
+
+
+def test_prometheus_renders_the_stats():
+    controller = AdmissionController()
+    controller.admitted, controller.rejected = 3, 1
+    text = controller.prometheus()
+    assert "# TYPE agent_admission_queued gauge\nagent_admission_queued 0\n" in text
+    assert "agent_admission_admitted_total 3\n" in text
+    assert "agent_admission_rejected_total 1\n" in text
+    assert 'agent_admission_wait_ms{quantile="0.5"} 0\n' in text
@@ -0,0 +1,149 @@
+"""
+Unit tests for invocation cancellation and its scratch cleanup
+"""
+import asyncio
+
+import pytest
+
+from utils.cancellation import CANCELLATIONS, cancellation_scope, cancellations_prometheus, current_cancel_scope
+from utils.sandbox import SandboxPool
+
+
+class Request:
+    """Starlette request stand-in whose client disconnects when told to"""
+
+    def __init__(self):
+        self.disconnected = False
+
+    async def is_disconnected(self):
+        return self.disconnected
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    workspace = SandboxPool(scratch_root=tmp_path / "scratch", output_root=tmp_path / "output").workspace("s")
+    (workspace.scratch_dir / "template.pptx").write_text("uploaded in an earlier turn")
+    return workspace
+
+
+def entries(workspace):
+    return {path.name for path in workspace.scratch_dir.iterdir()}
+
+
+def test_client_disconnect_cancels_the_invocation(workspace):
+    async def main():
+        request = Request()
+        before = CANCELLATIONS["client_disconnected"]
+        async with cancellation_scope(request, workspace, poll_interval=0.01) as scope:
+            assert current_cancel_scope() is scope
+            request.disconnected = True
+            await asyncio.wait_for(scope.wait(), timeout=1)
+        assert scope.signal.is_set() and scope.reason == "client_disconnected"
+        assert CANCELLATIONS["client_disconnected"] == before + 1
+        assert current_cancel_scope() is None
+
+    asyncio.run(main())
+
+
+def test_cancelled_invocation_removes_only_its_own_files(workspace):
+    async def main():
+        async with cancellation_scope(None, workspace) as scope:
+            (scope.tmp_dir / "partial.xml").write_text("<xml/>")
+            (workspace.scratch_dir / "output.pptx").write_text("half-written")
+            scope.cancel("client_disconnected")
+        assert entries(workspace) == {"template.pptx"}
+
+    asyncio.run(main())
+
+
+def test_completed_invocation_keeps_its_files(workspace):
+    async def main():
+        async with cancellation_scope(None, workspace) as scope:
+            (scope.tmp_dir / "partial.xml").write_text("<xml/>")
+            (workspace.scratch_dir / "output.pptx").write_text("done")
+        assert entries(workspace) == {"template.pptx", "output.pptx"}  # Only the TMPDIR is removed
+
+    asyncio.run(main())
+
+
+def test_overlapping_invocation_keeps_the_other_files(workspace):
+    async def main():
+        other_started, cancelled = asyncio.Event(), asyncio.Event()
+
+        async def other():
+            async with cancellation_scope(None, workspace) as scope:
+                other_started.set()
+                (scope.tmp_dir / "theirs.tmp").write_text("other")
+                (workspace.scratch_dir / "theirs.pptx").write_text("other")
+                await cancelled.wait()
+            return scope
+
+        async with cancellation_scope(None, workspace) as mine:
+            task = asyncio.create_task(other())
+            await other_started.wait()
+            (mine.tmp_dir / "mine.tmp").write_text("mine")
+            mine.cancel("client_disconnected")
+        # The scratch entries cannot be attributed, so only this invocation's TMPDIR goes
+        assert not mine.tmp_dir.exists()
+        assert (workspace.scratch_dir / "theirs.pptx").exists()
+        theirs = entries(workspace) - {"template.pptx", "theirs.pptx"}
+        assert len(theirs) == 1 and (workspace.scratch_dir / theirs.pop() / "theirs.tmp").exists()
+        cancelled.set()
+        await task
+
+    asyncio.run(main())
+
+
+def test_cleanup_waits_for_running_commands(workspace):
+    async def main():
+        workspace.active_commands = 1  # A killed command that has not exited
+        async with cancellation_scope(None, workspace, drain_timeout=0.05) as scope:
+            (workspace.scratch_dir / "output.pptx").write_text("still being written")
+            scope.cancel("client_disconnected")
+        assert (workspace.scratch_dir / "output.pptx").exists()
+
+    asyncio.run(main())
+
+
+def test_aborted_generator_cancels_the_invocation(workspace):
+    async def main():
+        started = asyncio.Event()
+        scopes = []
+
+        async def invocation():
+            async with cancellation_scope(None, workspace) as scope:
+                scopes.append(scope)
+                started.set()
+                await asyncio.sleep(10)
+
+        task = asyncio.create_task(invocation())
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        [scope] = scopes
+        assert scope.reason == "aborted"
+        assert not scope.tmp_dir.exists()
+
+    asyncio.run(main())
+
+
+def test_first_reason_wins():
+    async def main():
+        async with cancellation_scope() as scope:
+            scope.cancel("client_disconnected")
+            scope.cancel("aborted")
+        return scope
+
+    scope = asyncio.run(main())
+    assert scope.reason == "client_disconnected"
+    assert scope.tmp_dir is None
+
+
+def test_cancellations_are_rendered_by_reason(monkeypatch):
+    monkeypatch.setitem(CANCELLATIONS, "client_disconnected", 3)
+    monkeypatch.setitem(CANCELLATIONS, "aborted", 1)
+    text = cancellations_prometheus()
+    assert text.startswith("# TYPE agent_cancellations_total counter\n")
+    assert 'agent_cancellations_total{reason="aborted"} 1\n' in text
+    assert 'agent_cancellations_total{reason="client_disconnected"} 3\n' in text
@@ -0,0 +1,237 @@
+"""
+Unit tests for StreamChannels: routing, opened-only buffering, coalescing and backpressure
+"""
+import asyncio
+import zlib
+
+import pytest
+
+from utils.strands_stream import StreamChannels
+from utils.strands_stream.events import TextEvent, ToolInputDeltaEvent, ToolResultEvent
+
+SKILL_USE = {"toolUseId": "skill_0", "name": "use_skill", "input": {"skill_name": "pptx"}}
+
+
+def text(data):
+    return {"data": data, "delta": {"text": data}}
+
+
+def sub(event, skill_name="pptx"):
+    return {"tool_stream_event": {"tool_use": SKILL_USE, "data": {"skill_name": skill_name, "event": event}}}
+
+
+def tool_result(tool_use_id):
+    return {"message": {"role": "user", "content": [{"toolResult": {
+        "toolUseId": tool_use_id, "status": "success", "content": [{"text": tool_use_id}],
+    }}]}}
+
+
+async def stream(events, delay=0.0, error=None):
+    for event in events:
+        if delay:
+            await asyncio.sleep(delay)
+        yield event
+    if error is not None:
+        raise error
+
+
+async def collect(iterator, delay=0.0):
+    events = []
+    async for event in iterator:
+        events.append(event)
+        if delay:
+            await asyncio.sleep(delay)
+    return events
+
+
+def joined(events):
+    return "".join(event.data for event in events)
+
+
+def interleaved(count):
+    """Main-agent deltas m0.. with two sub-agent deltas s0.. after each"""
+    events = []
+    for i in range(count):
+        events += [text(f"m{i} "), sub(text(f"s{i}a ")), sub(text(f"s{i}b "))]
+    return events
+
+
+def test_events_are_routed_per_source_and_merged_in_order():
+    raw = interleaved(20)
+
+    async def main():
+        channels = StreamChannels(stream(raw, delay=0.001))
+        main_channel, sub_channel, merged = channels.channel(None), channels.channel("pptx"), channels.merged()
+        async with channels:
+            return await asyncio.gather(collect(main_channel), collect(sub_channel), collect(merged))
+
+    main_events, sub_events, merged_events = asyncio.run(main())
+    assert joined(main_events) == "".join(f"m{i} " for i in range(20))
+    assert joined(sub_events) == "".join(f"s{i}a s{i}b " for i in range(20))
+    assert {event.source for event in sub_events} == {"pptx"}
+    assert [(event.source, event.data) for event in merged_events] == [
+        pair for i in range(20) for pair in ((None, f"m{i} "), ("pptx", f"s{i}a "), ("pptx", f"s{i}b "))
+    ]
+
+
+def test_only_opened_channels_are_buffered():
+    async def main():
+        channels = StreamChannels(stream(interleaved(10)))
+        main_channel = channels.channel(None)
+        async with channels:
+            events = await collect(main_channel)
+        return channels, events
+
+    channels, events = asyncio.run(main())
+    assert {event.source for event in events} == {None}
+    assert "pptx" not in channels.stats()
+
+
+def test_deltas_are_coalesced_in_a_full_buffer():
+    deltas = [f"token{i} " for i in range(200)]
+
+    async def main():
+        channels = StreamChannels(stream([text(delta) for delta in deltas]), max_buffer=4)
+        channel = channels.channel(None)
+        async with channels:
+            await asyncio.sleep(0.01)  # The whole stream arrives before the consumer reads
+            stats = channels.stats()[None]
+            events = await collect(channel)
+        return stats, events
+
+    stats, events = asyncio.run(main())
+    assert joined(events) == "".join(deltas)
+    assert len(events) == 4
+    assert stats["high_water"] == 4 and stats["buffered"] == 4
+    assert stats["coalesced"] == len(deltas) - 4
+    assert all(isinstance(event, TextEvent) for event in events)
+
+
+def test_tool_input_deltas_coalesce_into_one_contiguous_delta():
+    raw_input = '{"slides": [' + ", ".join(f'{{"title": "slide {i}"}}' for i in range(30)) + "]}"
+    prefixes = [raw_input[:end] for end in range(8, len(raw_input), 8)] + [raw_input]
+    raw = [{"current_tool_use": {"toolUseId": "t1", "name": "create_ppt", "input": prefix}} for prefix in prefixes]
+
+    async def main():
+        channels = StreamChannels(stream(raw), max_buffer=2)
+        channel = channels.channel(None)
+        async with channels:
+            await asyncio.sleep(0.01)
+            return await collect(channel)
+
+    events = asyncio.run(main())
+    deltas = [event for event in events if isinstance(event, ToolInputDeltaEvent)]
+    assert "".join(event.delta for event in deltas) == raw_input
+    offset = 0
+    for event in deltas:
+        assert event.offset == offset
+        offset += len(event.delta)
+        assert event.checksum == zlib.crc32(raw_input[:offset].encode("utf-8"))
+    assert len(events) <= 2
+
+
+def test_full_buffer_applies_backpressure_to_other_events():
+    raw = [tool_result(f"t{i}") for i in range(20)]
+
+    async def main():
+        channels = StreamChannels(stream(raw), max_buffer=3)
+        channel = channels.channel(None)
+        async with channels:
+            events = await collect(channel, delay=0.001)
+        return channels.stats()[None], events
+
+    stats, events = asyncio.run(main())
+    assert [event.tool_id for event in events] == [f"t{i}" for i in range(20)]  # Nothing dropped or merged
+    assert all(isinstance(event, ToolResultEvent) for event in events)
+    assert stats["high_water"] == 3
+    assert stats["waits"] > 0 and stats["dropped"] == 0
+
+
+def test_chatty_subagent_does_not_hold_back_the_main_agent():
+    raw = interleaved(50)
+
+    async def main():
+        channels = StreamChannels(stream(raw, delay=0.0005), max_buffer=4)
+        main_channel, sub_channel = channels.channel(None), channels.channel("pptx")
+        async with channels:
+            main_events = await asyncio.wait_for(collect(main_channel), timeout=5)
+            sub_stats = channels.stats()["pptx"]
+            sub_events = await collect(sub_channel)  # Read only after the main agent finished
+        return main_events, sub_events, sub_stats
+
+    main_events, sub_events, sub_stats = asyncio.run(main())
+    assert joined(main_events) == "".join(f"m{i} " for i in range(50))
+    assert joined(sub_events) == "".join(f"s{i}a s{i}b " for i in range(50))
+    assert sub_stats["high_water"] <= 4 and sub_stats["coalesced"] > 0
+
+
+def test_sources_opens_new_channels_from_their_first_event():
+    async def main():
+        channels = StreamChannels(stream(interleaved(5), delay=0.001))
+        tasks = {}
+        async with channels:
+            async for source in channels.sources():
+                await asyncio.sleep(0.005)  # Events keep arriving before the consumer attaches
+                tasks[source] = asyncio.create_task(collect(channels.channel(source)))
+            return {source: await task for source, task in tasks.items()}
+
+    events = asyncio.run(main())
+    assert joined(events[None]) == "".join(f"m{i} " for i in range(5))
+    assert joined(events["pptx"]) == "".join(f"s{i}a s{i}b " for i in range(5))
+
+
+def test_unattached_channel_drops_its_oldest_events():
+    raw = [text("m ")] + [sub(tool_result(f"t{i}")) for i in range(10)]
+
+    async def main():
+        channels = StreamChannels(stream(raw), max_buffer=3)
+        async with channels:
+            sources = [source async for source in channels.sources()]  # Opens "pptx" without a consumer
+            stats = channels.stats()["pptx"]
+            events = await collect(channels.channel("pptx"))
+        return sources, stats, events
+
+    sources, stats, events = asyncio.run(main())
+    assert sources == [None, "pptx"]
+    assert [event.tool_id for event in events] == ["t7", "t8", "t9"]
+    assert stats["dropped"] == 7 and stats["waits"] == 0
+
+
+def test_closing_a_channel_early_releases_the_pump():
+    raw = [tool_result(f"t{i}") for i in range(20)] + [sub(text("sub done"))]
+
+    async def main():
+        channels = StreamChannels(stream(raw), max_buffer=2)
+        main_channel, sub_channel = channels.channel(None), channels.channel("pptx")
+
+        async def first_two():
+            events = []
+            async for event in main_channel:
+                events.append(event)
+                if len(events) == 2:
+                    break
+            await main_channel.aclose()
+            return events
+
+        async with channels:
+            first, sub_events = await asyncio.wait_for(asyncio.gather(first_two(), collect(sub_channel)), timeout=2)
+        return channels.stats(), first, sub_events
+
+    stats, first, sub_events = asyncio.run(main())
+    assert [event.tool_id for event in first] == ["t0", "t1"]
+    assert joined(sub_events) == "sub done"
+    assert None not in stats  # The closed channel stopped buffering
+
+
+def test_stream_error_is_raised_after_the_buffered_events():
+    async def main():
+        channels = StreamChannels(stream([text("a"), text("b")], error=RuntimeError("model error")))
+        channel = channels.channel(None)
+        events = []
+        async with channels:
+            with pytest.raises(RuntimeError, match="model error"):
+                async for event in channel:
+                    events.append(event)
+        return events
+
+    assert joined(asyncio.run(main())) == "ab"
@@ -0,0 +1,96 @@
+"""
+Unit tests for the shared AgentCore app (admission before streaming, /metrics)
+"""
+import asyncio
+import json
+
+import pytest
+from starlette.testclient import TestClient
+from strands import Agent
+from strands.models import Model
+
+from utils import entrypoint
+from utils.admission import AdmissionController
+from utils.entrypoint import build_app
+from utils.warmup import WarmupPhase
+
+ANSWER = "富士山のスライドを作りました"
+
+
+class AnswerModel(Model):
+    """Model that streams ANSWER without calling tools"""
+
+    def get_config(self):
+        return {}
+
+    def update_config(self, **model_config):
+        pass
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        raise NotImplementedError
+        yield
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+        yield {"messageStart": {"role": "assistant"}}
+        yield {"contentBlockDelta": {"delta": {"text": ANSWER}}}
+        yield {"contentBlockStop": {}}
+        yield {"messageStop": {"stopReason": "end_turn"}}
+        yield {"metadata": {"usage": {"inputTokens": 10, "outputTokens": 5, "totalTokens": 15}, "metrics": {"latencyMs": 1}}}
+
+
+@pytest.fixture
+def agent_app(monkeypatch):
+    monkeypatch.setenv("SESSION_BACKEND", "none")
+    monkeypatch.setattr(entrypoint, "WARMUP", WarmupPhase(enabled=False))
+    monkeypatch.setattr(entrypoint, "ADMISSION", AdmissionController(max_concurrent=1, max_queue=0))
+    agent_app = build_app("pptx")
+    agent_app.pool.factory = lambda model_id: Agent(model=AnswerModel(), callback_handler=None)
+    return agent_app
+
+
+def sse_events(text):
+    return [json.loads(line[len("data: "):]) for line in text.splitlines() if line.startswith("data: ")]
+
+
+def test_admitted_invocation_streams_events_and_releases_its_slot(agent_app):
+    client = TestClient(agent_app.app)
+    for _ in range(2):  # The second request gets the slot the first one released
+        response = client.post("/invocations", json={"prompt": "富士山"})
+        assert response.status_code == 200
+        events = sse_events(response.text)
+        assert "usage_summary" in events[-1]
+        assert events[-1]["usage_summary"]["output_tokens"] == 5
+    assert entrypoint.ADMISSION.stats()["admitted"] == 2
+    assert entrypoint.ADMISSION.active == 0
+
+
+def test_overloaded_server_answers_503_before_streaming(agent_app, monkeypatch):
+    # No free slot and no room in the queue
+    monkeypatch.setattr(entrypoint, "ADMISSION", AdmissionController(max_concurrent=0, max_queue=0))
+    response = TestClient(agent_app.app).post("/invocations", json={"prompt": "富士山"})
+    assert response.status_code == 503
+    assert response.json()["reason"] == "queue full"
+    assert entrypoint.ADMISSION.stats()["rejected"] == 1
+
+
+def test_stream_dropped_before_it_starts_releases_its_slot(agent_app):
+    async def main():
+        events = await agent_app.invoke({"prompt": "富士山"})
+        assert entrypoint.ADMISSION.active == 1
+        del events
+        await asyncio.sleep(0)  # The release is scheduled on the loop
+
+    asyncio.run(main())
+    assert entrypoint.ADMISSION.active == 0
+
+
+def test_metrics_include_admission_gauges_and_counters(agent_app):
+    client = TestClient(agent_app.app)
+    client.post("/invocations", json={"prompt": "富士山"})
+    text = client.get("/metrics").text
+    assert "# TYPE agent_admission_active gauge" in text
+    assert "agent_admission_admitted_total 1" in text
+    assert "agent_admission_rejected_total 0" in text
+    assert 'agent_admission_wait_ms{quantile="0.95"}' in text
+    assert "# TYPE agent_cancellations_total counter" in text
+    assert "agent_invocations_total" in text  # Usage counters share the route
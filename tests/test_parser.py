@@ -0,0 +1,124 @@
+"""
+Unit tests for StrandsEventParser tool input handling and per-tool state
+"""
+import zlib
+
+from utils.strands_stream import StrandsEventParser
+from utils.strands_stream.events import CurrentToolUseEvent, ToolInputDeltaEvent
+
+
+def tool_use(tool_input, tool_use_id="tool_1", name="create_ppt"):
+    return {"current_tool_use": {"toolUseId": tool_use_id, "name": name, "input": tool_input}}
+
+
+def tool_result(tool_use_id, text="ok"):
+    return {"message": {"role": "user", "content": [{"toolResult": {
+        "toolUseId": tool_use_id, "status": "success", "content": [{"text": text}],
+    }}]}}
+
+
+def subagent(skill_name, event, skill_tool_id="skill_1"):
+    skill_use = {"toolUseId": skill_tool_id, "name": "use_skill", "input": {"skill_name": skill_name}}
+    return {"tool_stream_event": {"tool_use": skill_use, "data": {"skill_name": skill_name, "event": event}}}
+
+
+def tool_use_events(parser, *inputs):
+    return [
+        event
+        for tool_input in inputs
+        for event in parser.parse(tool_use(tool_input))
+        if isinstance(event, CurrentToolUseEvent)
+    ]
+
+
+def test_raw_input_is_streamed_as_append_only_deltas():
+    parser = StrandsEventParser()
+    raw = '{"file_path": "出力.pptx", "slides": 3}'
+    prefixes = [raw[:end] for end in range(4, len(raw), 4)] + [raw, raw]  # The last one repeats
+    deltas = [
+        event
+        for prefix in prefixes
+        for event in parser.parse(tool_use(prefix))
+        if isinstance(event, ToolInputDeltaEvent)
+    ]
+    assert "".join(event.delta for event in deltas) == raw
+    assert [event.offset for event in deltas] == list(range(0, len(raw), 4))
+    assert deltas[-1].checksum == zlib.crc32(raw.encode("utf-8"))
+
+
+def test_restarted_raw_input_starts_from_offset_zero():
+    parser = StrandsEventParser()
+    parser.parse(tool_use('{"a": 1'))
+    [event] = [e for e in parser.parse(tool_use('{"b"')) if isinstance(e, ToolInputDeltaEvent)]
+    assert (event.delta, event.offset) == ('{"b"', 0)
+
+
+def test_dict_input_is_emitted_only_when_it_changes():
+    parser = StrandsEventParser()
+    events = tool_use_events(parser, {"path": "a"}, {"path": "a"}, {"path": "a", "n": 1})
+    assert [event.tool_input for event in events] == [{"path": "a"}, {"path": "a", "n": 1}]
+
+
+def test_dict_input_value_edit_in_nested_value_is_detected():
+    parser = StrandsEventParser()
+    slides = {"slides": [{"title": "Fuji"}]}
+    edited = {"slides": [{"title": "Mt. Fuji"}]}
+    events = tool_use_events(parser, slides, dict(slides), edited)
+    assert [event.tool_input for event in events] == [slides, edited]
+
+
+def test_dict_input_with_same_keys_but_new_value_is_emitted():
+    parser = StrandsEventParser()
+    events = tool_use_events(parser, {"path": "a.pptx"}, {"path": "b.pptx"})
+    assert [event.tool_input["path"] for event in events] == ["a.pptx", "b.pptx"]
+
+
+def test_tool_state_is_dropped_at_the_result():
+    parser = StrandsEventParser()
+    parser.parse(tool_use('{"a": 1}'))
+    [result] = parser.parse(tool_result("tool_1"))
+    assert (result.tool_name, result.data) == ("create_ppt", "ok")
+    report = parser.memory_report()
+    for name in ("displayed_tool_calls", "tool_use_mapping", "tool_input_signatures", "tool_input_progress"):
+        assert report[name]["entries"] == 0, name
+    assert report["evicted_on_result"] == 1
+    # A late repeat of the finished call is ignored
+    assert parser.parse(tool_use('{"a": 1}')) == []
+
+
+def test_in_flight_and_finished_calls_are_capped():
+    parser = StrandsEventParser(max_tool_calls=3)
+    for i in range(10):  # Calls that never get a result (e.g. a cancelled invocation)
+        parser.parse(tool_use({"i": i}, tool_use_id=f"open_{i}"))
+    assert list(parser.displayed_tool_calls.values()) == ["open_7", "open_8", "open_9"]
+    assert len(parser.tool_input_signatures) == len(parser.tool_use_mapping) == 3
+    assert parser.evicted_by_cap == 7
+    for i in range(10):
+        parser.parse(tool_result(f"open_{i}"))
+    assert list(parser.completed_tool_calls) == ["open_7", "open_8", "open_9"]
+    assert parser.displayed_tool_calls == {}
+
+
+def test_active_subagent_tools_are_capped_oldest_first():
+    parser = StrandsEventParser(max_tool_calls=2)
+    for i in range(5):
+        parser.parse(subagent("pptx", {"data": "x", "delta": {"text": "x"}}, skill_tool_id=f"skill_{i}"))
+    assert list(parser.active_subagent_tools) == ["skill_3", "skill_4"]
+    parser.parse(tool_result("skill_4"))
+    assert list(parser.active_subagent_tools) == ["skill_3"]
+
+
+def test_tool_names_are_mapped_per_source():
+    parser = StrandsEventParser()
+    # The same toolUseId in two sub-agents and the main agent
+    parser.parse(subagent("pptx", tool_use({}, tool_use_id="t", name="inventory")))
+    parser.parse(subagent("docx", tool_use({}, tool_use_id="t", name="pandoc"), skill_tool_id="skill_2"))
+    [docx] = parser.parse(subagent("docx", tool_result("t"), skill_tool_id="skill_2"))
+    [pptx] = parser.parse(subagent("pptx", tool_result("t")))
+    assert (docx.source, docx.tool_name) == ("docx", "pandoc")
+    assert (pptx.source, pptx.tool_name) == ("pptx", "inventory")
+    parser.parse(tool_result("skill_1"))
+    parser.parse(tool_result("skill_2"))
+    parser.parse(tool_use({}, tool_use_id="t", name="upload_to_s3"))
+    [main] = parser.parse(tool_result("t"))
+    assert (main.source, main.tool_name) == (None, "upload_to_s3")
@@ -0,0 +1,123 @@
+"""
+Unit tests for the per-session shell sandboxes
+"""
+import asyncio
+
+import pytest
+
+from utils import sandbox
+from utils.sandbox import ResourceLimits, SandboxPool, current_workspace, session_scope
+
+
+@pytest.fixture
+def pool(tmp_path, monkeypatch):
+    """Sandbox pool under tmp_path, also used by session_scope / current_workspace"""
+    pool = SandboxPool(max_workers=2, scratch_root=tmp_path / "scratch", output_root=tmp_path / "output")
+    monkeypatch.setattr(sandbox, "SANDBOX_POOL", pool)
+    return pool
+
+
+def test_sessions_get_separate_workspaces(pool):
+    a, b = pool.workspace("session-a"), pool.workspace("session-b")
+    assert a.scratch_dir != b.scratch_dir and a.output_dir != b.output_dir
+    assert a.scratch_dir.is_dir() and a.output_dir.is_dir()
+    assert pool.workspace("session-a") is a
+    assert a.resolve("output.pptx") == a.scratch_dir / "output.pptx"
+
+
+def test_session_ids_cannot_escape_the_roots(pool):
+    workspace = pool.workspace("../../etc/x")
+    assert workspace.scratch_dir.parent == pool.scratch_root
+    assert workspace.output_dir.parent == pool.output_root
+
+
+def test_release_removes_scratch_and_keeps_output(pool):
+    workspace = pool.workspace("s")
+    (workspace.scratch_dir / "tmp.json").write_text("{}")
+    (workspace.output_dir / "output.pptx").write_text("pptx")
+    pool.release("s")
+    assert not workspace.scratch_dir.exists()
+    assert (workspace.output_dir / "output.pptx").exists()
+    pool.release("s")  # Releasing twice is a no-op
+    workspace = pool.workspace("s")
+    pool.release("s", keep_output=False)
+    assert not workspace.output_dir.exists()
+
+
+def test_session_scope_sets_the_current_workspace(pool):
+    with session_scope("s1") as workspace:
+        assert current_workspace() is workspace
+        assert workspace.session_id == "s1"
+    assert workspace.scratch_dir.exists()  # Session workspaces live until release
+
+
+def test_anonymous_requests_are_isolated_and_released(pool):
+    with session_scope(None) as first:
+        (first.scratch_dir / "template.pptx").write_text("first")
+        with session_scope(None) as second:
+            assert second.scratch_dir != first.scratch_dir
+            assert not (second.scratch_dir / "template.pptx").exists()
+        assert not second.scratch_dir.exists()
+        assert current_workspace() is first
+    assert not first.scratch_dir.exists()
+    assert first.output_dir.exists()
+
+
+def test_session_follows_spawned_tasks(pool):
+    async def workspace_in_task():
+        return current_workspace()
+
+    async def main():
+        with session_scope("s1") as workspace:
+            assert await asyncio.create_task(workspace_in_task()) is workspace
+        assert (await asyncio.create_task(workspace_in_task())).session_id == sandbox.DEFAULT_SESSION_ID
+
+    asyncio.run(main())
+
+
+def test_slots_bound_concurrent_commands(pool):
+    running = {"now": 0, "max": 0}
+
+    async def command(session_id):
+        async with pool.slot(session_id) as workspace:
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+            assert workspace.active_commands == 1
+            await asyncio.sleep(0.01)
+            running["now"] -= 1
+
+    async def main():
+        await asyncio.gather(*(command(f"s{i}") for i in range(6)))
+
+    asyncio.run(main())
+    assert running["max"] == pool.max_workers
+    assert all(workspace.active_commands == 0 for workspace in pool._workspaces.values())
+
+
+def test_remove_created_since_keeps_existing_entries(pool):
+    workspace = pool.workspace("s")
+    (workspace.scratch_dir / "template.pptx").write_text("keep")
+    snapshot = workspace.snapshot()
+    (workspace.scratch_dir / "output.pptx").write_text("new")
+    (workspace.scratch_dir / "unpacked").mkdir()
+    (workspace.scratch_dir / "unpacked" / "slide1.xml").write_text("<xml/>")
+    assert workspace.remove_created_since(snapshot) == 2
+    assert workspace.snapshot() == {"template.pptx"}
+
+
+def test_workspace_env_points_at_the_workspace(pool):
+    workspace = pool.workspace("s")
+    env = workspace.env()
+    assert env["SESSION_ID"] == "s"
+    assert env["SCRATCH_DIR"] == env["TMPDIR"] == str(workspace.scratch_dir)
+    assert env["OUTPUT_DIR"] == str(workspace.output_dir)
+    assert workspace.env(workspace.scratch_dir / ".tmp")["TMPDIR"] == str(workspace.scratch_dir / ".tmp")
+
+
+def test_resource_limits_from_env(monkeypatch):
+    monkeypatch.setenv("SANDBOX_TIMEOUT_SECONDS", "5")
+    monkeypatch.delenv("SANDBOX_MEMORY_BYTES", raising=False)
+    limits = ResourceLimits.from_env()
+    assert limits.timeout_seconds == 5
+    assert limits.memory_bytes == 0  # No address-space limit unless configured
+    assert ResourceLimits(cpu_seconds=0, memory_bytes=0).preexec_fn() is None
@@ -0,0 +1,238 @@
+"""
+Unit tests for the session-affine conversation store
+"""
+import asyncio
+import os
+import time
+from datetime import timedelta
+
+import pytest
+from strands import Agent
+
+from utils.agent_pool import AgentPool
+from utils.session_store import (
+    InMemoryS3Client,
+    LocalDiskBackend,
+    S3Backend,
+    SessionManager,
+    backend_from_env,
+    dumps_messages,
+    loads_messages,
+)
+
+MESSAGES = [
+    {"role": "user", "content": [{"text": "富士山のスライドを作って"}]},
+    {"role": "assistant", "content": [{"image": {"format": "png", "source": {"bytes": b"\x89PNG\x00"}}}]},
+]
+
+
+def make_pool():
+    return AgentPool(lambda model_id: Agent(model=model_id, callback_handler=None))
+
+
+def turn(text):
+    return {"role": "user", "content": [{"text": text}]}
+
+
+def age(path, seconds):
+    """Move a file's modification time `seconds` into the past"""
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_messages_roundtrip_with_bytes():
+    assert loads_messages(dumps_messages(MESSAGES)) == MESSAGES
+
+
+def test_disk_backend_expires_conversations(tmp_path):
+    backend = LocalDiskBackend(tmp_path, ttl_seconds=60)
+    backend.save("fresh", MESSAGES)
+    backend.save("stale", MESSAGES)
+    age(tmp_path / "stale.json", 120)
+    assert backend.load("fresh") == MESSAGES
+    assert backend.load("stale") is None
+    assert not (tmp_path / "stale.json").exists()
+    assert backend.load("missing") is None
+
+
+def test_disk_backend_purges_expired_files(tmp_path):
+    backend = LocalDiskBackend(tmp_path, ttl_seconds=60)
+    for session_id in ("a", "b", "c"):
+        backend.save(session_id, MESSAGES)
+    age(tmp_path / "a.json", 120)
+    age(tmp_path / "b.json", 120)
+    assert backend.purge_expired() == 2
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["c.json"]
+    assert LocalDiskBackend(tmp_path).purge_expired() == 0  # No TTL: nothing expires
+
+
+def test_disk_backend_keeps_session_files_inside_root(tmp_path):
+    backend = LocalDiskBackend(tmp_path / "sessions")
+    backend.save("../escape", MESSAGES)
+    assert [path.parent for path in (tmp_path / "sessions").iterdir()] == [tmp_path / "sessions"]
+    assert backend.load("../escape") == MESSAGES
+
+
+def test_s3_backend_expires_conversations():
+    client = InMemoryS3Client()
+    backend = S3Backend("bucket", client=client, ttl_seconds=60)
+    backend.save("s", MESSAGES)
+    assert backend.load("s") == MESSAGES
+    client.last_modified[("bucket", "sessions/s.json")] -= timedelta(seconds=120)
+    assert backend.load("s") is None
+    assert client.objects == {}
+    assert backend.load("s") is None
+
+
+def test_backend_from_env(monkeypatch, tmp_path):
+    for name in ("SESSION_BACKEND", "SESSION_TTL_SECONDS", "SESSION_BUCKET", "S3_BUCKET_NAME"):
+        monkeypatch.delenv(name, raising=False)
+    assert backend_from_env() is None  # In memory only unless configured
+
+    monkeypatch.setenv("SESSION_BACKEND", "disk")
+    monkeypatch.setenv("SESSION_DIR", str(tmp_path))
+    backend = backend_from_env()
+    assert isinstance(backend, LocalDiskBackend)
+    assert backend.root == tmp_path and backend.ttl_seconds == 86400
+    monkeypatch.setenv("SESSION_TTL_SECONDS", "0")
+    assert backend_from_env().ttl_seconds is None
+
+    monkeypatch.setenv("SESSION_BACKEND", "s3")
+    with pytest.raises(ValueError):
+        backend_from_env()
+
+
+def test_turns_of_a_session_continue_the_conversation(tmp_path):
+    async def main():
+        sessions = SessionManager(make_pool(), backend=LocalDiskBackend(tmp_path))
+        async with sessions.acquire("s", "model-a") as agent:
+            agent.messages.append(turn("first"))
+        async with sessions.acquire("s", "model-a") as same:
+            assert same is agent and same.messages == [turn("first")]
+            same.messages.append(turn("second"))
+        async with sessions.acquire("other", "model-a") as other:
+            assert other is not agent and other.messages == []
+
+        # A new process restores the conversation from the backend
+        restarted = SessionManager(make_pool(), backend=LocalDiskBackend(tmp_path))
+        async with restarted.acquire("s", "model-a") as restored:
+            assert restored.messages == [turn("first"), turn("second")]
+
+    asyncio.run(main())
+
+
+def test_failed_turn_keeps_the_last_saved_conversation(tmp_path):
+    async def main():
+        sessions = SessionManager(make_pool(), backend=LocalDiskBackend(tmp_path))
+        async with sessions.acquire("s", "model-a") as agent:
+            agent.messages.append(turn("first"))
+        with pytest.raises(RuntimeError):
+            async with sessions.acquire("s", "model-a") as agent:
+                agent.messages.append(turn("half-written"))
+                raise RuntimeError("stream failed")
+        async with sessions.acquire("s", "model-a") as agent:
+            assert agent.messages == [turn("first")]
+
+    asyncio.run(main())
+
+
+def test_end_session_forgets_the_conversation(tmp_path):
+    async def main():
+        released = []
+        backend = LocalDiskBackend(tmp_path)
+        sessions = SessionManager(make_pool(), backend=backend, on_release=released.append)
+        async with sessions.acquire("s", "model-a") as agent:
+            agent.messages.append(turn("first"))
+        await sessions.end_session("s")
+        assert sessions.live_sessions == 0
+        assert backend.load("s") is None
+        assert released == ["s"]
+        async with sessions.acquire("s", "model-a") as agent:
+            assert agent.messages == []
+
+    asyncio.run(main())
+
+
+def test_end_session_waits_for_the_running_turn(tmp_path):
+    async def main():
+        backend = LocalDiskBackend(tmp_path)
+        sessions = SessionManager(make_pool(), backend=backend)
+        in_turn, finish = asyncio.Event(), asyncio.Event()
+
+        async def running_turn():
+            async with sessions.acquire("s", "model-a") as agent:
+                in_turn.set()
+                await finish.wait()
+                agent.messages.append(turn("last"))
+
+        task = asyncio.create_task(running_turn())
+        await in_turn.wait()
+        ending = asyncio.create_task(sessions.end_session("s"))
+        await asyncio.sleep(0.01)
+        assert not ending.done()
+        finish.set()
+        await asyncio.gather(task, ending)
+        # The turn's save happened before the delete
+        assert backend.load("s") is None
+        assert sessions.live_sessions == 0
+
+    asyncio.run(main())
+
+
+def test_on_release_is_called_on_eviction_but_not_on_model_switch():
+    async def main():
+        released = []
+        sessions = SessionManager(make_pool(), max_live_sessions=1, on_release=released.append)
+        async with sessions.acquire("a", "model-a"):
+            pass
+        async with sessions.acquire("a", "model-b"):  # Same session on another model
+            pass
+        assert released == []
+        async with sessions.acquire("b", "model-a"):
+            pass
+        assert released == ["a"]
+        sessions.idle_timeout_seconds = 0
+        sessions.evict_idle()
+        assert released == ["a", "b"]
+
+    asyncio.run(main())
+
+
+def test_model_switch_keeps_the_conversation_without_a_backend():
+    async def main():
+        sessions = SessionManager(make_pool())
+        async with sessions.acquire("s", "model-a") as agent:
+            agent.messages.append(turn("first"))
+        async with sessions.acquire("s", "model-b") as switched:
+            assert switched is not agent
+            assert switched.messages == [turn("first")]
+            switched.messages.append(turn("second"))
+        async with sessions.acquire("s", "model-b") as same:
+            assert same is switched and same.messages == [turn("first"), turn("second")]
+        assert sessions.live_sessions == 1
+
+    asyncio.run(main())
+
+
+def test_disconnected_turn_rolls_back_to_the_last_complete_turn():
+    async def main():
+        sessions = SessionManager(make_pool())  # No backend: only the live agent holds the conversation
+        async with sessions.acquire("s", "model-a") as agent:
+            agent.messages.append(turn("first"))
+        in_turn = asyncio.Event()
+
+        async def interrupted_turn():
+            async with sessions.acquire("s", "model-a") as agent:
+                agent.messages.append(turn("half-written"))
+                in_turn.set()
+                await asyncio.sleep(10)
+
+        task = asyncio.create_task(interrupted_turn())
+        await in_turn.wait()
+        task.cancel()  # Client went away mid-stream
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        async with sessions.acquire("s", "model-a") as same:
+            assert same is agent and same.messages == [turn("first")]
+
+    asyncio.run(main())
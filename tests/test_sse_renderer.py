@@ -0,0 +1,118 @@
+"""
+Unit tests for the SSEStreamRenderer encoders and delta batching
+"""
+import datetime
+import json
+
+import pytest
+
+from utils.strands_stream import SSEStreamRenderer
+from utils.strands_stream.events import (
+    CurrentToolUseEvent,
+    LifecycleEvent,
+    ReasoningEvent,
+    TextEvent,
+    ToolInputDeltaEvent,
+    ToolResultEvent,
+    ToolStreamEvent,
+)
+from utils.strands_stream.renderers import sse
+
+ENCODERS = [pytest.param(sse.json_encoder, id="json")]
+if sse.ORJSON_AVAILABLE:
+    ENCODERS.append(pytest.param(sse.orjson_encoder, id="orjson"))
+
+
+class AgentResult:
+    """Stand-in for an SDK object the encoders cannot serialize"""
+
+    def __init__(self):
+        self.stop_reason = "end_turn"
+        self.message = {"role": "assistant"}
+        self._private = "hidden"
+
+
+EVENTS = [
+    (
+        TextEvent(data='富士山 "quotes" \\ \n\t  😀'),
+        {"type": "text", "data": '富士山 "quotes" \\ \n\t  😀'},
+    ),
+    (
+        TextEvent(data="sub", source="pptx"),
+        {"type": "text", "data": "sub", "source": "pptx"},
+    ),
+    (
+        CurrentToolUseEvent(tool_name="create_ppt", tool_id="t1", tool_input={"slides": [{"n": 1, "x": 1.5}]}),
+        {"type": "current_tool_use", "tool_name": "create_ppt", "tool_id": "t1",
+         "tool_input": {"slides": [{"n": 1, "x": 1.5}]}},
+    ),
+    (
+        ToolInputDeltaEvent(tool_name="create_ppt", tool_id="t1", delta='{"a":"é', offset=3, checksum=42, source="pptx"),
+        {"type": "tool_input_delta", "tool_name": "create_ppt", "tool_id": "t1", "delta": '{"a":"é',
+         "offset": 3, "checksum": 42, "source": "pptx"},
+    ),
+    (
+        ToolResultEvent(data="ok", tool_name="create_ppt", tool_id="t1", metadata={"status": "success"}),
+        {"type": "tool_result", "tool_name": "create_ppt", "tool_id": "t1", "data": "ok",
+         "metadata": {"status": "success"}},
+    ),
+    (
+        ToolStreamEvent(tool_use={"toolUseId": "t2"}, data={1: datetime.datetime(2025, 1, 2, 3, 4, 5)}),
+        {"type": "tool_stream_event", "tool_use": {"toolUseId": "t2"}, "data": {"1": "2025-01-02 03:04:05"}},
+    ),
+    (
+        ReasoningEvent(data="thinking", metadata={"signature": "sig"}),
+        {"type": "reasoning", "data": "thinking", "metadata": {"signature": "sig"}},
+    ),
+    (
+        LifecycleEvent(lifecycle_type="complete", result=AgentResult()),
+        {"type": "lifecycle", "lifecycle_type": "complete", "message": None, "force_stop_reason": None,
+         "result": {"stop_reason": "end_turn", "message": "{'role': 'assistant'}"}},
+    ),
+]
+
+
+def decode(frame):
+    assert frame.startswith("data: ") and frame.endswith("\n\n")
+    return json.loads(frame[len("data: "):-2])
+
+
+@pytest.mark.parametrize("encoder", ENCODERS)
+@pytest.mark.parametrize("event, payload", EVENTS)
+def test_frame_carries_the_payload(encoder, event, payload):
+    [frame] = SSEStreamRenderer(encoder=encoder).handle(event)
+    assert decode(frame) == payload
+
+
+@pytest.mark.skipif(not sse.ORJSON_AVAILABLE, reason="orjson not installed")
+@pytest.mark.parametrize("event, payload", EVENTS)
+def test_orjson_and_json_frames_are_equal(event, payload):
+    [fast] = SSEStreamRenderer(encoder=sse.orjson_encoder).handle(event)
+    [reference] = SSEStreamRenderer(encoder=sse.json_encoder).handle(event)
+    assert decode(fast) == decode(reference)
+    assert "\n" not in fast[:-2]  # A raw newline would end the SSE event early
+
+
+def test_batch_deltas_packs_consecutive_text_of_one_source():
+    renderer = SSEStreamRenderer(batch_deltas=True)
+    events = [
+        TextEvent(data="a"), TextEvent(data="b"),
+        TextEvent(data="x", source="pptx"), TextEvent(data="y", source="pptx"),
+        ToolResultEvent(data="ok", tool_id="t1"),
+        TextEvent(data="c"),
+    ]
+    outputs = [output for event in events for output in renderer.handle(event)]
+    [chunk] = renderer.merge_outputs(outputs)
+    payloads = [json.loads(frame[len("data: "):]) for frame in chunk.split("\n\n") if frame]
+    assert [(p["type"], p.get("data"), p.get("source")) for p in payloads] == [
+        ("text", "ab", None),
+        ("text", "xy", "pptx"),
+        ("tool_result", "ok", None),
+        ("text", "c", None),
+    ]
+
+
+def test_merge_outputs_without_batching_keeps_every_frame():
+    renderer = SSEStreamRenderer()
+    outputs = [output for data in "abc" for output in renderer.handle(TextEvent(data=data))]
+    assert renderer.merge_outputs(outputs) == ["".join(outputs)]
@@ -0,0 +1,69 @@
+"""
+Unit tests for the tool span recorder and its default stdout exporter
+"""
+import json
+import logging
+
+import pytest
+
+from utils.telemetry import TelemetryRecorder, stdout_logger
+
+
+def exported_lines(capsys):
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_full_batch_is_written_to_stdout(capsys):
+    recorder = TelemetryRecorder(batch_size=2)
+    with recorder.span("search_web", bytes_in=5) as span:
+        span.bytes_out = 42
+    assert capsys.readouterr().out == ""  # Still buffered
+    with recorder.span("upload_to_s3", key="output.pptx"):
+        pass
+
+    spans = exported_lines(capsys)
+    assert [s["tool"] for s in spans] == ["search_web", "upload_to_s3"]
+    assert (spans[0]["bytes_in"], spans[0]["bytes_out"], spans[0]["status"]) == (5, 42, "ok")
+    assert spans[1]["attributes"] == {"key": "output.pptx"}
+    assert recorder.snapshot() == []
+
+
+def test_flush_exports_a_partial_batch_with_failures(capsys):
+    recorder = TelemetryRecorder(batch_size=50)
+    with pytest.raises(ValueError):
+        with recorder.span("execute_shell_command"):
+            raise ValueError("boom")
+    recorder.flush()
+
+    [span] = exported_lines(capsys)
+    assert (span["tool"], span["status"], span["error"]) == ("execute_shell_command", "error", "ValueError: boom")
+
+
+def test_export_does_not_depend_on_the_logging_configuration(capsys):
+    root = logging.getLogger()
+    level = root.level
+    root.setLevel(logging.CRITICAL)
+    try:
+        recorder = TelemetryRecorder(batch_size=1)
+        with recorder.span("search_web"):
+            pass
+    finally:
+        root.setLevel(level)
+    assert [s["tool"] for s in exported_lines(capsys)] == ["search_web"]
+
+
+def test_stdout_logger_adds_its_handler_once():
+    first = stdout_logger("strands_agent.test_stdout")
+    second = stdout_logger("strands_agent.test_stdout")
+    assert first is second
+    assert len(first.handlers) == 1
+    assert not first.propagate
+
+
+def test_exporter_errors_are_swallowed():
+    def failing_exporter(batch):
+        raise RuntimeError("collector down")
+
+    recorder = TelemetryRecorder(batch_size=1, exporter=failing_exporter)
+    with recorder.span("search_web"):
+        pass  # Does not raise
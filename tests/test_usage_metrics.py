@@ -0,0 +1,61 @@
+"""
+Unit tests for usage accounting, the Prometheus counters and the EMF lines
+"""
+import json
+
+from utils.usage_metrics import UsageCollector, UsageMetrics
+
+
+def metadata(input_tokens, output_tokens, cache_read=0, latency_ms=100):
+    usage = {"inputTokens": input_tokens, "outputTokens": output_tokens, "cacheReadInputTokens": cache_read}
+    return {"event": {"metadata": {"usage": usage, "metrics": {"latencyMs": latency_ms}}}}
+
+
+def make_collector():
+    usage = UsageCollector()
+    usage.observe(metadata(100, 20, cache_read=300))
+    usage.observe({"message": {"role": "assistant", "content": [{"toolUse": {"toolUseId": "t1", "name": "search_web"}}]}})
+    usage.observe({"message": {"role": "user", "content": [{"toolResult": {"toolUseId": "t1", "status": "error"}}]}})
+    # A skill sub-agent's model call, forwarded by use_skill
+    usage.observe({"tool_stream_event": {"data": {"skill_name": "pptx", "event": metadata(50, 10)}}})
+    return usage
+
+
+def test_summary_adds_up_the_agent_and_its_skills():
+    summary = make_collector().summary("model-x", prices={"model-x": {"input": 3.0, "output": 15.0}})
+    assert (summary["input_tokens"], summary["output_tokens"], summary["cache_read_tokens"]) == (150, 30, 300)
+    assert summary["model_calls"] == 2
+    assert summary["cache_hit_ratio"] == round(300 / 450, 4)
+    assert summary["tools"]["search_web"]["calls"] == 1
+    assert summary["tools"]["search_web"]["errors"] == 1
+    assert summary["skills"]["pptx"]["input_tokens"] == 50
+    assert summary["cost_usd"] == round((150 * 3.0 + 30 * 15.0) / 1e6, 6)
+
+
+def test_record_writes_one_emf_line_to_stdout(capsys):
+    metrics = UsageMetrics(namespace="TestAgent")
+    metrics.record(make_collector(), profile="pptx", model="model-x")
+
+    [line] = capsys.readouterr().out.splitlines()
+    record = json.loads(line)
+    [directive] = record["_aws"]["CloudWatchMetrics"]
+    assert directive["Namespace"] == "TestAgent"
+    assert directive["Dimensions"] == [["model", "profile"]]
+    assert (record["profile"], record["InputTokens"], record["OutputTokens"]) == ("pptx", 150, 30)
+    assert record["skills"] == ["pptx"]
+
+
+def test_empty_namespace_disables_emf(capsys):
+    UsageMetrics(namespace="").record(make_collector(), profile="pptx")
+    assert capsys.readouterr().out == ""
+
+
+def test_prometheus_counters_include_skill_rows():
+    metrics = UsageMetrics(namespace="")
+    metrics.record(make_collector(), profile="pptx")
+    metrics.record(make_collector(), profile="pptx")
+    text = metrics.prometheus()
+    assert 'agent_invocations_total{profile="pptx"} 2' in text
+    assert 'agent_tokens_total{profile="pptx",type="input"} 200' in text
+    assert 'agent_tokens_total{profile="pptx",skill="pptx",type="input"} 100' in text
+    assert 'agent_tool_errors_total{profile="pptx",tool="search_web"} 2' in text
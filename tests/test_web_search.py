@@ -0,0 +1,139 @@
+"""
+Unit tests for the cached, concurrent web search (with a fake provider)
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from utils import web_search
+from utils.web_search import RateLimiter, TTLCache, WebSearcher, dedupe_by_url
+
+
+class FakeProvider:
+    """Returns canned results, records calls and fails for queries listed in `failing`"""
+
+    def __init__(self, results=None, failing=(), delay=0.0):
+        self.results = results or {}
+        self.failing = set(failing)
+        self.delay = delay
+        self.calls = []
+        self.threads = set()
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def search(self, query, max_results):
+        with self._lock:
+            self.calls.append(query)
+            self.threads.add(threading.current_thread().name)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if query in self.failing:
+                raise RuntimeError(f"provider failed for {query}")
+            return self.results.get(query, [{"title": query, "body": "", "href": f"https://example.com/{query}"}])
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_entries_expire_after_the_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(web_search.time, "monotonic", clock)
+    cache = TTLCache(ttl_seconds=10)
+    cache.set("q", [1])
+    clock.now += 9
+    assert cache.get("q") == [1]
+    clock.now += 2
+    assert cache.get("q") is None
+    assert len(cache) == 0  # The expired entry was dropped
+
+
+def test_cache_evicts_the_least_recently_used_entry():
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+
+
+def test_search_is_cached_by_normalized_query(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(web_search.time, "monotonic", clock)
+    provider = FakeProvider()
+    searcher = WebSearcher(provider, TTLCache(ttl_seconds=60), rate_per_second=0)
+    searcher.search("Mount  Fuji")
+    searcher.search("mount fuji ")
+    assert provider.calls == ["Mount  Fuji"]
+    clock.now += 61
+    searcher.search("mount fuji")
+    assert provider.calls == ["Mount  Fuji", "mount fuji"]
+
+
+def test_dedupe_by_url_keeps_the_first_occurrence():
+    results = {
+        "a": [{"href": "https://example.com/x"}, {"href": "https://example.com/y"}],
+        "b": [{"href": "https://EXAMPLE.com/x/"}, {"href": "https://example.com/z"}],
+    }
+    merged = dedupe_by_url(results)
+    assert [(q, r["href"]) for q, r in merged] == [
+        ("a", "https://example.com/x"),
+        ("a", "https://example.com/y"),
+        ("b", "https://example.com/z"),
+    ]
+
+
+def test_rate_limiter_spaces_out_calls():
+    async def main():
+        limiter = RateLimiter(rate=20)
+        started = time.monotonic()
+        for _ in range(4):
+            await limiter.wait()
+        return time.monotonic() - started
+
+    # The first call passes immediately, the next three wait 50 ms each
+    assert asyncio.run(main()) >= 0.14
+
+
+def test_search_many_searches_duplicates_once_and_reports_errors_per_query():
+    provider = FakeProvider(failing={"broken"})
+    searcher = WebSearcher(provider, rate_per_second=0)
+    outcomes = asyncio.run(searcher.search_many(["fuji", "Fuji", "broken", "tower"]))
+    assert list(outcomes) == ["fuji", "broken", "tower"]
+    assert sorted(provider.calls) == ["broken", "fuji", "tower"]
+    assert isinstance(outcomes["broken"], RuntimeError)
+    assert outcomes["tower"][0]["href"] == "https://example.com/tower"
+    # Failures are not cached
+    with pytest.raises(RuntimeError):
+        searcher.search("broken")
+
+
+def test_provider_calls_run_on_a_bounded_pool():
+    provider = FakeProvider(delay=0.02)
+    searcher = WebSearcher(provider, max_concurrency=2, rate_per_second=0)
+
+    async def main():
+        # Two concurrent batches share the searcher's pool
+        await asyncio.gather(
+            searcher.search_many([f"a{i}" for i in range(5)]),
+            searcher.search_many([f"b{i}" for i in range(5)]),
+        )
+
+    asyncio.run(main())
+    searcher.search("sync query")
+    assert len(provider.calls) == 11
+    assert provider.max_active == 2
+    assert len(provider.threads) <= 2
+    assert all(name.startswith("web-search") for name in provider.threads)
@@ -0,0 +1,133 @@
+"""
+Unit tests for the compact wire format: codec, CompactStreamRenderer and CompactStreamDecoder
+"""
+import json
+
+import pytest
+
+from utils.strands_stream import CompactStreamDecoder, CompactStreamRenderer, SSEStreamRenderer
+from utils.strands_stream import wire
+from utils.strands_stream.events import (
+    CurrentToolUseEvent,
+    LifecycleEvent,
+    MultiAgentHandoffEvent,
+    MultiAgentNodeStartEvent,
+    ReasoningEvent,
+    TextEvent,
+    ToolInputDeltaEvent,
+    ToolResultEvent,
+)
+
+VALUES = [
+    None, True, False,
+    0, 1, 127, 128, 255, 256, 65535, 65536, 2**32 - 1, 2**32, 2**64 - 1,
+    -1, -32, -33, -128, -129, -32768, -32769, -2**31, -2**31 - 1, -2**63,
+    0.0, 1.5, -2.25e300,
+    "", "a" * 31, "b" * 32, "c" * 255, "d" * 256, "e" * 65535, "f" * 65536, "富士山😀",
+    b"", b"\x00\xff" * 200, b"x" * 70000,
+    [], list(range(15)), list(range(16)), list(range(70000)),
+    {}, {str(i): i for i in range(15)}, {str(i): i for i in range(16)},
+    {"nested": [{"a": [1, "x", None]}, {"b": {"c": 2.5}}]},
+]
+
+
+@pytest.fixture
+def pure_python(monkeypatch):
+    """Use the pure-Python codec even if msgpack is installed"""
+    monkeypatch.setattr(wire, "MSGPACK_AVAILABLE", False)
+
+
+def unpack_all(data, chunk_size=None):
+    unpacker = wire.Unpacker()
+    chunk_size = chunk_size or len(data) or 1
+    objects = []
+    for start in range(0, len(data), chunk_size):
+        unpacker.feed(data[start:start + chunk_size])
+        objects.extend(unpacker)
+    return objects
+
+
+@pytest.mark.parametrize("value", VALUES, ids=lambda value: type(value).__name__)
+def test_pure_python_codec_roundtrip(pure_python, value):
+    assert unpack_all(wire.packb(value)) == [value]
+
+
+def test_pure_python_unpacker_keeps_partial_messages(pure_python):
+    messages = [[0, "富士山"], [1, "create_ppt", "t1", {"slides": list(range(20))}], "x" * 300, None]
+    data = b"".join(wire.packb(message) for message in messages)
+    for chunk_size in (1, 2, 7, 64):
+        assert unpack_all(data, chunk_size) == messages
+
+
+def test_pure_python_codec_converts_with_default(pure_python):
+    assert unpack_all(wire.packb({"at": object}, default=lambda obj: obj.__name__)) == [{"at": "object"}]
+    with pytest.raises(TypeError):
+        wire.packb(object())
+
+
+@pytest.mark.skipif(not wire.MSGPACK_AVAILABLE, reason="msgpack not installed")
+@pytest.mark.parametrize("value", VALUES, ids=lambda value: type(value).__name__)
+def test_pure_python_codec_matches_msgpack(value):
+    import msgpack
+    out = bytearray()
+    wire._pack(value, out, None)
+    assert bytes(out) == msgpack.packb(value, use_bin_type=True)
+
+
+EVENTS = [
+    TextEvent(data="富士山について"),
+    TextEvent(data="sub-agent text", source="pptx"),
+    CurrentToolUseEvent(tool_name="create_ppt", tool_id="t1", tool_input={"slides": [{"title": "Fuji"}]}),
+    ToolInputDeltaEvent(tool_name="create_ppt", tool_id="t1", delta='{"a": ', offset=0, checksum=123, source="pptx"),
+    ToolInputDeltaEvent(tool_name="create_ppt", tool_id="t1", delta='1}', offset=6, checksum=456, source="pptx"),
+    ToolResultEvent(data="ok", tool_name="create_ppt", tool_id="t1", metadata={"status": "success"}),
+    ToolResultEvent(data="sub ok", tool_name="inventory", tool_id="t2", source="pptx"),
+    ReasoningEvent(data="thinking", metadata={"signature": "sig"}),
+    LifecycleEvent(lifecycle_type="complete", result={"stop_reason": "end_turn"}),
+    LifecycleEvent(lifecycle_type="force_stop", force_stop_reason="cancelled"),
+    MultiAgentNodeStartEvent(node_id="writer", node_type="agent"),
+    MultiAgentHandoffEvent(from_node_ids=["writer"], to_node_ids=["reviewer"], message="done"),
+]
+
+
+def sse_payloads(events):
+    renderer = SSEStreamRenderer()
+    return [json.loads(frame[len("data: "):]) for event in events for frame in renderer.handle(event)]
+
+
+@pytest.mark.parametrize("chunk_size", [None, 1, 5])
+def test_decoder_returns_the_sse_payloads(chunk_size):
+    renderer = CompactStreamRenderer()
+    data = b"".join(output for event in EVENTS for output in renderer.handle(event))
+    decoder = CompactStreamDecoder()
+    chunk_size = chunk_size or len(data)
+    payloads = [
+        payload
+        for start in range(0, len(data), chunk_size)
+        for payload in decoder.feed(data[start:start + chunk_size])
+    ]
+    assert payloads == sse_payloads(EVENTS)
+
+
+def test_repeated_strings_are_sent_once():
+    renderer = CompactStreamRenderer()
+    first = b"".join(renderer.handle(EVENTS[3]))
+    second = b"".join(renderer.handle(EVENTS[4]))
+    assert first.count(b"create_ppt") == 1 and b"create_ppt" not in second
+    assert len(second) < len(first)
+
+
+def test_strings_past_the_table_cap_are_sent_inline():
+    renderer = CompactStreamRenderer(max_strings=2)
+    events = [ToolResultEvent(data="ok", tool_name=f"tool_{i}", tool_id=f"id_{i}", source="pptx") for i in range(4)]
+    data = b"".join(output for event in events for output in renderer.handle(event))
+    assert len(renderer.strings) == 2
+    assert CompactStreamDecoder().feed(data) == sse_payloads(events)
+
+
+def test_reset_starts_a_new_string_table():
+    renderer = CompactStreamRenderer()
+    renderer.handle(EVENTS[2])
+    renderer.reset()
+    data = b"".join(renderer.handle(EVENTS[5]))
+    assert CompactStreamDecoder().feed(data) == sse_payloads(EVENTS[5:6])
@@ -2,11 +2,13 @@
 
 from .strands_stream import (
     StrandsEventParser,
+    StreamChannels,
     # New names (recommended)
     BaseStreamRenderer,
     TerminalStreamRenderer,
     StreamlitStreamRenderer,
     SSEStreamRenderer,
+    CompactStreamRenderer,
     # Legacy aliases (backward compatibility)
     BaseAdapter,
     TerminalAdapter,
@@ -17,11 +19,13 @@ from .strands_stream import (
 
 __all__ = [
     "StrandsEventParser",
+    "StreamChannels",
     # Stream Renderers (recommended)
     "BaseStreamRenderer",
     "TerminalStreamRenderer",
     "StreamlitStreamRenderer",
     "SSEStreamRenderer",
+    "CompactStreamRenderer",
     # Legacy aliases (backward compatibility)
     "BaseAdapter",
     "TerminalAdapter",
@@ -0,0 +1,245 @@
+"""Admission control for AgentCore invocations and expensive tools
+
+Every invocation can spawn shell subprocesses, soffice conversions and a Bedrock
+stream, so unbounded bursts push the container into memory pressure and
+timeouts. AdmissionController bounds how many invocations run at once, keeps a
+bounded wait queue in front of them and rejects immediately once the queue is
+full (or after queue_timeout_seconds of waiting). Within admitted invocations,
+per-tool caps limit expensive tools such as soffice conversions.
+
+Usage:
+    >>> from utils.admission import ADMISSION
+    >>> async with ADMISSION.admit():
+    ...     async for event in agent.stream_async(prompt):
+    ...         ...
+    >>> async with ADMISSION.tool_slot("execute_shell_command", *classify_command(command)):
+    ...     ...
+
+Queue depth and wait times are recorded as "admission" spans through
+utils.telemetry (rejections are always exported) and summarized by stats(),
+which prometheus() renders for the /metrics route.
+
+Configuration (environment):
+    ADMISSION_MAX_CONCURRENT: Invocations running at once (default 8)
+    ADMISSION_MAX_QUEUE: Invocations allowed to wait for a slot (default 16)
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: Longest wait before rejection (default 30)
+    ADMISSION_TOOL_LIMITS: Per-tool caps, e.g. "soffice=2,search_web_many=4"
+"""
+
+import asyncio
+import os
+import re
+import time
+from collections import deque
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import AsyncIterator, Callable
+
+from .telemetry import TELEMETRY, ToolSpan
+
+# Shell commands that start LibreOffice (directly or through the pptx skill scripts)
+COMMAND_CLASSES = {
+    "soffice": re.compile(r"\b(soffice|libreoffice)\b|thumbnail\.py"),
+}
+
+
+class AdmissionRejected(Exception):
+    """Raised when an invocation cannot be admitted (queue full or wait timed out)"""
+
+    def __init__(self, reason: str, queue_depth: int):
+        super().__init__(f"Server busy ({reason}, {queue_depth} waiting); retry later")
+        self.reason = reason
+        self.queue_depth = queue_depth
+
+
+def classify_command(command: str) -> list[str]:
+    """Return the tool classes (keys of COMMAND_CLASSES) a shell command belongs to"""
+    return [name for name, pattern in COMMAND_CLASSES.items() if pattern.search(command)]
+
+
+def parse_tool_limits(spec: str) -> dict[str, int]:
+    """Parse "name=N,name=N" into a dict"""
+    limits = {}
+    for item in spec.split(","):
+        name, sep, value = item.partition("=")
+        if sep and name.strip():
+            limits[name.strip()] = int(value)
+    return limits
+
+
+class AdmissionController:
+    """Global invocation semaphore with a bounded wait queue and per-tool caps"""
+
+    def __init__(
+        self,
+        max_concurrent: int = 8,
+        max_queue: int = 16,
+        queue_timeout_seconds: float = 30,
+        tool_limits: dict[str, int] | None = None,
+    ):
+        """
+        Args:
+            max_concurrent: Invocations running at once
+            max_queue: Invocations allowed to wait; further ones are rejected immediately
+            queue_timeout_seconds: Longest wait for a slot before rejection
+            tool_limits: Concurrent runs allowed per tool name or command class
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.tool_limits = dict(tool_limits or {})
+        self.active = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._wait_ms: deque[float] = deque(maxlen=1024)
+        # Created lazily so they bind to the running event loop
+        self._semaphore: asyncio.Semaphore | None = None
+        self._tool_semaphores: dict[str, asyncio.Semaphore] = {}
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """Hold an invocation slot for the enclosed block
+
+        Raises:
+            AdmissionRejected: The wait queue is full or the wait timed out
+        """
+        release = await self.acquire()
+        try:
+            yield
+        finally:
+            release()
+
+    async def acquire(self) -> Callable[[], None]:
+        """Take an invocation slot and return the function releasing it
+
+        For callers that must know the outcome before they start the work, e.g.
+        to answer with an HTTP error instead of a stream. The returned function
+        may be called more than once; only the first call releases the slot.
+
+        Raises:
+            AdmissionRejected: The wait queue is full or the wait timed out
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        started = time.perf_counter()
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()  # Free slot: returns without suspending
+        elif self.queued >= self.max_queue:
+            self._reject("queue full", 0.0)
+        else:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout_seconds)
+            except asyncio.TimeoutError:
+                self._reject("queue timeout", (time.perf_counter() - started) * 1000)
+            finally:
+                self.queued -= 1
+        self._admitted("invocation", (time.perf_counter() - started) * 1000)
+        self.active += 1
+
+        semaphore = self._semaphore
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self.active -= 1
+                semaphore.release()
+
+        return release
+
+    @asynccontextmanager
+    async def tool_slot(self, *names: str) -> AsyncIterator[None]:
+        """Hold one slot of every capped tool in `names` (uncapped names are ignored)"""
+        capped = sorted(name for name in set(names) if name in self.tool_limits)
+        if not capped:
+            yield
+            return
+        async with AsyncExitStack() as stack:
+            for name in capped:  # Fixed order so overlapping caps cannot deadlock
+                semaphore = self._tool_semaphores.get(name)
+                if semaphore is None:
+                    semaphore = self._tool_semaphores[name] = asyncio.Semaphore(self.tool_limits[name])
+                started = time.perf_counter()
+                await stack.enter_async_context(semaphore)
+                self._record(name, (time.perf_counter() - started) * 1000, "ok")
+            yield
+
+    def stats(self) -> dict:
+        """Current queue depth, counters and wait-time percentiles"""
+        waits = sorted(self._wait_ms)
+
+        def percentile(q: float) -> float:
+            return round(waits[min(len(waits) - 1, int(len(waits) * q))], 3) if waits else 0.0
+
+        return {
+            "active": self.active,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "wait_ms_p50": percentile(0.5),
+            "wait_ms_p95": percentile(0.95),
+            "wait_ms_max": round(waits[-1], 3) if waits else 0.0,
+        }
+
+    def prometheus(self) -> str:
+        """stats() in Prometheus text exposition format"""
+        stats = self.stats()
+        metrics = [
+            ("agent_admission_active", "gauge", stats["active"]),
+            ("agent_admission_queued", "gauge", stats["queued"]),
+            ("agent_admission_max_queued", "gauge", stats["max_queued"]),
+            ("agent_admission_admitted_total", "counter", stats["admitted"]),
+            ("agent_admission_rejected_total", "counter", stats["rejected"]),
+        ]
+        lines = []
+        for name, kind, value in metrics:
+            lines += [f"# TYPE {name} {kind}", f"{name} {value:g}"]
+        lines.append("# TYPE agent_admission_wait_ms gauge")
+        for quantile, key in (("0.5", "wait_ms_p50"), ("0.95", "wait_ms_p95"), ("1", "wait_ms_max")):
+            lines.append(f'agent_admission_wait_ms{{quantile="{quantile}"}} {stats[key]:g}')
+        return "\n".join(lines) + "\n"
+
+    def _admitted(self, name: str, wait_ms: float) -> None:
+        self.admitted += 1
+        self._wait_ms.append(wait_ms)
+        self._record(name, wait_ms, "ok")
+
+    def _reject(self, reason: str, wait_ms: float) -> None:
+        self.rejected += 1
+        self._record("invocation", wait_ms, "rejected", error=reason)
+        raise AdmissionRejected(reason, self.queued)
+
+    def _record(self, name: str, wait_ms: float, status: str, error: str | None = None) -> None:
+        TELEMETRY.record(
+            ToolSpan(
+                tool="admission",
+                start_time=time.time(),
+                duration_ms=wait_ms,
+                status=status,
+                error=error,
+                attributes={"slot": name, "active": self.active, "queue_depth": self.queued},
+            )
+        )
+
+
+ADMISSION = AdmissionController(
+    max_concurrent=int(os.environ.get("ADMISSION_MAX_CONCURRENT", "8")),
+    max_queue=int(os.environ.get("ADMISSION_MAX_QUEUE", "16")),
+    queue_timeout_seconds=float(os.environ.get("ADMISSION_QUEUE_TIMEOUT_SECONDS", "30")),
+    tool_limits=parse_tool_limits(os.environ.get("ADMISSION_TOOL_LIMITS", "soffice=2")),
+)
+
+
+__all__ = [
+    "AdmissionController",
+    "AdmissionRejected",
+    "ADMISSION",
+    "COMMAND_CLASSES",
+    "classify_command",
+    "parse_tool_limits",
+]
@@ -0,0 +1,92 @@
+"""Per-process reuse of prepared Strands agents
+
+Building a BedrockModel and a strands.Agent (tool registry, hooks, model client)
+on every invocation adds setup latency to each request. AgentPool keeps idle,
+fully prepared agents per key (usually the model id) and hands one out per
+request with a fresh conversation, so only conversation state is created per
+request: messages, agent state, event loop metrics and the conversation
+manager's state are reset on every checkout.
+
+Usage:
+    >>> pool = AgentPool(lambda model_id: Agent(model=BedrockModel(model_id=model_id), ...))
+    >>> async with pool.acquire(model_id) as agent:
+    ...     async for event in agent.stream_async(prompt):
+    ...         ...
+
+An agent is checked out by one request at a time. Agents whose request ended
+with an exception are discarded instead of being returned to the pool.
+"""
+
+import asyncio
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Hashable, TYPE_CHECKING
+
+if TYPE_CHECKING:  # strands is only needed once an agent is built
+    from strands import Agent
+
+
+class AgentPool:
+    """Pool of prepared agents keyed by model id (or any hashable key)"""
+
+    def __init__(self, factory: Callable[[Hashable], "Agent"], max_idle_per_key: int = 8):
+        """
+        Args:
+            factory: Builds a new agent for a key
+            max_idle_per_key: Idle agents kept per key; extra agents are dropped
+        """
+        self.factory = factory
+        self.max_idle_per_key = max_idle_per_key
+        self.created = 0
+        self.reused = 0
+        self._idle: dict[Hashable, list["Agent"]] = defaultdict(list)
+        # Conversation manager state of a newly built agent, per key
+        self._fresh_manager_state: dict[Hashable, dict] = {}
+
+    def checkout(self, key: Hashable) -> "Agent":
+        """Take an idle agent for `key` (or build one) with an empty conversation"""
+        idle = self._idle[key]
+        if idle:
+            agent = idle.pop()
+            self.reused += 1
+            self._reset(key, agent)
+        else:
+            agent = self.factory(key)
+            self.created += 1
+            self._fresh_manager_state.setdefault(key, agent.conversation_manager.get_state())
+        agent.messages = []
+        return agent
+
+    def _reset(self, key: Hashable, agent: "Agent") -> None:
+        """Drop what the previous request left on a pooled agent"""
+        from strands.agent.state import AgentState
+        from strands.telemetry.metrics import EventLoopMetrics
+
+        agent.state = AgentState()
+        agent.event_loop_metrics = EventLoopMetrics()  # Its traces grow with every invocation
+        agent.conversation_manager.restore_from_session(self._fresh_manager_state[key])
+
+    def checkin(self, key: Hashable, agent: "Agent") -> None:
+        """Return an agent to the pool"""
+        idle = self._idle[key]
+        if len(idle) < self.max_idle_per_key:
+            idle.append(agent)
+
+    @asynccontextmanager
+    async def acquire(self, key: Hashable) -> AsyncIterator["Agent"]:
+        """Check out an agent for the duration of one request"""
+        agent = self.checkout(key)
+        try:
+            yield agent
+        except (Exception, asyncio.CancelledError):
+            # Conversation may be half-written; let the agent go
+            raise
+        else:
+            self.checkin(key, agent)
+
+    def clear(self) -> None:
+        """Drop all idle agents"""
+        self._idle.clear()
+
+
+__all__ = ["AgentPool"]
@@ -0,0 +1,192 @@
+"""Declarative agent profiles shared by all entrypoints
+
+agentcore_entrypoint.py, agent/__main__.py and local/my_pptx_agent.py used to
+hard-code their own system prompt, tool list and model settings. They now read
+named profiles from agent/profiles.toml, which is parsed once per process. A
+profile is compiled (tools imported, skills prompt generated) the first time an
+agent is built from it, and requests select a profile by name, so a new variant
+(e.g. the lightweight "inventory" agent) needs no new code path.
+
+Usage:
+    >>> from utils.agent_profiles import PROFILES
+    >>> profile = PROFILES.get(payload.get("profile", DEFAULT_PROFILE))
+    >>> AGENT_POOL = AgentPool(PROFILES.build_agent)
+    >>> async with AGENT_POOL.acquire((profile.name, profile.model_id)) as agent:
+    ...     ...
+
+Configuration (environment):
+    AGENT_PROFILES_FILE: Profiles file (default agent/profiles.toml)
+    AGENT_PROFILE: Profile used when a request does not name one
+"""
+
+import importlib
+import os
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Hashable, TYPE_CHECKING
+
+try:
+    import tomllib
+except ImportError:  # Python 3.10
+    import tomli as tomllib
+
+from agentskills.prompt import ROOT_DIR
+
+if TYPE_CHECKING:  # strands is imported when the first agent is built
+    from strands import Agent
+
+DEFAULT_PROFILES_FILE = ROOT_DIR / "agent" / "profiles.toml"
+
+SKILLS_DIR = ROOT_DIR / "skills"
+
+# Tool names usable in profiles; any other entry must be a "module:attribute" reference
+TOOL_REFERENCES = {
+    "search_web": "my_tools:search_web",
+    "search_web_many": "my_tools:search_web_many",
+    "execute_shell_command": "my_tools:execute_shell_command",
+    "upload_to_s3": "my_tools:upload_to_s3",
+    "download_from_s3": "my_tools:download_from_s3",
+    "file_read": "strands_tools:file_read",
+    "file_write": "strands_tools:file_write",
+}
+
+_PROFILE_KEYS = {"description", "tools", "skills", "system_prompt", "model"}
+
+
+class ProfileError(ValueError):
+    """Invalid profiles file or unknown profile name"""
+
+
+def resolve_tool(name: str) -> Any:
+    """Import a tool by profile name or "module:attribute" reference"""
+    module_name, _, attribute = TOOL_REFERENCES.get(name, name).partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+@dataclass(frozen=True)
+class AgentProfile:
+    """One agent variant: model settings, tools and system prompt
+
+    Attributes:
+        name: Profile name (the key under [profiles] in the file)
+        system_prompt: System prompt text
+        tools: Tool names or "module:attribute" references
+        model: strands BedrockModel keyword arguments (including model_id)
+        skills: Add the skill tool and the skills metadata to the prompt
+        description: One-line summary
+    """
+
+    name: str
+    system_prompt: str
+    tools: tuple[str, ...]
+    model: dict[str, Any] = field(hash=False)
+    skills: bool = False
+    description: str = ""
+
+    @property
+    def model_id(self) -> str:
+        return self.model["model_id"]
+
+    @cached_property
+    def compiled(self) -> tuple[list, str]:
+        """Tool objects and full system prompt (built once per process)"""
+        tools = [resolve_tool(name) for name in self.tools]
+        system_prompt = self.system_prompt
+        if self.skills:
+            from agentskills import create_skill_tool, discover_skills, generate_skills_prompt
+
+            skills = discover_skills(SKILLS_DIR)
+            tools.insert(0, create_skill_tool(skills, SKILLS_DIR))
+            system_prompt = f"{system_prompt}\n\n[Available Skills Metadata]\n{generate_skills_prompt(skills)}"
+        return tools, system_prompt
+
+    def build_agent(self, model_id: str | None = None, **agent_kwargs: Any) -> "Agent":
+        """Build a new agent from this profile
+
+        Args:
+            model_id: Overrides the profile's model id
+            **agent_kwargs: Extra strands.Agent arguments (e.g. callback_handler)
+        """
+        from strands import Agent
+        from strands.models import BedrockModel
+
+        tools, system_prompt = self.compiled
+        model = BedrockModel(**{**self.model, "model_id": model_id or self.model_id})
+        return Agent(model=model, tools=list(tools), system_prompt=system_prompt, **agent_kwargs)
+
+
+def _parse_profile(name: str, table: dict[str, Any]) -> AgentProfile:
+    unknown = set(table) - _PROFILE_KEYS
+    if unknown:
+        raise ProfileError(f"Profile '{name}': unknown keys {sorted(unknown)}")
+    if not isinstance(table.get("system_prompt"), str):
+        raise ProfileError(f"Profile '{name}': system_prompt is required")
+    model = table.get("model", {})
+    if not isinstance(model.get("model_id"), str):
+        raise ProfileError(f"Profile '{name}': model.model_id is required")
+    tools = table.get("tools", [])
+    for tool in tools:
+        if tool not in TOOL_REFERENCES and ":" not in tool:
+            raise ProfileError(f"Profile '{name}': unknown tool '{tool}'")
+    return AgentProfile(
+        name=name,
+        system_prompt=table["system_prompt"],
+        tools=tuple(tools),
+        model=dict(model),
+        skills=bool(table.get("skills", False)),
+        description=table.get("description", ""),
+    )
+
+
+class AgentProfiles:
+    """Named agent profiles loaded from a TOML file"""
+
+    def __init__(self, profiles: dict[str, AgentProfile]):
+        self.profiles = profiles
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "AgentProfiles":
+        """Parse and validate a profiles file (tools are imported on first use)"""
+        try:
+            with open(path, "rb") as f:
+                data = tomllib.load(f)
+        except (OSError, tomllib.TOMLDecodeError) as e:
+            raise ProfileError(f"Cannot load agent profiles from {path}: {e}") from e
+        tables = data.get("profiles", {})
+        if not tables:
+            raise ProfileError(f"No [profiles.*] tables in {path}")
+        return cls({name: _parse_profile(name, table) for name, table in tables.items()})
+
+    @property
+    def names(self) -> list[str]:
+        return list(self.profiles)
+
+    def get(self, name: str) -> AgentProfile:
+        """Return a profile by name
+
+        Raises:
+            ProfileError: If there is no such profile
+        """
+        profile = self.profiles.get(name)
+        if profile is None:
+            raise ProfileError(f"Unknown agent profile '{name}' (available: {', '.join(self.names)})")
+        return profile
+
+    def build_agent(self, key: Hashable) -> "Agent":
+        """AgentPool factory: build an agent for a (profile name, model id) key"""
+        name, model_id = key
+        return self.get(name).build_agent(model_id)
+
+
+PROFILES = AgentProfiles.from_file(os.environ.get("AGENT_PROFILES_FILE", DEFAULT_PROFILES_FILE))
+
+
+__all__ = [
+    "AgentProfile",
+    "AgentProfiles",
+    "ProfileError",
+    "PROFILES",
+    "TOOL_REFERENCES",
+    "resolve_tool",
+]
@@ -0,0 +1,198 @@
+"""Cancellation of invocations whose client went away
+
+When a caller abandons a streaming invocation, the agent would otherwise keep
+calling the model and running shell commands until they finish or time out.
+cancellation_scope() watches the Starlette request for a disconnect and, when
+the client is gone (or the entrypoint generator is closed/cancelled), cancels
+the invocation everywhere it runs:
+
+    - strands stops the agent loop at its next safe point through the
+      threading.Event passed as stream_async(cancel_signal=...); sub-agents
+      started by use_skill receive the same signal through their tool context
+    - sandboxed shell commands watch current_cancel_scope() and kill their
+      process tree immediately
+    - the invocation's own temporary directory (the TMPDIR of its commands,
+      under the workspace) is removed, and so are the scratch entries created
+      during the invocation if no other invocation used the workspace meanwhile
+
+The temporary directory is removed at the end of every invocation.
+
+Usage:
+    >>> with session_scope(session_id) as workspace:
+    ...     async with cancellation_scope(context.request, workspace) as cancel:
+    ...         async for msg in agent.stream_async(prompt, cancel_signal=cancel.signal):
+    ...             yield msg
+
+Each cancellation is counted in CANCELLATIONS (by reason, served on /metrics
+by cancellations_prometheus()) and recorded as an "invocation" telemetry span
+with status "cancelled".
+"""
+
+import asyncio
+import logging
+import shutil
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import asynccontextmanager, suppress
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+from .sandbox import SessionWorkspace
+from .telemetry import TELEMETRY, ToolSpan
+
+logger = logging.getLogger("strands_agent.cancellation")
+
+# Cancelled invocations by reason ("client_disconnected", "aborted")
+CANCELLATIONS: Counter[str] = Counter()
+
+_current_scope: ContextVar["CancelScope | None"] = ContextVar("cancel_scope", default=None)
+
+
+class CancelScope:
+    """Cancellation state of one invocation"""
+
+    def __init__(self):
+        self.signal = threading.Event()  # For strands (polled from any thread)
+        self.reason: str | None = None
+        self.tmp_dir: Path | None = None  # TMPDIR of this invocation's commands
+        self._event = asyncio.Event()  # For coroutines awaiting cancellation
+
+    @property
+    def cancelled(self) -> bool:
+        return self.signal.is_set()
+
+    def cancel(self, reason: str) -> None:
+        """Cancel the invocation (idempotent, the first reason wins)"""
+        if self.cancelled:
+            return
+        self.reason = reason
+        self.signal.set()
+        self._event.set()
+
+    async def wait(self) -> None:
+        """Return once the invocation is cancelled"""
+        await self._event.wait()
+
+
+def current_cancel_scope() -> CancelScope | None:
+    """Return the cancel scope of the invocation running in the current context"""
+    return _current_scope.get()
+
+
+async def _watch_disconnect(request: Any, scope: CancelScope, poll_interval: float) -> None:
+    while not scope.cancelled:
+        if await request.is_disconnected():
+            scope.cancel("client_disconnected")
+            return
+        await asyncio.sleep(poll_interval)
+
+
+@asynccontextmanager
+async def cancellation_scope(
+    request: Any = None,
+    workspace: SessionWorkspace | None = None,
+    poll_interval: float = 0.5,
+    drain_timeout: float = 5.0,
+) -> AsyncIterator[CancelScope]:
+    """Run the enclosed invocation under a new CancelScope
+
+    Args:
+        request: Starlette request to watch for a client disconnect (optional)
+        workspace: Sandbox workspace the invocation's commands run in
+        poll_interval: Seconds between disconnect checks
+        drain_timeout: Longest wait for killed commands to exit before scratch cleanup
+    """
+    scope = CancelScope()
+    token = _current_scope.set(scope)
+    snapshot = None
+    if workspace is not None:
+        scope.tmp_dir = workspace.scratch_dir / f".invocation-{uuid.uuid4().hex}"
+        scope.tmp_dir.mkdir(parents=True, exist_ok=True)
+        # New scratch entries can only be attributed to this invocation if it has the workspace to itself
+        exclusive = workspace.active_invocations == 0
+        workspace.active_invocations += 1
+        workspace.invocations_started += 1
+        started = workspace.invocations_started
+        snapshot = workspace.snapshot()
+    watcher = None
+    if request is not None and hasattr(request, "is_disconnected"):
+        watcher = asyncio.create_task(_watch_disconnect(request, scope, poll_interval))
+    start_time = time.perf_counter()
+    try:
+        yield scope
+    except (GeneratorExit, asyncio.CancelledError):
+        # The entrypoint generator was closed or its task cancelled: nobody is listening
+        scope.cancel("aborted")
+        raise
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+        with suppress(ValueError):  # Closed from another context (generator finalizer)
+            _current_scope.reset(token)
+        if workspace is not None:
+            workspace.active_invocations -= 1
+            if not exclusive or workspace.invocations_started != started:
+                snapshot = None  # Another invocation may own some of the new entries
+        files_removed = 0
+        if scope.cancelled and workspace is not None:
+            await _drain_commands(workspace, drain_timeout)
+            if workspace.active_commands == 0:
+                files_removed = _remove_invocation_files(workspace, scope.tmp_dir, snapshot)
+        elif scope.tmp_dir is not None:
+            shutil.rmtree(scope.tmp_dir, ignore_errors=True)
+        if scope.cancelled:
+            _record_cancellation(scope, files_removed, (time.perf_counter() - start_time) * 1000)
+
+
+async def _drain_commands(workspace: SessionWorkspace, timeout: float) -> None:
+    # Commands are killed from their own tasks once the scope is cancelled; give
+    # them a moment to exit so their scratch files are not removed mid-write
+    deadline = time.monotonic() + timeout
+    while workspace.active_commands and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+
+
+def _remove_invocation_files(workspace: SessionWorkspace, tmp_dir: Path, snapshot: set[str] | None) -> int:
+    # The temporary directory is in the snapshot, so it is not counted twice
+    try:
+        removed = sum(1 for _ in tmp_dir.iterdir())
+    except FileNotFoundError:
+        removed = 0
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    if snapshot is not None:
+        removed += workspace.remove_created_since(snapshot)
+    return removed
+
+
+def _record_cancellation(scope: CancelScope, files_removed: int, duration_ms: float) -> None:
+    CANCELLATIONS[scope.reason] += 1
+    TELEMETRY.record(
+        ToolSpan(
+            tool="invocation",
+            start_time=time.time(),
+            duration_ms=duration_ms,
+            status="cancelled",
+            attributes={"reason": scope.reason, "files_removed": files_removed},
+        )
+    )
+    logger.info("Invocation cancelled (%s), %d scratch entries removed", scope.reason, files_removed)
+
+
+def cancellations_prometheus() -> str:
+    """CANCELLATIONS in Prometheus text exposition format (for the /metrics route)"""
+    lines = ["# TYPE agent_cancellations_total counter"]
+    for reason, count in sorted(CANCELLATIONS.items()):
+        lines.append(f'agent_cancellations_total{{reason="{reason}"}} {count}')
+    return "\n".join(lines) + "\n"
+
+
+__all__ = [
+    "CANCELLATIONS",
+    "CancelScope",
+    "cancellation_scope",
+    "cancellations_prometheus",
+    "current_cancel_scope",
+]
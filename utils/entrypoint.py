@@ -0,0 +1,190 @@
+"""AgentCore app shared by the container entrypoints
+
+agentcore_entrypoint.py and agent/__main__.py serve the same invocation chain
+and only differ in their default profile. build_app() creates the
+BedrockAgentCoreApp with the warm-up lifespan and the /metrics route, the agent
+pool, the session manager and the warm-up tasks, and registers the invocation
+handler:
+
+    warm-up wait -> admission (503 before any streaming) -> session agent ->
+    sandbox workspace -> cancellation -> trace -> usage accounting ->
+    (compaction) -> usage_summary
+
+Usage:
+    >>> AGENT_APP = build_app("pptx")
+    >>> app = AGENT_APP.app
+    >>> app.run()
+"""
+
+import asyncio
+import os
+import weakref
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from bedrock_agentcore.runtime import BedrockAgentCoreApp
+from starlette.responses import JSONResponse
+
+from .admission import ADMISSION, AdmissionRejected
+from .agent_pool import AgentPool
+from .agent_profiles import PROFILES
+from .cancellation import cancellation_scope, cancellations_prometheus
+from .event_compaction import EventCompactor, resolve_stream_mode
+from .sandbox import SANDBOX_POOL, session_scope
+from .session_store import SessionManager, backend_from_env
+from .strands_stream.trace import trace_stream
+from .telemetry import TELEMETRY
+from .usage_metrics import USAGE_METRICS, UsageCollector, prometheus_endpoint
+from .warmup import WARMUP, start_pptx_workers, stop_pptx_workers, warm_agent, warm_skills
+
+
+@dataclass
+class AgentApp:
+    """An AgentCore app and the state its invocations share"""
+
+    app: BedrockAgentCoreApp
+    default_profile: str
+    default_model_id: str
+    pool: AgentPool
+    sessions: SessionManager
+    invoke: Callable[..., Awaitable[AsyncIterator[dict] | JSONResponse]]
+
+
+def build_app(default_profile: str) -> AgentApp:
+    """Create the AgentCore app serving the agent profiles
+
+    Args:
+        default_profile: Profile used when neither the request (payload["profile"])
+            nor AGENT_PROFILE names one
+
+    Returns:
+        The app with its agent pool, session manager and invocation handler
+    """
+    # Initialize the AgentCore app (the warm-up phase starts with the server)
+    app = BedrockAgentCoreApp(lifespan=WARMUP.lifespan)
+    # Token / latency counters per profile, model, skill and tool, admission gauges and
+    # counters and cancellations by reason (Prometheus text format)
+    app.add_route(
+        "/metrics", prometheus_endpoint(USAGE_METRICS.prometheus, ADMISSION.prometheus, cancellations_prometheus)
+    )
+
+    # Agent variants (model, tools, system prompt) are defined in agent/profiles.toml;
+    # requests may pick another one with payload["profile"]
+    default_profile = os.environ.get("AGENT_PROFILE", default_profile)
+    default_model_id = PROFILES.get(default_profile).model_id
+
+    # Prepared agents per (profile, model id); each request only gets a fresh conversation
+    pool = AgentPool(PROFILES.build_agent)
+
+    # Live conversations per AgentCore session (multi-turn), persisted per SESSION_BACKEND;
+    # a session's sandbox workspace is released when the session is evicted or ended
+    sessions = SessionManager(pool, backend=backend_from_env(), on_release=SANDBOX_POOL.release)
+
+    # Cold-start work done concurrently in the background instead of on the first request
+    WARMUP.add("agent", lambda: warm_agent(pool, (default_profile, default_model_id)))
+    WARMUP.add("skills", warm_skills)
+    WARMUP.add("pptx_workers", start_pptx_workers, on_shutdown=stop_pptx_workers)
+
+    @app.entrypoint
+    async def invoke(payload: dict, context: Any = None) -> AsyncIterator[dict] | JSONResponse:
+        """
+        Main entrypoint for the PowerPoint agent.
+        This function is called when the agent is invoked via AgentCore Runtime.
+
+        Admission is decided before anything is streamed: an overloaded server
+        answers with HTTP 503 instead of starting a 200 event stream.
+
+        Args:
+            payload: The input payload containing prompt, optional model config,
+                optional profile name (see agent/profiles.toml), optional
+                stream_mode ("compact" or "verbose") and optional end_session
+                (true: forget the session's conversation after this turn)
+            context: AgentCore request context (provides the session id)
+
+        Returns:
+            The event stream: messages from the agent, then a usage_summary event
+            (tokens, cache hit ratio, model latency, tool time, per-skill breakdown).
+            A 503 JSONResponse when the invocation is not admitted.
+        """
+        # Requests arriving during warm-up wait for it instead of duplicating its work
+        await WARMUP.wait_ready()
+        try:
+            # Wait for an invocation slot (bounded queue, AdmissionRejected when full)
+            release = await ADMISSION.acquire()
+        except AdmissionRejected as e:
+            TELEMETRY.flush()
+            return JSONResponse({"error": str(e), "reason": e.reason}, status_code=503)
+
+        events = stream(payload, context, release)
+        loop = asyncio.get_running_loop()
+
+        def release_unstarted() -> None:
+            # A stream dropped before it started never runs its finally block; the garbage
+            # collector may call this from any thread (no-op when the stream released the slot)
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(release)
+
+        weakref.finalize(events, release_unstarted)
+        return events
+
+    async def stream(payload: dict, context: Any, release: Callable[[], None]) -> AsyncIterator[dict]:
+        """Run one admitted invocation, releasing its admission slot at the end"""
+        # Extract message and model configuration from payload
+        message = payload.get("prompt", "")
+        profile = PROFILES.get(payload.get("profile", default_profile))
+        model_config = payload.get("model", {})
+        model_id = model_config.get("modelId", profile.model_id)
+
+        # Stream responses back to the caller; tools run in this session's sandbox workspace
+        session_id = getattr(context, "session_id", None) or payload.get("session_id")
+        try:
+            async with sessions.acquire(session_id, (profile.name, model_id)) as agent:
+                with session_scope(session_id) as workspace:
+                    # A client disconnect cancels the agent loop, sub-agents and running commands
+                    async with cancellation_scope(getattr(context, "request", None), workspace) as cancel:
+                        stream_messages = agent.stream_async(message, cancel_signal=cancel.signal)
+                        # Raw events are recorded for offline benchmarks when STREAM_TRACE_DIR is set
+                        traced = trace_stream(stream_messages, session_id, profile=profile.name, model=model_id)
+                        # Tokens, cache hits, model latency and tool time of this invocation (per skill too)
+                        usage = UsageCollector()
+
+                        # Forward model events plus streamed shell output (tool_stream_event)
+                        forwarded = (
+                            msg async for msg in usage.track(traced) if "event" in msg or "tool_stream_event" in msg
+                        )
+                        if resolve_stream_mode(payload) == "compact":
+                            # Merge token deltas and drop repeated tool input (opt-in with stream_mode="compact")
+                            forwarded = EventCompactor().compact(forwarded)
+
+                        try:
+                            async for msg in forwarded:
+                                yield msg
+                        finally:
+                            # If the caller stopped reading, close the agent stream now (stops the model
+                            # stream and cancels running tool tasks) rather than when it is garbage collected;
+                            # the compactor's reader goes first, the trace file is closed with the stream
+                            await forwarded.aclose()
+                            await traced.aclose()
+                            await stream_messages.aclose()
+                            # Tokens are billed even if the invocation failed or was cancelled
+                            USAGE_METRICS.record(usage, profile=profile.name, model=model_id)
+
+                        yield {"usage_summary": usage.summary(model_id)}
+            if session_id and payload.get("end_session"):
+                await sessions.end_session(session_id)
+        finally:
+            release()
+            # Export this invocation's tool spans in one batch
+            TELEMETRY.flush()
+
+    return AgentApp(
+        app=app,
+        default_profile=default_profile,
+        default_model_id=default_model_id,
+        pool=pool,
+        sessions=sessions,
+        invoke=invoke,
+    )
+
+
+__all__ = ["AgentApp", "build_app"]
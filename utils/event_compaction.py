@@ -0,0 +1,257 @@
+"""Server-side compaction of the entrypoint event stream
+
+The entrypoint forwards Bedrock stream events one by one: every token-level
+text delta becomes its own SSE message, and every tool_stream_event repeats the
+tool's full accumulated input next to each output chunk. EventCompactor reduces
+the wire volume without changing event shapes:
+
+    - consecutive contentBlockDelta events of the same kind (text, tool input
+      JSON fragments, reasoning text) are merged into one delta, flushed when a
+      different event arrives, when max_chars is reached or max_delay_seconds
+      after the merge started (also while the model stalls)
+    - tool_stream_event.tool_use carries its input only the first time a tool
+      use id is seen; later events keep toolUseId and name
+
+Usage:
+    >>> compactor = EventCompactor()
+    >>> async for msg in compactor.compact(agent.stream_async(prompt)):
+    ...     yield msg
+
+Wire modes (per request via payload["stream_mode"], default STREAM_MODE env,
+else verbose; compaction is opt-in since it changes what clients receive):
+    verbose: events forwarded unchanged
+    compact: events compacted as above
+"""
+
+import asyncio
+import json
+import os
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+
+STREAM_MODES = ("verbose", "compact")
+
+# contentBlockDelta payload keys that can be merged by string concatenation
+_MERGEABLE_DELTAS = {
+    "text": ("text",),
+    "toolUse": ("toolUse", "input"),
+    "reasoningContent": ("reasoningContent", "text"),
+}
+
+
+@dataclass
+class CompactionStats:
+    """Counters for one compacted stream (bytes are measured only if enabled)"""
+
+    events_in: int = 0
+    events_out: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+
+    @property
+    def saved_ratio(self) -> float:
+        """Fraction of wire bytes saved (0.0 when bytes were not measured)"""
+        return 1 - self.bytes_out / self.bytes_in if self.bytes_in else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "events_in": self.events_in,
+            "events_out": self.events_out,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "saved_ratio": round(self.saved_ratio, 4),
+        }
+
+
+def _wire_size(msg: dict) -> int:
+    # Approximates the SSE payload the SDK sends for a message
+    return len(json.dumps(msg, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+def _mergeable_delta(msg: dict) -> tuple[str, int | None, str] | None:
+    """Return (delta kind, block index, text) for a mergeable text-like delta"""
+    event = msg.get("event")
+    if not isinstance(event, dict) or len(msg) != 1:
+        return None
+    block_delta = event.get("contentBlockDelta")
+    if not isinstance(block_delta, dict):
+        return None
+    delta = block_delta.get("delta")
+    if not isinstance(delta, dict) or len(delta) != 1:
+        return None
+    for kind, path in _MERGEABLE_DELTAS.items():
+        value = delta
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        if isinstance(value, str):
+            if kind != "text" and len(delta[kind]) != 1:
+                return None  # Carries more than the fragment (e.g. a signature)
+            return kind, block_delta.get("contentBlockIndex"), value
+    return None
+
+
+def _build_delta(kind: str, index: int | None, text: str) -> dict:
+    payload: Any = text
+    for key in reversed(_MERGEABLE_DELTAS[kind][1:]):
+        payload = {key: payload}
+    block_delta: dict = {"delta": {kind: payload}}
+    if index is not None:
+        block_delta["contentBlockIndex"] = index
+    return {"event": {"contentBlockDelta": block_delta}}
+
+
+class EventCompactor:
+    """Merges deltas and strips repeated tool input from one invocation's stream"""
+
+    def __init__(self, max_chars: int = 2048, max_delay_seconds: float = 0.05, measure: bool = False):
+        """
+        Args:
+            max_chars: Merged delta size that forces a flush
+            max_delay_seconds: Age of a merged delta at which it is flushed (0: only by the next event)
+            measure: Record wire bytes in/out in self.stats (costs one JSON encode per event)
+        """
+        self.max_chars = max_chars
+        self.max_delay_seconds = max_delay_seconds
+        self.measure = measure
+        self.stats = CompactionStats()
+        self._seen_tool_inputs: set[str] = set()
+        self._pending: tuple[str, int | None] | None = None
+        self._parts: list[str] = []
+        self._pending_size = 0
+        self._pending_since = 0.0
+
+    def feed(self, msg: dict) -> list[dict]:
+        """Add one message and return the messages ready to send"""
+        self.stats.events_in += 1
+        if self.measure:
+            self.stats.bytes_in += _wire_size(msg)
+
+        delta = _mergeable_delta(msg)
+        if delta is not None:
+            kind, index, text = delta
+            out = []
+            if self._pending != (kind, index):
+                out = self.flush()
+                self._pending = (kind, index)
+                self._pending_since = time.monotonic()
+            self._parts.append(text)
+            self._pending_size += len(text)
+            if (
+                self._pending_size >= self.max_chars
+                or time.monotonic() - self._pending_since >= self.max_delay_seconds
+            ):
+                out += self.flush()
+            return out
+
+        out = self.flush()
+        out.append(self._emit(self._strip_tool_input(msg)))
+        return out
+
+    def flush(self) -> list[dict]:
+        """Emit the pending merged delta, if any"""
+        if self._pending is None:
+            return []
+        kind, index = self._pending
+        msg = _build_delta(kind, index, "".join(self._parts))
+        self._pending = None
+        self._parts = []
+        self._pending_size = 0
+        return [self._emit(msg)]
+
+    async def compact(self, source: AsyncIterator[dict]) -> AsyncIterator[dict]:
+        """Compact an async stream of messages
+
+        With max_delay_seconds, `source` is read by a producer task so a merged
+        delta goes out on time while the source is stalled; the source is closed
+        in that task (agent streams hold OTel contexts), so close this generator
+        before closing the source. Without it, `source` is consumed inline.
+        """
+        if not self.max_delay_seconds:
+            async for msg in source:
+                for out in self.feed(msg):
+                    yield out
+            for out in self.flush():
+                yield out
+            return
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=64)
+        done = object()
+        errors: list[BaseException] = []
+
+        async def produce():
+            try:
+                async for msg in source:
+                    await queue.put(msg)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                errors.append(e)
+            finally:
+                aclose = getattr(source, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+            await queue.put(done)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                if self._pending is None:
+                    msg = await queue.get()
+                else:
+                    due = self._pending_since + self.max_delay_seconds - time.monotonic()
+                    try:
+                        msg = await asyncio.wait_for(queue.get(), max(due, 0))
+                    except asyncio.TimeoutError:
+                        # The source stalled: send what has been merged so far
+                        for out in self.flush():
+                            yield out
+                        continue
+                if msg is done:
+                    break
+                for out in self.feed(msg):
+                    yield out
+            for out in self.flush():
+                yield out
+            if errors:
+                raise errors[0]
+        finally:
+            if not producer.done():
+                producer.cancel()
+                with suppress(asyncio.CancelledError):
+                    await producer
+
+    def _strip_tool_input(self, msg: dict) -> dict:
+        tool_stream = msg.get("tool_stream_event")
+        if not isinstance(tool_stream, dict):
+            return msg
+        tool_use = tool_stream.get("tool_use")
+        if not isinstance(tool_use, dict) or "input" not in tool_use:
+            return msg
+        tool_use_id = tool_use.get("toolUseId")
+        if tool_use_id not in self._seen_tool_inputs:
+            self._seen_tool_inputs.add(tool_use_id)
+            return msg
+        stripped = {k: v for k, v in tool_use.items() if k != "input"}
+        return {**msg, "tool_stream_event": {**tool_stream, "tool_use": stripped}}
+
+    def _emit(self, msg: dict) -> dict:
+        self.stats.events_out += 1
+        if self.measure:
+            self.stats.bytes_out += _wire_size(msg)
+        return msg
+
+
+def resolve_stream_mode(payload: dict) -> str:
+    """Wire mode requested by the payload, falling back to STREAM_MODE (default verbose)"""
+    mode = str(payload.get("stream_mode") or os.environ.get("STREAM_MODE", "verbose")).lower()
+    return mode if mode in STREAM_MODES else "verbose"
+
+
+__all__ = [
+    "CompactionStats",
+    "EventCompactor",
+    "STREAM_MODES",
+    "resolve_stream_mode",
+]
@@ -0,0 +1,244 @@
+"""Per-session shell sandboxes for AgentCore invocations
+
+Concurrent sessions in one container used to share the working directory, so
+fixed paths like output.pptx or template.pptx collided between them. This module
+gives every session its own scratch/output workspace under
+agentskills.prompt.SCRATCH_DIR / OUTPUT_DIR and bounds how many shell commands
+run at once, with per-command resource limits.
+
+Usage:
+    >>> from utils.sandbox import SANDBOX_POOL, session_scope
+    >>> with session_scope(session_id):
+    ...     async for msg in agent.stream_async(prompt):
+    ...         ...
+
+Tools read the active session through current_workspace(); the session id is
+kept in a ContextVar so it follows the asyncio tasks spawned by the agent.
+A request without a session id gets a workspace of its own, released when its
+session_scope ends; session workspaces are released with SandboxPool.release
+when the session ends or is evicted (see SessionManager's on_release).
+"""
+
+import asyncio
+import os
+import re
+import shutil
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Callable, Iterator
+
+from agentskills.prompt import SCRATCH_DIR, OUTPUT_DIR
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_SESSION_ID = "default"
+
+_current_session_id: ContextVar[str] = ContextVar("sandbox_session_id", default=DEFAULT_SESSION_ID)
+
+_SAFE_SESSION_ID = re.compile(r"[^A-Za-z0-9_-]")
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+@dataclass(frozen=True)
+class ResourceLimits:
+    """Limits applied to every sandboxed shell command
+
+    Attributes:
+        timeout_seconds: Wall-clock timeout
+        cpu_seconds: CPU time limit (RLIMIT_CPU), 0 to disable
+        memory_bytes: Address-space limit (RLIMIT_AS), 0 to disable (default: disabled,
+            since node, Chromium and soffice reserve far more address space than they use)
+        output_bytes: Bytes kept per output stream (stdout / stderr)
+    """
+
+    timeout_seconds: int = 60
+    cpu_seconds: int = 60
+    memory_bytes: int = 0
+    output_bytes: int = 64 * 1024
+
+    @classmethod
+    def from_env(cls) -> "ResourceLimits":
+        """Build limits from SANDBOX_* environment variables"""
+        defaults = cls()
+        return cls(
+            timeout_seconds=_env_int("SANDBOX_TIMEOUT_SECONDS", defaults.timeout_seconds),
+            cpu_seconds=_env_int("SANDBOX_CPU_SECONDS", defaults.cpu_seconds),
+            memory_bytes=_env_int("SANDBOX_MEMORY_BYTES", defaults.memory_bytes),
+            output_bytes=_env_int("SANDBOX_OUTPUT_BYTES", defaults.output_bytes),
+        )
+
+    def preexec_fn(self) -> Callable[[], None] | None:
+        """Return a function applying the rlimits in the child process (POSIX only)"""
+        if resource is None or not (self.cpu_seconds or self.memory_bytes):
+            return None
+
+        def apply_limits():
+            if self.cpu_seconds:
+                resource.setrlimit(resource.RLIMIT_CPU, (self.cpu_seconds, self.cpu_seconds))
+            if self.memory_bytes:
+                resource.setrlimit(resource.RLIMIT_AS, (self.memory_bytes, self.memory_bytes))
+
+        return apply_limits
+
+
+@dataclass
+class SessionWorkspace:
+    """Scratch and output directories owned by one session"""
+
+    session_id: str
+    scratch_dir: Path
+    output_dir: Path
+    active_commands: int = field(default=0)
+    active_invocations: int = field(default=0)  # Cancellation scopes open on this workspace
+    invocations_started: int = field(default=0)
+
+    def resolve(self, path: str | Path) -> Path:
+        """Resolve a relative path against the session scratch directory"""
+        path = Path(path).expanduser()
+        return path if path.is_absolute() else self.scratch_dir / path
+
+    def env(self, tmp_dir: Path | None = None) -> dict[str, str]:
+        """Environment for commands run in this workspace
+
+        Args:
+            tmp_dir: TMPDIR of the commands (default: the scratch directory)
+        """
+        env = os.environ.copy()
+        env["SESSION_ID"] = self.session_id
+        env["SCRATCH_DIR"] = str(self.scratch_dir)
+        env["OUTPUT_DIR"] = str(self.output_dir)
+        env["TMPDIR"] = str(tmp_dir or self.scratch_dir)
+        return env
+
+    def snapshot(self) -> set[str]:
+        """Names of the entries currently in the scratch directory"""
+        try:
+            return {entry.name for entry in os.scandir(self.scratch_dir)}
+        except FileNotFoundError:
+            return set()
+
+    def remove_created_since(self, snapshot: set[str]) -> int:
+        """Delete scratch entries that are not in `snapshot`
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        for name in self.snapshot() - snapshot:
+            path = self.scratch_dir / name
+            if path.is_dir() and not path.is_symlink():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                path.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+
+class SandboxPool:
+    """Bounded pool of shell execution slots with per-session workspaces"""
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        limits: ResourceLimits | None = None,
+        scratch_root: Path = SCRATCH_DIR,
+        output_root: Path = OUTPUT_DIR,
+    ):
+        self.max_workers = max_workers
+        self.limits = limits or ResourceLimits()
+        self.scratch_root = Path(scratch_root)
+        self.output_root = Path(output_root)
+        self._workspaces: dict[str, SessionWorkspace] = {}
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def workspace(self, session_id: str | None = None) -> SessionWorkspace:
+        """Return (creating if needed) the workspace of a session
+
+        Args:
+            session_id: Session id, defaults to the session of the current context
+        """
+        session_id = _SAFE_SESSION_ID.sub("_", session_id or _current_session_id.get())
+        workspace = self._workspaces.get(session_id)
+        if workspace is None:
+            workspace = SessionWorkspace(
+                session_id=session_id,
+                scratch_dir=self.scratch_root / session_id,
+                output_dir=self.output_root / session_id,
+            )
+            workspace.scratch_dir.mkdir(parents=True, exist_ok=True)
+            workspace.output_dir.mkdir(parents=True, exist_ok=True)
+            self._workspaces[session_id] = workspace
+        return workspace
+
+    @asynccontextmanager
+    async def slot(self, session_id: str | None = None) -> AsyncIterator[SessionWorkspace]:
+        """Wait for a free execution slot and yield the session workspace"""
+        if self._semaphore is None:
+            # Created lazily so the pool binds to the running event loop
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        workspace = self.workspace(session_id)
+        async with self._semaphore:
+            workspace.active_commands += 1
+            try:
+                yield workspace
+            finally:
+                workspace.active_commands -= 1
+
+    def release(self, session_id: str, keep_output: bool = True) -> None:
+        """Remove a session's scratch files (and optionally its outputs)"""
+        workspace = self._workspaces.pop(_SAFE_SESSION_ID.sub("_", session_id), None)
+        if workspace is None:
+            return
+        shutil.rmtree(workspace.scratch_dir, ignore_errors=True)
+        if not keep_output:
+            shutil.rmtree(workspace.output_dir, ignore_errors=True)
+
+
+SANDBOX_POOL = SandboxPool(
+    max_workers=_env_int("SANDBOX_MAX_WORKERS", 4),
+    limits=ResourceLimits.from_env(),
+)
+
+
+@contextmanager
+def session_scope(session_id: str | None) -> Iterator[SessionWorkspace]:
+    """Make `session_id` the active sandbox session for the enclosed code
+
+    Without a session id the enclosed request gets a new workspace of its own,
+    whose scratch directory is removed when the scope ends (outputs are kept).
+    """
+    anonymous = not session_id
+    if anonymous:
+        session_id = f"anon-{uuid.uuid4().hex}"
+    token = _current_session_id.set(session_id)
+    try:
+        yield SANDBOX_POOL.workspace()
+    finally:
+        _current_session_id.reset(token)
+        if anonymous:
+            SANDBOX_POOL.release(session_id)
+
+
+def current_workspace() -> SessionWorkspace:
+    """Return the workspace of the session active in the current context"""
+    return SANDBOX_POOL.workspace()
+
+
+__all__ = [
+    "ResourceLimits",
+    "SessionWorkspace",
+    "SandboxPool",
+    "SANDBOX_POOL",
+    "session_scope",
+    "current_workspace",
+]
@@ -0,0 +1,416 @@
+"""Session-affine conversation store for multi-turn AgentCore invocations
+
+Follow-up prompts in the same AgentCore session should continue the same
+conversation instead of starting from scratch. SessionManager keeps the agent of
+each recently active session live in an in-memory LRU, so later turns reuse the
+cached conversation (and benefit from prompt caching). Each completed turn is
+persisted to a pluggable backend; sessions that go idle or fall out of the LRU
+hand their agent back to the AgentPool and are restored from the backend on
+their next turn.
+
+Backends:
+    - LocalDiskBackend: one JSON file per session
+    - S3Backend: one object per session, works with boto3's S3 client or any
+      client exposing put_object/get_object/delete_object (e.g. InMemoryS3Client)
+
+Persisted conversations expire ttl_seconds after their last turn: an expired
+conversation is deleted instead of restored, and LocalDiskBackend periodically
+removes expired files (for S3, add a bucket lifecycle rule on the prefix).
+end_session() forgets a session right away.
+
+Usage:
+    >>> sessions = SessionManager(AGENT_POOL, backend=LocalDiskBackend("/tmp/sessions", ttl_seconds=86400))
+    >>> async with sessions.acquire(session_id, model_id) as agent:
+    ...     async for event in agent.stream_async(prompt):
+    ...         ...
+    >>> await sessions.end_session(session_id)  # e.g. when the user closes the chat
+
+Configuration (environment, see backend_from_env):
+    SESSION_BACKEND: disk, s3 or none (default none: conversations live in memory only)
+    SESSION_DIR: Directory of the disk backend (default <repo>/_sessions)
+    SESSION_BUCKET / SESSION_PREFIX: Location of the s3 backend
+    SESSION_TTL_SECONDS: Lifetime of a persisted conversation (default 86400, 0: no expiry)
+"""
+
+import asyncio
+import base64
+import json
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Hashable, Protocol, TYPE_CHECKING
+
+from agentskills.prompt import ROOT_DIR
+from .agent_pool import AgentPool
+from .sandbox import _SAFE_SESSION_ID
+
+if TYPE_CHECKING:  # strands is only needed once an agent is built
+    from strands import Agent
+
+
+def _encode(value: Any) -> Any:
+    """Make messages JSON-safe (bytes from image/document blocks are base64-encoded)"""
+    if isinstance(value, bytes):
+        return {"__bytes__": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict):
+        if len(value) == 1 and "__bytes__" in value:
+            return base64.b64decode(value["__bytes__"])
+        return {k: _decode(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
+
+
+def dumps_messages(messages: list[dict]) -> bytes:
+    """Serialize a conversation for a backend"""
+    return json.dumps(_encode(messages), ensure_ascii=False).encode("utf-8")
+
+
+def loads_messages(data: bytes) -> list[dict]:
+    """Deserialize a conversation written by dumps_messages"""
+    return _decode(json.loads(data))
+
+
+class ConversationBackend(Protocol):
+    """Persistence interface for conversations"""
+
+    def load(self, session_id: str) -> list[dict] | None:
+        ...
+
+    def save(self, session_id: str, messages: list[dict]) -> None:
+        ...
+
+    def delete(self, session_id: str) -> None:
+        ...
+
+
+class LocalDiskBackend:
+    """Stores each conversation as <root>/<session_id>.json"""
+
+    # Longest time between two scans for expired files
+    PURGE_INTERVAL_SECONDS = 300
+
+    def __init__(self, root: str | Path, ttl_seconds: float | None = None):
+        """
+        Args:
+            root: Directory of the conversation files (created on first save)
+            ttl_seconds: Lifetime of a conversation after its last save (None: no expiry)
+        """
+        self.root = Path(root)  # Created on first save, not at import
+        self.ttl_seconds = ttl_seconds
+        self._next_purge = 0.0
+
+    def _path(self, session_id: str) -> Path:
+        return self.root / f"{_SAFE_SESSION_ID.sub('_', session_id)}.json"
+
+    def _expired(self, mtime: float) -> bool:
+        return bool(self.ttl_seconds) and mtime < time.time() - self.ttl_seconds
+
+    def load(self, session_id: str) -> list[dict] | None:
+        path = self._path(session_id)
+        try:
+            if self._expired(path.stat().st_mtime):
+                path.unlink(missing_ok=True)
+                return None
+        except FileNotFoundError:
+            return None
+        return loads_messages(path.read_bytes())
+
+    def save(self, session_id: str, messages: list[dict]) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._path(session_id)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(dumps_messages(messages))
+        os.replace(tmp_path, path)  # Atomic, readers never see a partial file
+        if self.ttl_seconds and time.monotonic() >= self._next_purge:
+            self._next_purge = time.monotonic() + min(self.ttl_seconds, self.PURGE_INTERVAL_SECONDS)
+            self.purge_expired()
+
+    def purge_expired(self) -> int:
+        """Delete the conversations whose TTL has passed
+
+        Returns:
+            Number of files removed
+        """
+        removed = 0
+        if not self.ttl_seconds or not self.root.is_dir():
+            return removed
+        for path in self.root.glob("*.json"):
+            try:
+                if self._expired(path.stat().st_mtime):
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def delete(self, session_id: str) -> None:
+        self._path(session_id).unlink(missing_ok=True)
+
+
+class S3Backend:
+    """Stores each conversation as s3://<bucket>/<prefix><session_id>.json"""
+
+    def __init__(
+        self, bucket: str, prefix: str = "sessions/", client: Any = None, ttl_seconds: float | None = None
+    ):
+        """
+        Args:
+            bucket: Bucket name
+            prefix: Key prefix of the conversation objects
+            client: S3 client (default: boto3.client("s3"))
+            ttl_seconds: Lifetime of a conversation after its last save (None: no expiry);
+                expired objects are deleted when loaded
+        """
+        if client is None:
+            import boto3
+
+            client = boto3.client("s3")
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}{_SAFE_SESSION_ID.sub('_', session_id)}.json"
+
+    def load(self, session_id: str) -> list[dict] | None:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self._key(session_id))
+        except Exception as e:
+            if _is_missing_key(e):
+                return None
+            raise
+        last_modified = response.get("LastModified")  # Time of the last save
+        expired = last_modified is not None and last_modified.timestamp() < time.time() - (self.ttl_seconds or 0)
+        if self.ttl_seconds and expired:
+            self.delete(session_id)
+            return None
+        return loads_messages(response["Body"].read())
+
+    def save(self, session_id: str, messages: list[dict]) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=self._key(session_id), Body=dumps_messages(messages))
+
+    def delete(self, session_id: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(session_id))
+
+
+def _is_missing_key(error: Exception) -> bool:
+    if isinstance(error, KeyError):
+        return True
+    code = getattr(error, "response", {}).get("Error", {}).get("Code")
+    return code in ("NoSuchKey", "404")
+
+
+class InMemoryS3Client:
+    """S3-compatible stand-in implementing the calls S3Backend uses"""
+
+    class _Body:
+        def __init__(self, data: bytes):
+            self._data = data
+
+        def read(self) -> bytes:
+            return self._data
+
+    def __init__(self):
+        self.objects: dict[tuple[str, str], bytes] = {}
+        self.last_modified: dict[tuple[str, str], datetime] = {}
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes) -> dict:
+        self.objects[(Bucket, Key)] = Body
+        self.last_modified[(Bucket, Key)] = datetime.now(timezone.utc)
+        return {}
+
+    def get_object(self, Bucket: str, Key: str) -> dict:
+        return {"Body": self._Body(self.objects[(Bucket, Key)]), "LastModified": self.last_modified[(Bucket, Key)]}
+
+    def delete_object(self, Bucket: str, Key: str) -> dict:
+        self.objects.pop((Bucket, Key), None)
+        self.last_modified.pop((Bucket, Key), None)
+        return {}
+
+
+@dataclass
+class _LiveSession:
+    agent: "Agent"
+    model_id: Hashable
+    last_used: float = field(default_factory=time.monotonic)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class SessionManager:
+    """LRU of live per-session agents backed by an AgentPool and a persistence backend"""
+
+    def __init__(
+        self,
+        pool: AgentPool,
+        backend: ConversationBackend | None = None,
+        max_live_sessions: int = 64,
+        idle_timeout_seconds: float = 900,
+        on_release: Callable[[str], None] | None = None,
+    ):
+        """
+        Args:
+            pool: Agents are checked out of and returned to this pool
+            backend: Persistence of the conversations (None: live sessions only)
+            max_live_sessions: Live sessions kept; the least recently used idle ones are evicted
+            idle_timeout_seconds: Live sessions idle for longer are evicted
+            on_release: Called with the session id when a session is evicted or ended
+                (e.g. SANDBOX_POOL.release to remove its scratch files)
+        """
+        self.pool = pool
+        self.backend = backend
+        self.max_live_sessions = max_live_sessions
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.on_release = on_release
+        self._live: OrderedDict[str, _LiveSession] = OrderedDict()
+
+    @asynccontextmanager
+    async def acquire(self, session_id: str | None, model_id: Hashable) -> AsyncIterator["Agent"]:
+        """Yield the agent holding `session_id`'s conversation for one turn
+
+        Turns of the same session are serialized. Without a session id the request
+        is stateless and simply borrows an agent from the pool.
+        """
+        if not session_id:
+            async with self.pool.acquire(model_id) as agent:
+                yield agent
+            return
+
+        self.evict_idle()
+        while True:
+            live = self._live.get(session_id)
+            if live is not None and live.model_id != model_id:
+                # Model switched mid-session: carry the conversation over to an agent for the new model
+                # (the live agent holds it even without a backend)
+                async with live.lock:
+                    if self._live.get(session_id) is live:
+                        self._switch_model(session_id, live, model_id)
+                continue
+            if live is None:
+                live = await self._restore(session_id, model_id)
+
+            await live.lock.acquire()
+            if self._live.get(session_id) is live:
+                break
+            # The session was ended, evicted or switched models while we waited; start over
+            live.lock.release()
+
+        try:
+            self._live.move_to_end(session_id)
+            checkpoint = list(live.agent.messages)
+            try:
+                yield live.agent
+            except BaseException:
+                # Half-written turn (failure, cancellation, client disconnect): go back to the
+                # last complete turn and keep the session
+                live.agent.messages = checkpoint
+                live.last_used = time.monotonic()
+                raise
+            live.last_used = time.monotonic()
+            if self.backend is not None:
+                await asyncio.to_thread(self.backend.save, session_id, live.agent.messages)
+        finally:
+            live.lock.release()
+        self._enforce_capacity()
+
+    async def _restore(self, session_id: str, model_id: Hashable) -> _LiveSession:
+        messages = None
+        if self.backend is not None:
+            messages = await asyncio.to_thread(self.backend.load, session_id)
+        live = self._live.get(session_id)
+        if live is not None:
+            # Another request restored the session while we were loading
+            return live
+        agent = self.pool.checkout(model_id)
+        agent.messages = messages or []
+        live = _LiveSession(agent=agent, model_id=model_id)
+        self._live[session_id] = live
+        return live
+
+    def _switch_model(self, session_id: str, live: _LiveSession, model_id: Hashable) -> None:
+        agent = self.pool.checkout(model_id)
+        agent.messages = list(live.agent.messages)
+        self._live[session_id] = _LiveSession(agent=agent, model_id=model_id)
+        self.pool.checkin(live.model_id, live.agent)
+
+    def _evict(self, session_id: str) -> None:
+        # Conversations are saved after every turn, so eviction only releases the agent
+        # (and, through on_release, the session's other resources)
+        live = self._live.pop(session_id, None)
+        if live is not None:
+            self.pool.checkin(live.model_id, live.agent)
+            if self.on_release is not None:
+                self.on_release(session_id)
+
+    def _enforce_capacity(self) -> None:
+        for session_id in list(self._live):
+            if len(self._live) <= self.max_live_sessions:
+                break
+            if not self._live[session_id].lock.locked():
+                self._evict(session_id)
+
+    def evict_idle(self) -> None:
+        """Release the agents of sessions idle for longer than idle_timeout_seconds"""
+        cutoff = time.monotonic() - self.idle_timeout_seconds
+        for session_id, live in list(self._live.items()):
+            if live.last_used < cutoff and not live.lock.locked():
+                self._evict(session_id)
+
+    async def end_session(self, session_id: str) -> None:
+        """Forget a session entirely (live agent and persisted conversation)
+
+        Waits for a turn of the session that is still running.
+        """
+        live = self._live.get(session_id)
+        if live is not None:
+            async with live.lock:
+                if self._live.get(session_id) is live:
+                    del self._live[session_id]
+                    self.pool.checkin(live.model_id, live.agent)
+        if self.on_release is not None:
+            self.on_release(session_id)
+        if self.backend is not None:
+            await asyncio.to_thread(self.backend.delete, session_id)
+
+    @property
+    def live_sessions(self) -> int:
+        return len(self._live)
+
+
+def backend_from_env() -> ConversationBackend | None:
+    """Build the backend selected by SESSION_BACKEND (disk, s3 or none; default none)"""
+    kind = os.environ.get("SESSION_BACKEND", "none").lower()
+    ttl_seconds = float(os.environ.get("SESSION_TTL_SECONDS", "86400")) or None
+    if kind == "disk":
+        return LocalDiskBackend(os.environ.get("SESSION_DIR", ROOT_DIR / "_sessions"), ttl_seconds=ttl_seconds)
+    if kind == "s3":
+        bucket = os.environ.get("SESSION_BUCKET") or os.environ.get("S3_BUCKET_NAME")
+        if not bucket:
+            raise ValueError("SESSION_BACKEND=s3 requires SESSION_BUCKET or S3_BUCKET_NAME")
+        return S3Backend(bucket, prefix=os.environ.get("SESSION_PREFIX", "sessions/"), ttl_seconds=ttl_seconds)
+    return None
+
+
+__all__ = [
+    "ConversationBackend",
+    "LocalDiskBackend",
+    "S3Backend",
+    "InMemoryS3Client",
+    "SessionManager",
+    "backend_from_env",
+    "dumps_messages",
+    "loads_messages",
+]
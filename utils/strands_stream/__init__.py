@@ -8,15 +8,20 @@ Architecture:
 - StrandsEventParser: Core parsing logic (no output)
 - BaseStreamRenderer: Abstract renderer interface
 - TerminalStreamRenderer, StreamlitStreamRenderer, SSEStreamRenderer: Environment-specific renderers
+- CompactStreamRenderer / CompactStreamDecoder: Binary (MessagePack) wire format and its reference decoder
+- StreamChannels: Parsed events split into per-source (main agent / sub-agent) channels
 """
 
 from .parser import StrandsEventParser
+from .channels import StreamChannels
+from .wire import CompactStreamDecoder
 from .renderers import (
     # New names (recommended)
     BaseStreamRenderer,
     TerminalStreamRenderer,
     StreamlitStreamRenderer,
     SSEStreamRenderer,
+    CompactStreamRenderer,
     # Legacy aliases (backward compatibility)
     BaseAdapter,
     TerminalAdapter,
@@ -30,6 +35,7 @@ from .events import (
     BaseEvent,
     TextEvent,
     CurrentToolUseEvent,
+    ToolInputDeltaEvent,
     ToolResultEvent,
     ToolStreamEvent,
     ReasoningEvent,
@@ -44,11 +50,14 @@ from .events import (
 __all__ = [
     # Parser
     "StrandsEventParser",
+    "StreamChannels",
     # Stream Renderers (recommended)
     "BaseStreamRenderer",
     "TerminalStreamRenderer",
     "StreamlitStreamRenderer",
     "SSEStreamRenderer",
+    "CompactStreamRenderer",
+    "CompactStreamDecoder",
     # Legacy aliases (backward compatibility)
     "BaseAdapter",
     "TerminalAdapter",
@@ -59,6 +68,7 @@ __all__ = [
     "BaseEvent",
     "TextEvent",
     "CurrentToolUseEvent",
+    "ToolInputDeltaEvent",
     "ToolResultEvent",
     "ToolStreamEvent",
     "ReasoningEvent",
@@ -0,0 +1,303 @@
+"""Per-source channels of parsed stream events
+
+use_skill forwards the events of its sub-agent inside the main agent's stream,
+and the parser tags them with the skill name as `source`. StreamChannels parses
+the raw stream once and routes each parsed event into the buffer of its source's
+channel (None for the main agent), so every source can be drained by its own
+consumer at its own pace; a merged view keeps the arrival order across sources.
+
+Only opened channels are buffered: a channel receives the events parsed after
+channel(source) was called, except that while sources() is being iterated, the
+channel of each new source is opened with its first event. Events of a source
+whose channel is not open are dropped.
+
+A buffer over max_buffer events coalesces consecutive text, reasoning and tool
+input deltas into its last event (fewer, larger events; the content is
+unchanged). Any other event arriving at a full buffer makes the pump wait
+until the channel's consumer takes an event (backpressure), so a buffer never
+holds more than max_buffer events; a chatty sub-agent streaming deltas does not
+hold back main-agent output. A channel opened by sources() that nobody has
+called channel() for yet drops its oldest events instead of waiting.
+
+Usage:
+    >>> channels = StreamChannels(agent.stream_async(prompt))
+    >>> async def show(source):
+    ...     async for event in channels.channel(source):
+    ...         for out in renderers[source].handle(event):
+    ...             placeholders[source].write(out)
+    >>> async with channels:
+    ...     async for source in channels.sources():  # each source as it appears
+    ...         tasks.append(asyncio.create_task(show(source)))
+    ...     await asyncio.gather(*tasks)
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterable, AsyncIterator
+
+from .events import BaseEvent, TextEvent, ReasoningEvent, ToolInputDeltaEvent
+from .parser import StrandsEventParser
+
+_MERGED = object()  # Key of the merged view's buffer
+
+
+def _mergeable(last: BaseEvent, event: BaseEvent) -> bool:
+    """Whether `event` continues the delta of `last`"""
+    if last.__class__ is not event.__class__:
+        return False
+    if event.__class__ is TextEvent:
+        return last.source == event.source
+    if event.__class__ is ReasoningEvent:
+        return True
+    if event.__class__ is ToolInputDeltaEvent:
+        return (
+            (last.source, last.tool_id) == (event.source, event.tool_id)
+            and last.offset + len(last.delta) == event.offset
+        )
+    return False
+
+
+def _merge(run: list[BaseEvent]) -> BaseEvent:
+    """One event carrying the deltas of a run of mergeable events (joined once)"""
+    first, last = run[0], run[-1]
+    if last.__class__ is TextEvent:
+        return TextEvent(data="".join(event.data for event in run), source=last.source)
+    if last.__class__ is ReasoningEvent:
+        metadata = next((event.metadata for event in reversed(run) if event.metadata), None)
+        return ReasoningEvent(data="".join(event.data for event in run), metadata=metadata)
+    return ToolInputDeltaEvent(
+        tool_name=last.tool_name,
+        tool_id=last.tool_id,
+        delta="".join(event.delta for event in run),
+        offset=first.offset,
+        checksum=last.checksum,
+        source=last.source,
+    )
+
+
+class _Buffer:
+    """Events of one open channel waiting for its consumer"""
+    
+    def __init__(self, max_buffer: int | None):
+        self.events: deque = deque()
+        self.max_buffer = max_buffer
+        self.ready = asyncio.Event()
+        self.space = asyncio.Event()
+        self.attached = False  # channel() was called (the pump may wait for its consumer)
+        self.closed = False
+        self.run: list[BaseEvent] | None = None  # Deltas coalesced into events[-1], merged when taken
+        self.coalesced = 0
+        self.dropped = 0
+        self.waits = 0
+        self.high_water = 0
+    
+    def put(self, event: Any) -> bool:
+        """Buffer an event; False if the buffer is full and the caller has to wait"""
+        events = self.events
+        if self.max_buffer is not None and len(events) >= self.max_buffer:
+            run = self.run
+            if _mergeable(run[-1] if run else events[-1], event):
+                if run is None:
+                    self.run = run = [events[-1]]
+                run.append(event)
+                self.coalesced += 1
+                return True
+            if self.attached:
+                return False
+            self.take_left()  # Nobody reads this channel yet: keep the newest events
+            self.dropped += 1
+        if self.run is not None:
+            events[-1] = _merge(self.run)
+            self.run = None
+        events.append(event)
+        if len(events) > self.high_water:
+            self.high_water = len(events)
+        self.ready.set()
+        return True
+    
+    def take_left(self) -> Any:
+        """Remove and return the oldest event"""
+        events = self.events
+        if len(events) == 1 and self.run is not None:
+            events[0] = _merge(self.run)
+            self.run = None
+        event = events.popleft()
+        self.space.set()
+        return event
+
+
+class StreamChannels:
+    """Parsed events of one raw stream, split into per-source channels
+    
+    Each channel has a single consumer and receives the events parsed after it
+    was opened (see the module docstring); call channel() or merged() before
+    iterating to get all of a source's events. Iterators end when the stream
+    ends, and re-raise an error of the stream. Closing an iterator early closes
+    its channel.
+    
+    Args:
+        stream: Raw events (e.g. Agent.stream_async)
+        parser: Event parser (default: a new StrandsEventParser)
+        max_buffer: Events per channel before deltas are coalesced and the pump waits
+        debug: Enable parser debug output
+    """
+    
+    def __init__(
+        self,
+        stream: AsyncIterable[dict],
+        parser: StrandsEventParser | None = None,
+        max_buffer: int = 1024,
+        debug: bool = False,
+    ):
+        self.stream = stream
+        self.parser = parser or StrandsEventParser()
+        self.max_buffer = max_buffer
+        self.debug = debug
+        self._buffers: dict[Any, _Buffer] = {}
+        self._sources: list[str | None] = []
+        self._new_source = asyncio.Event()
+        self._source_watchers = 0  # sources() iterators running
+        self._pump: asyncio.Task | None = None
+        self._done = False
+        self._error: BaseException | None = None
+    
+    def _open(self, key: Any) -> _Buffer:
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = _Buffer(self.max_buffer)
+        return buffer
+    
+    def start(self) -> None:
+        """Start reading the stream (done by the first iterator or `async with` otherwise)"""
+        if self._pump is None:
+            self._pump = asyncio.get_running_loop().create_task(self._run())
+    
+    async def _run(self) -> None:
+        parse = self.parser.parse
+        buffers = self._buffers
+        seen: set[str | None] = set()
+        try:
+            async for raw in self.stream:
+                for event in parse(raw, debug=self.debug):
+                    source = getattr(event, "source", None)
+                    if source not in seen:
+                        seen.add(source)
+                        self._sources.append(source)
+                        self._new_source.set()
+                        if self._source_watchers:
+                            self._open(source)
+                    buffer = buffers.get(source)
+                    if buffer is not None and not buffer.put(event):
+                        await self._wait_for_space(buffer, event)
+                    merged = buffers.get(_MERGED)
+                    if merged is not None and not merged.put(event):
+                        await self._wait_for_space(merged, event)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._error = e
+        finally:
+            # Close the source in this task (agent streams hold OTel contexts)
+            aclose = getattr(self.stream, "aclose", None)
+            if aclose is not None:
+                await aclose()
+            self._done = True
+            self._new_source.set()
+            for buffer in buffers.values():
+                buffer.ready.set()
+    
+    @staticmethod
+    async def _wait_for_space(buffer: _Buffer, event: Any) -> None:
+        buffer.waits += 1
+        while not buffer.closed and not buffer.put(event):
+            buffer.space.clear()
+            await buffer.space.wait()
+    
+    async def _drain(self, key: Any, buffer: _Buffer) -> AsyncIterator[Any]:
+        self.start()
+        events = buffer.events
+        try:
+            while True:
+                while events:
+                    yield buffer.take_left()
+                if self._done:
+                    break
+                buffer.ready.clear()
+                await buffer.ready.wait()
+        finally:
+            if not self._done:
+                # Closed early: stop buffering for this channel and release a waiting pump
+                buffer.closed = True
+                buffer.space.set()
+                if self._buffers.get(key) is buffer:
+                    del self._buffers[key]
+        if self._error is not None:
+            raise self._error
+    
+    def channel(self, source: str | None = None) -> AsyncIterator[BaseEvent]:
+        """Parsed events of one source (None: main agent, or a sub-agent's skill name)"""
+        buffer = self._open(source)
+        buffer.attached = True
+        return self._drain(source, buffer)
+    
+    def merged(self) -> AsyncIterator[BaseEvent]:
+        """Parsed events of all sources in arrival order (same buffering as a channel)"""
+        buffer = self._open(_MERGED)
+        buffer.attached = True
+        return self._drain(_MERGED, buffer)
+    
+    async def sources(self) -> AsyncIterator[str | None]:
+        """Each source when its first event arrives (None: main agent)
+        
+        While this iterator runs, the channel of each new source is opened with
+        its first event.
+        """
+        self.start()
+        self._source_watchers += 1
+        index = 0
+        try:
+            while True:
+                while index < len(self._sources):
+                    yield self._sources[index]
+                    index += 1
+                if self._done:
+                    break
+                self._new_source.clear()
+                await self._new_source.wait()
+        finally:
+            self._source_watchers -= 1
+        if self._error is not None:
+            raise self._error
+    
+    def stats(self) -> dict[Any, dict[str, int]]:
+        """Per open channel: buffered events, highest buffer length, coalesced deltas,
+        events dropped before a consumer took the channel, and waits of the pump"""
+        return {
+            "merged" if key is _MERGED else key: {
+                "buffered": len(buffer.events),
+                "high_water": buffer.high_water,
+                "coalesced": buffer.coalesced,
+                "dropped": buffer.dropped,
+                "waits": buffer.waits,
+            }
+            for key, buffer in self._buffers.items()
+        }
+    
+    async def aclose(self) -> None:
+        """Stop reading the stream (buffered events stay readable)"""
+        if self._pump is not None and not self._pump.done():
+            self._pump.cancel()
+            try:
+                await self._pump
+            except asyncio.CancelledError:
+                pass
+    
+    async def __aenter__(self) -> "StreamChannels":
+        self.start()
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+
+__all__ = ["StreamChannels"]
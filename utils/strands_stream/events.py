@@ -1,4 +1,9 @@
-"""Event data classes for Strands SDK stream events"""
+"""Event data classes for Strands SDK stream events
+
+Events and StreamOutput are slotted dataclasses: every streamed token creates a
+TextEvent (and a StreamOutput in renderers that wrap text), so they carry no
+per-instance __dict__.
+"""
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
@@ -8,6 +13,8 @@ from typing import Any, Literal
 class BaseEvent(ABC):
     """Abstract base class for all stream events"""
     
+    __slots__ = ()
+    
     @property
     @abstractmethod
     def event_type(self) -> str:
@@ -15,7 +22,7 @@ class BaseEvent(ABC):
         pass
 
 
-@dataclass
+@dataclass(slots=True)
 class TextEvent(BaseEvent):
     """Text chunk event from model"""
     data: str
@@ -26,7 +33,7 @@ class TextEvent(BaseEvent):
         return "text"
 
 
-@dataclass
+@dataclass(slots=True)
 class CurrentToolUseEvent(BaseEvent):
     """Tool use event (current_tool_use from Strands SDK)"""
     tool_name: str
@@ -39,7 +46,22 @@ class CurrentToolUseEvent(BaseEvent):
         return "current_tool_use"
 
 
-@dataclass
+@dataclass(slots=True)
+class ToolInputDeltaEvent(BaseEvent):
+    """Appended part of a tool input while the model streams it (raw partial JSON)"""
+    tool_name: str
+    tool_id: str | None
+    delta: str  # New characters only; concatenating all deltas gives the raw input
+    offset: int  # Length of the raw input before this delta
+    checksum: int  # zlib.crc32 of the raw input including this delta
+    source: str | None = None  # sub-agent skill_name or None for main agent
+    
+    @property
+    def event_type(self) -> str:
+        return "tool_input_delta"
+
+
+@dataclass(slots=True)
 class ToolResultEvent(BaseEvent):
     """Tool result event"""
     data: str
@@ -53,7 +75,7 @@ class ToolResultEvent(BaseEvent):
         return "tool_result"
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolStreamEvent(BaseEvent):
     """Tool stream event - data streamed from a tool (tool_stream_event from Strands SDK)"""
     tool_use: dict  # The ToolUse for the tool that streamed the event
@@ -64,7 +86,7 @@ class ToolStreamEvent(BaseEvent):
         return "tool_stream_event"
 
 
-@dataclass
+@dataclass(slots=True)
 class ReasoningEvent(BaseEvent):
     """Reasoning text event"""
     data: str
@@ -75,7 +97,7 @@ class ReasoningEvent(BaseEvent):
         return "reasoning"
 
 
-@dataclass
+@dataclass(slots=True)
 class LifecycleEvent(BaseEvent):
     """Lifecycle event (init, start, complete, force_stop)"""
     lifecycle_type: Literal["init", "start", "complete", "force_stop"]
@@ -88,7 +110,7 @@ class LifecycleEvent(BaseEvent):
         return "lifecycle"
 
 
-@dataclass
+@dataclass(slots=True)
 class MultiAgentNodeStartEvent(BaseEvent):
     """Multi-agent node start event"""
     node_id: str
@@ -99,7 +121,7 @@ class MultiAgentNodeStartEvent(BaseEvent):
         return "multiagent_node_start"
 
 
-@dataclass
+@dataclass(slots=True)
 class MultiAgentNodeStreamEvent(BaseEvent):
     """Multi-agent node stream event (forwarded inner events)"""
     node_id: str
@@ -110,7 +132,7 @@ class MultiAgentNodeStreamEvent(BaseEvent):
         return "multiagent_node_stream"
 
 
-@dataclass
+@dataclass(slots=True)
 class MultiAgentNodeStopEvent(BaseEvent):
     """Multi-agent node stop event"""
     node_id: str
@@ -121,7 +143,7 @@ class MultiAgentNodeStopEvent(BaseEvent):
         return "multiagent_node_stop"
 
 
-@dataclass
+@dataclass(slots=True)
 class MultiAgentHandoffEvent(BaseEvent):
     """Multi-agent handoff event"""
     from_node_ids: list[str]
@@ -133,7 +155,7 @@ class MultiAgentHandoffEvent(BaseEvent):
         return "multiagent_handoff"
 
 
-@dataclass
+@dataclass(slots=True)
 class MultiAgentResultEvent(BaseEvent):
     """Multi-agent final result event"""
     result: Any
@@ -143,7 +165,7 @@ class MultiAgentResultEvent(BaseEvent):
         return "multiagent_result"
 
 
-@dataclass
+@dataclass(slots=True)
 class StreamOutput:
     """Structured output from renderer with source tracking"""
     content: str
@@ -1,12 +1,15 @@
 """Core parser for Strands SDK events - no output logic, only parsing"""
 
 import json
+import sys
+import zlib
 from typing import Any
 
 from .events import (
     BaseEvent,
     TextEvent,
     CurrentToolUseEvent,
+    ToolInputDeltaEvent,
     ToolResultEvent,
     ToolStreamEvent,
     ReasoningEvent,
@@ -18,18 +21,104 @@ from .events import (
     MultiAgentResultEvent,
 )
 
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def _input_signature(tool_input: dict) -> int:
+    """Hash of a parsed tool input's keys and values (stored instead of a copy of the input)"""
+    return hash(tuple(
+        (key, value if isinstance(value, _SCALARS) else json.dumps(value, sort_keys=True, default=str))
+        for key, value in tool_input.items()
+    ))
+
+
+def _approx_size(obj: Any) -> int:
+    """Bytes of an object including nested tuples and strings (not shared objects)"""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, tuple):
+        size += sum(_approx_size(item) for item in obj)
+    return size
+
 
 class StrandsEventParser:
-    """Core parser for Strands SDK events - no output logic, only parsing"""
+    """Core parser for Strands SDK events - no output logic, only parsing
+    
+    Per-tool state (displayed calls, name mapping, input signatures and streamed
+    input progress) is dropped when the tool's result arrives, so a long-lived
+    parser only holds the calls in flight. Finished call ids are remembered (up
+    to max_tool_calls) to ignore late repeats of their toolUse, and at most
+    max_tool_calls calls in flight are tracked (the oldest is evicted first,
+    e.g. calls of a cancelled invocation that never got a result).
     
-    def __init__(self):
-        self.displayed_tool_calls = set()  # Track displayed tool calls by toolUseId
+    Args:
+        max_tool_calls: Cap on tracked in-flight and remembered finished tool calls
+    """
+    
+    # State containers reported by memory_report()
+    STATE_ATTRIBUTES = (
+        "displayed_tool_calls",
+        "completed_tool_calls",
+        "tool_use_mapping",
+        "tool_input_signatures",
+        "tool_input_progress",
+        "active_subagent_tools",
+        "processed_event_ids",
+        "processed_data_events",
+        "processed_subagent_data_events",
+    )
+    
+    def __init__(self, max_tool_calls: int = 1024):
+        self.max_tool_calls = max_tool_calls
+        self.displayed_tool_calls: dict[Any, str] = {}  # State key -> toolUseId of displayed calls (oldest first)
+        self.completed_tool_calls: dict[Any, None] = {}  # State keys of calls whose result was seen (oldest first)
         self.processed_event_ids = set()  # Track processed events by event_loop_cycle_id
         self.processed_data_events = set()  # Track processed data events
         self.processed_subagent_data_events = set()  # Track processed sub-agent data events
-        self.tool_use_mapping = {}  # Map toolUseId -> tool_name for tool results
-        self.last_tool_input = {}  # Map toolUseId -> last seen input (to detect changes for streaming)
-        self.active_subagent_tools = set()  # Track active sub-agent skill tools by toolUseId
+        self.tool_use_mapping = {}  # Map state key -> tool_name for tool results
+        self.tool_input_signatures = {}  # Map toolUseId -> hash of the last parsed (dict) input
+        self.tool_input_progress = {}  # Map toolUseId -> (length, crc32) of the streamed raw input
+        self.active_subagent_tools: dict[str, None] = {}  # toolUseIds of active sub-agent skill tools (oldest first)
+        self.evicted_on_result = 0  # Tool calls whose state was dropped at their result
+        self.evicted_by_cap = 0  # Tool calls dropped because max_tool_calls were in flight
+    
+    def _forget_tool(self, tool_key: Any) -> None:
+        """Drop the per-tool state of one tool call"""
+        self.displayed_tool_calls.pop(tool_key, None)
+        self.tool_use_mapping.pop(tool_key, None)
+        self.tool_input_signatures.pop(tool_key, None)
+        self.tool_input_progress.pop(tool_key, None)
+    
+    def _finish_tool(self, tool_use_id: str, source: str | None) -> None:
+        """Tool result seen: drop the call's state and remember it as finished"""
+        if not tool_use_id:
+            return
+        tool_key = (source, tool_use_id) if source else tool_use_id
+        self._forget_tool(tool_key)
+        self.evicted_on_result += 1
+        self.completed_tool_calls[tool_key] = None
+        if len(self.completed_tool_calls) > self.max_tool_calls:
+            del self.completed_tool_calls[next(iter(self.completed_tool_calls))]
+    
+    def memory_report(self) -> dict[str, Any]:
+        """Entries and approximate bytes per state container, plus eviction counters
+        
+        Returns:
+            {"<attribute>": {"entries": n, "bytes": b}, ..., "total_bytes": b,
+             "evicted_on_result": n, "evicted_by_cap": n}
+        """
+        report: dict[str, Any] = {}
+        total = 0
+        for name in self.STATE_ATTRIBUTES:
+            container = getattr(self, name)
+            size = sys.getsizeof(container) + sum(_approx_size(key) for key in container)
+            if isinstance(container, dict):
+                size += sum(_approx_size(value) for value in container.values() if value is not None)
+            report[name] = {"entries": len(container), "bytes": size}
+            total += size
+        report["total_bytes"] = total
+        report["evicted_on_result"] = self.evicted_on_result
+        report["evicted_by_cap"] = self.evicted_by_cap
+        return report
     
     def extract_tool_use_from_event(self, event: dict) -> dict | None:
         """Extract toolUse information from event"""
@@ -107,6 +196,14 @@ class StrandsEventParser:
     ) -> None:
         """Helper method to emit tool use events (extracted to reduce duplication)
         
+        While the model streams a tool call, the SDK sends the accumulated raw
+        JSON string on every delta. Only its length and a running CRC-32 are kept
+        per tool call, and the appended characters are emitted as a
+        ToolInputDeltaEvent, so a long input costs linear rather than quadratic
+        work. A parsed dict input is emitted as a CurrentToolUseEvent when its
+        keys or values change, which is checked against a hash of the previous
+        input instead of a copy of it.
+        
         Args:
             tool_use: Tool use dictionary from event
             source: Sub-agent skill_name or None for main agent
@@ -114,64 +211,79 @@ class StrandsEventParser:
         """
         tool_use_id = tool_use.get("toolUseId", "")
         tool_name = tool_use.get("name", "unknown")
-        # SDK provides accumulated input, so we get the current accumulated value
-        tool_input = tool_use.get("input", {}) if isinstance(tool_use.get("input"), dict) else {}
+        raw_input = tool_use.get("input")
+        tool_input = raw_input if isinstance(raw_input, dict) else {}
+        
+        # Use unique key for sub-agent: (skill_name, tool_use_id) or just tool_use_id for main agent
+        tool_key = (source, tool_use_id) if source else tool_use_id
+        if tool_key in self.completed_tool_calls:
+            return  # Late repeat of a finished call (its state was dropped at the result)
         
         # Store mapping for tool results
         if tool_use_id and tool_name:
-            self.tool_use_mapping[tool_use_id] = tool_name
-        
-        # Check if this is a new tool call or input has changed (for streaming updates)
-        is_new_tool_call = tool_use_id and tool_use_id not in self.displayed_tool_calls
-        input_changed = False
+            self.tool_use_mapping[tool_key] = tool_name
         
-        if tool_use_id:
-            # Use unique key for sub-agent: (skill_name, tool_use_id) or just tool_use_id for main agent
-            tool_key = (source, tool_use_id) if source else tool_use_id
-            
-            # Check if input has changed since last time
-            if tool_key not in self.last_tool_input:
-                # First time seeing this tool
-                self.last_tool_input[tool_key] = tool_input.copy() if isinstance(tool_input, dict) else tool_input
-                input_changed = True
-            else:
-                # Compare with last seen input (SDK already accumulated it)
-                last_input = self.last_tool_input[tool_key]
-                if tool_input != last_input:
-                    input_changed = True
-                    # Update stored value
-                    self.last_tool_input[tool_key] = tool_input.copy() if isinstance(tool_input, dict) else tool_input
-        else:
+        if not tool_use_id:
             # No tool_use_id, always emit
-            input_changed = True
-        
-        # Emit event for new tool calls or when input changes (for streaming updates)
-        if is_new_tool_call:
-            self.displayed_tool_calls.add(tool_use_id)
             parsed_events.append(
-                CurrentToolUseEvent(
-                    tool_name=tool_name,
-                    tool_id=tool_use_id,
-                    tool_input=tool_input if tool_input else None,
-                    source=source,
-                )
+                CurrentToolUseEvent(tool_name=tool_name, tool_id=None, tool_input=tool_input or None, source=source)
             )
-        elif input_changed:
-            # Emit update event when input changes (for streaming accumulation display)
+            return
+        
+        if tool_key not in self.displayed_tool_calls:
+            # New tool call
+            self.displayed_tool_calls[tool_key] = tool_use_id
+            if len(self.displayed_tool_calls) > self.max_tool_calls:
+                self._forget_tool(next(iter(self.displayed_tool_calls)))
+                self.evicted_by_cap += 1
             parsed_events.append(
-                CurrentToolUseEvent(
-                    tool_name=tool_name,
-                    tool_id=tool_use_id,
-                    tool_input=tool_input if tool_input else None,
-                    source=source,
-                )
+                CurrentToolUseEvent(tool_name=tool_name, tool_id=tool_use_id, tool_input=tool_input or None, source=source)
             )
+            if tool_input:
+                self.tool_input_signatures[tool_key] = _input_signature(tool_input)
+        elif tool_input:
+            signature = _input_signature(tool_input)
+            if self.tool_input_signatures.get(tool_key) != signature:
+                self.tool_input_signatures[tool_key] = signature
+                parsed_events.append(
+                    CurrentToolUseEvent(tool_name=tool_name, tool_id=tool_use_id, tool_input=tool_input, source=source)
+                )
+        
+        if isinstance(raw_input, str) and raw_input:
+            length, checksum = self.tool_input_progress.get(tool_key, (0, 0))
+            if len(raw_input) < length:
+                length, checksum = 0, 0  # Input restarted
+            if len(raw_input) > length:
+                delta = raw_input[length:]
+                checksum = zlib.crc32(delta.encode("utf-8"), checksum)
+                self.tool_input_progress[tool_key] = (len(raw_input), checksum)
+                parsed_events.append(
+                    ToolInputDeltaEvent(
+                        tool_name=tool_name,
+                        tool_id=tool_use_id,
+                        delta=delta,
+                        offset=length,
+                        checksum=checksum,
+                        source=source,
+                    )
+                )
     
     def parse(self, event: dict, debug: bool = False) -> list[BaseEvent]:
         """Parse raw event into list of BaseEvent objects"""
         if not isinstance(event, dict):
             return []
         
+        # Fast path for the dominant shape, a text delta ({"data": ..., "delta": {"text": ...}}):
+        # it carries nothing else, so skip probing the other keys
+        delta = event.get("delta")
+        if delta.__class__ is dict and "text" in delta and "data" in event:
+            chunk_text = event["data"]
+            return [TextEvent(data=chunk_text, source=None)] if chunk_text else []
+        
+        return self._parse_event(event)
+    
+    def _parse_event(self, event: dict) -> list[BaseEvent]:
+        """Parse any raw event shape (the general path behind parse())"""
         parsed_events: list[BaseEvent] = []
                 
         # Check for multi-agent events first (by type field)
@@ -273,7 +385,11 @@ class StrandsEventParser:
                 
                 # Mark this tool as active sub-agent (to suppress duplicate main agent events)
                 if isinstance(tool_use, dict) and tool_use.get("toolUseId"):
-                    self.active_subagent_tools.add(tool_use["toolUseId"])
+                    self.active_subagent_tools[tool_use["toolUseId"]] = None
+                    if len(self.active_subagent_tools) > self.max_tool_calls:
+                        # Safety cap (normally emptied by the results): drop the oldest
+                        del self.active_subagent_tools[next(iter(self.active_subagent_tools))]
+                        self.evicted_by_cap += 1
                 
                 # Parse sub-agent events recursively with source
                 sub_parsed = self._parse_subagent_event(sub_event, skill_name)
@@ -312,10 +428,12 @@ class StrandsEventParser:
             result_content = self.extract_result_content(tool_result)
             status = tool_result.get("status", "")
             
+            self._finish_tool(tool_use_id, None)
+            
             # Check if this is the result for an active sub-agent tool
             if tool_use_id in self.active_subagent_tools:
                 # Sub-agent tool completed - remove from active set
-                self.active_subagent_tools.discard(tool_use_id)
+                del self.active_subagent_tools[tool_use_id]
                 # Don't emit here - sub-agent result is handled via tool_stream_event
             else:
                 # Regular main agent tool result
@@ -344,6 +462,12 @@ class StrandsEventParser:
     
     def _parse_subagent_event(self, event: dict, skill_name: str) -> list[BaseEvent]:
         """Parse sub-agent event (recursive call) - uses consolidated events with source field"""
+        # Same text-delta fast path as parse()
+        delta = event.get("delta")
+        if delta.__class__ is dict and "text" in delta and "data" in event:
+            chunk_text = event["data"]
+            return [TextEvent(data=chunk_text, source=skill_name)] if chunk_text else []
+        
         parsed_events: list[BaseEvent] = []
         
         # Sub-agent text
@@ -368,9 +492,10 @@ class StrandsEventParser:
         tool_result = self.extract_tool_result_from_event(event)
         if tool_result:
             tool_use_id = tool_result.get("toolUseId", "")
-            tool_name = self.tool_use_mapping.get(tool_use_id, "unknown")
+            tool_name = self.tool_use_mapping.get((skill_name, tool_use_id) if skill_name else tool_use_id, "unknown")
             result_content = self.extract_result_content(tool_result)
             status = tool_result.get("status", "")
+            self._finish_tool(tool_use_id, skill_name)
             
             parsed_events.append(
                 ToolResultEvent(
@@ -384,13 +509,20 @@ class StrandsEventParser:
         
         return parsed_events
     
+    def channels(self, stream: Any, max_buffer: int = 1024, debug: bool = False) -> Any:
+        """Per-source channels of a raw stream parsed by this parser (see channels.StreamChannels)"""
+        from .channels import StreamChannels
+        return StreamChannels(stream, parser=self, max_buffer=max_buffer, debug=debug)
+    
     def reset(self):
         """Reset parser state for a new query"""
         self.displayed_tool_calls.clear()
+        self.completed_tool_calls.clear()
         self.processed_event_ids.clear()
         self.processed_data_events.clear()
         self.processed_subagent_data_events.clear()
         self.tool_use_mapping.clear()
-        self.last_tool_input.clear()
+        self.tool_input_signatures.clear()
+        self.tool_input_progress.clear()
         self.active_subagent_tools.clear()
 
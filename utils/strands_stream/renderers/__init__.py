@@ -1,9 +1,10 @@
-"""Stream renderers for different output environments (Terminal, Streamlit, SSE)"""
+"""Stream renderers for different output environments (Terminal, Streamlit, SSE, compact binary)"""
 
 from .base import BaseStreamRenderer, BaseAdapter
 from .streamlit import StreamlitStreamRenderer, StreamlitAdapter
 from .sse import SSEStreamRenderer, SSERenderer, SSEAdapter
 from .terminal import TerminalStreamRenderer, TerminalAdapter
+from .compact import CompactStreamRenderer
 
 __all__ = [
     # New names (recommended)
@@ -11,6 +12,7 @@ __all__ = [
     "TerminalStreamRenderer",
     "StreamlitStreamRenderer",
     "SSEStreamRenderer",
+    "CompactStreamRenderer",
     # Legacy aliases (backward compatibility)
     "BaseAdapter",
     "TerminalAdapter",
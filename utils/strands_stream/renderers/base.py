@@ -1,12 +1,14 @@
 """Base stream renderer class for environment-specific renderers"""
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, AsyncIterable, AsyncIterator
 
 from ..events import (
     BaseEvent,
     TextEvent,
     CurrentToolUseEvent,
+    ToolInputDeltaEvent,
     ToolResultEvent,
     ToolStreamEvent,
     ReasoningEvent,
@@ -23,41 +25,56 @@ from ..parser import StrandsEventParser
 class BaseStreamRenderer(ABC):
     """Abstract base class for environment-specific stream renderers"""
     
+    # Parsed event type -> handler method name (subclasses of these types resolve via their MRO)
+    HANDLERS: dict[type, str] = {
+        TextEvent: "on_text",
+        CurrentToolUseEvent: "on_tool_use",
+        ToolInputDeltaEvent: "on_tool_input_delta",
+        ToolResultEvent: "on_tool_result",
+        ToolStreamEvent: "on_tool_stream",
+        ReasoningEvent: "on_reasoning",
+        LifecycleEvent: "on_lifecycle",
+        MultiAgentNodeStartEvent: "on_multiagent_node_start",
+        MultiAgentNodeStreamEvent: "on_multiagent_node_stream",
+        MultiAgentNodeStopEvent: "on_multiagent_node_stop",
+        MultiAgentHandoffEvent: "on_multiagent_handoff",
+        MultiAgentResultEvent: "on_multiagent_result",
+    }
+    
+    # Seconds between flush(final=False) calls while aprocess waits for events (0: never)
+    frame_interval: float = 0.0
+    
     def __init__(self, parser: StrandsEventParser | None = None, debug: bool = False):
         self.parser = parser or StrandsEventParser()
         self.debug = debug
+        # Precompiled dispatch table: event type -> bound handler (one dict lookup per event)
+        self._dispatch: dict[type, Any] = {
+            event_type: getattr(self, name) for event_type, name in self.HANDLERS.items()
+        }
+    
+    def _resolve_handler(self, event_type: type) -> Any:
+        """Find the handler of an event type not in the table (e.g. an event subclass) and cache it"""
+        handler = None
+        for base in event_type.__mro__:
+            name = self.HANDLERS.get(base)
+            if name:
+                handler = getattr(self, name)
+                break
+        self._dispatch[event_type] = handler
+        return handler
     
     def process(self, event: dict) -> list[Any]:
         """Process raw event and return environment-specific output"""
         parsed_events = self.parser.parse(event, debug=self.debug)
         results = []
+        dispatch = self._dispatch
         
         for parsed_event in parsed_events:
-            # Handle all BaseEvent types
-            if isinstance(parsed_event, TextEvent):
-                result = self.on_text(parsed_event)
-            elif isinstance(parsed_event, CurrentToolUseEvent):
-                result = self.on_tool_use(parsed_event)
-            elif isinstance(parsed_event, ToolResultEvent):
-                result = self.on_tool_result(parsed_event)
-            elif isinstance(parsed_event, ToolStreamEvent):
-                result = self.on_tool_stream(parsed_event)
-            elif isinstance(parsed_event, ReasoningEvent):
-                result = self.on_reasoning(parsed_event)
-            elif isinstance(parsed_event, LifecycleEvent):
-                result = self.on_lifecycle(parsed_event)
-            elif isinstance(parsed_event, MultiAgentNodeStartEvent):
-                result = self.on_multiagent_node_start(parsed_event)
-            elif isinstance(parsed_event, MultiAgentNodeStreamEvent):
-                result = self.on_multiagent_node_stream(parsed_event)
-            elif isinstance(parsed_event, MultiAgentNodeStopEvent):
-                result = self.on_multiagent_node_stop(parsed_event)
-            elif isinstance(parsed_event, MultiAgentHandoffEvent):
-                result = self.on_multiagent_handoff(parsed_event)
-            elif isinstance(parsed_event, MultiAgentResultEvent):
-                result = self.on_multiagent_result(parsed_event)
-            else:
-                result = None
+            event_type = type(parsed_event)
+            handler = dispatch[event_type] if event_type in dispatch else self._resolve_handler(event_type)
+            if handler is None:
+                continue
+            result = handler(parsed_event)
             
             if result is not None:
                 if isinstance(result, list):
@@ -67,6 +84,126 @@ class BaseStreamRenderer(ABC):
         
         return results
     
+    def handle(self, event: BaseEvent) -> list[Any]:
+        """Outputs of one parsed event (e.g. from a StreamChannels channel)"""
+        event_type = type(event)
+        handler = self._dispatch[event_type] if event_type in self._dispatch else self._resolve_handler(event_type)
+        result = handler(event) if handler is not None else None
+        if result is None:
+            return []
+        return result if isinstance(result, list) else [result]
+    
+    def render(self, event: dict) -> list[Any]:
+        """Outputs of one raw event for aprocess (default: process)"""
+        return self.process(event)
+    
+    def merge_outputs(self, outputs: list[Any]) -> list[Any]:
+        """Combine the outputs of one aprocess flush (default: unchanged)"""
+        return outputs
+    
+    def flush(self, final: bool = True) -> list[Any]:
+        """Outputs held back by a throttling renderer (final=False: only those due now)"""
+        return []
+    
+    async def aprocess(
+        self,
+        stream: AsyncIterable[dict],
+        max_buffer: int = 1024,
+        max_batch: int = 256,
+        flush_interval: float = 0.02,
+    ) -> AsyncIterator[Any]:
+        """Render an async event stream through a bounded buffer
+        
+        A producer task parses and renders events into a queue of at most
+        `max_buffer` outputs, so the model stream keeps being consumed while the
+        caller writes to a slow sink. Queued outputs are flushed in batches of
+        up to `max_batch`, at the latest `flush_interval` seconds after the first
+        output of the batch, and combined by merge_outputs (e.g. one write per
+        batch instead of one per token). When the buffer is full the producer
+        waits, which bounds memory. Renderers that hold outputs back (see
+        flush) are flushed at the end of the stream and, with a frame_interval,
+        whenever the stream is idle for that long.
+        
+        Usage:
+            >>> async for out in renderer.aprocess(agent.stream_async(prompt)):
+            ...     sink.write(out)
+        
+        Args:
+            stream: Raw events (e.g. Agent.stream_async)
+            max_buffer: Maximum number of queued outputs
+            max_batch: Maximum number of outputs per flush
+            flush_interval: Seconds a batch waits for more outputs (0: flush what is queued)
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffer)
+        done = object()
+        errors: list[BaseException] = []
+        
+        async def produce():
+            try:
+                async for event in stream:
+                    for output in self.render(event):
+                        await queue.put(output)
+                for output in self.flush():
+                    await queue.put(output)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                errors.append(e)
+            finally:
+                # Close the source in this task (agent streams hold OTel contexts)
+                aclose = getattr(stream, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+            await queue.put(done)
+        
+        loop = asyncio.get_running_loop()
+        producer = asyncio.create_task(produce())
+        try:
+            finished = False
+            while not finished:
+                if self.frame_interval:
+                    # An empty queue means the producer holds no outputs, so a due frame can go out in order
+                    try:
+                        output = await asyncio.wait_for(queue.get(), self.frame_interval)
+                    except asyncio.TimeoutError:
+                        frame = self.flush(final=False)
+                        if frame:
+                            for merged in self.merge_outputs(frame):
+                                yield merged
+                        continue
+                else:
+                    output = await queue.get()
+                if output is done:
+                    break
+                batch = [output]
+                deadline = loop.time() + flush_interval
+                while len(batch) < max_batch:
+                    if not queue.empty():
+                        output = queue.get_nowait()
+                    else:
+                        timeout = deadline - loop.time()
+                        if timeout <= 0:
+                            break
+                        try:
+                            output = await asyncio.wait_for(queue.get(), timeout)
+                        except asyncio.TimeoutError:
+                            break
+                    if output is done:
+                        finished = True
+                        break
+                    batch.append(output)
+                for merged in self.merge_outputs(batch):
+                    yield merged
+            if errors:
+                raise errors[0]
+        finally:
+            if not producer.done():
+                producer.cancel()
+                try:
+                    await producer
+                except asyncio.CancelledError:
+                    pass
+    
     @abstractmethod
     def on_text(self, event: TextEvent) -> Any:
         """Handle text event"""
@@ -77,6 +214,10 @@ class BaseStreamRenderer(ABC):
         """Handle tool use event (current_tool_use)"""
         pass
     
+    def on_tool_input_delta(self, event: ToolInputDeltaEvent) -> Any:
+        """Handle streamed tool input characters - default: no-op (the parsed input follows as on_tool_use)"""
+        return None
+    
     @abstractmethod
     def on_tool_result(self, event: ToolResultEvent) -> Any:
         """Handle tool result event"""
@@ -0,0 +1,144 @@
+"""Compact binary stream renderer (MessagePack wire format, see ..wire)"""
+
+from typing import Any
+
+from ..events import (
+    TextEvent,
+    CurrentToolUseEvent,
+    ToolInputDeltaEvent,
+    ToolResultEvent,
+    ToolStreamEvent,
+    ReasoningEvent,
+    LifecycleEvent,
+    MultiAgentNodeStartEvent,
+    MultiAgentNodeStopEvent,
+    MultiAgentHandoffEvent,
+    MultiAgentResultEvent,
+)
+from ..wire import EVENT_CODES, STRING, packb
+from .base import BaseStreamRenderer
+from .sse import _to_jsonable
+
+_TEXT = EVENT_CODES["text"]
+_TOOL_USE = EVENT_CODES["current_tool_use"]
+_TOOL_INPUT_DELTA = EVENT_CODES["tool_input_delta"]
+_TOOL_RESULT = EVENT_CODES["tool_result"]
+_TOOL_STREAM = EVENT_CODES["tool_stream_event"]
+_REASONING = EVENT_CODES["reasoning"]
+_LIFECYCLE = EVENT_CODES["lifecycle"]
+_NODE_START = EVENT_CODES["multiagent_node_start"]
+_NODE_STOP = EVENT_CODES["multiagent_node_stop"]
+_HANDOFF = EVENT_CODES["multiagent_handoff"]
+_RESULT = EVENT_CODES["multiagent_result"]
+
+
+class CompactStreamRenderer(BaseStreamRenderer):
+    """Stream renderer for binary transports (returns MessagePack bytes per event)
+    
+    Carries the same information as SSEStreamRenderer with numeric event codes,
+    positional fields and interned strings; decode with CompactStreamDecoder.
+    
+    Args:
+        parser: Event parser (default: a new StrandsEventParser)
+        debug: Enable parser debug output
+        max_strings: Size of the per-stream string table (later strings are sent inline)
+    """
+    
+    def __init__(self, parser=None, debug: bool = False, max_strings: int = 4096):
+        super().__init__(parser, debug=debug)
+        self.max_strings = max_strings
+        self.strings: dict[str, int] = {}
+    
+    def _intern(self, value: Any, out: list[bytes]) -> Any:
+        """Index of a string in the table, defining it first if new"""
+        if value.__class__ is not str:
+            return value
+        index = self.strings.get(value)
+        if index is None:
+            if len(self.strings) >= self.max_strings:
+                return value
+            index = self.strings[value] = len(self.strings)
+            out.append(packb([STRING, value]))
+        return index
+    
+    def _message(self, out: list[bytes], code: int, *fields: Any) -> bytes:
+        end = len(fields)
+        while end and fields[end - 1] is None:
+            end -= 1
+        out.append(packb([code, *fields[:end]], default=_to_jsonable))
+        return out[0] if len(out) == 1 else b"".join(out)
+    
+    def on_text(self, event: TextEvent) -> bytes:
+        """Encode text event"""
+        out = []
+        return self._message(out, _TEXT, event.data, self._intern(event.source, out))
+    
+    def on_tool_use(self, event: CurrentToolUseEvent) -> bytes:
+        """Encode tool use"""
+        out = []
+        intern = self._intern
+        return self._message(
+            out, _TOOL_USE, intern(event.tool_name, out), intern(event.tool_id, out),
+            event.tool_input, intern(event.source, out),
+        )
+    
+    def on_tool_input_delta(self, event: ToolInputDeltaEvent) -> bytes:
+        """Encode streamed tool input characters"""
+        out = []
+        intern = self._intern
+        return self._message(
+            out, _TOOL_INPUT_DELTA, intern(event.tool_name, out), intern(event.tool_id, out),
+            event.delta, event.offset, event.checksum, intern(event.source, out),
+        )
+    
+    def on_tool_result(self, event: ToolResultEvent) -> bytes:
+        """Encode tool result"""
+        out = []
+        intern = self._intern
+        return self._message(
+            out, _TOOL_RESULT, intern(event.tool_name, out), intern(event.tool_id, out),
+            event.data, event.metadata, intern(event.source, out),
+        )
+    
+    def on_tool_stream(self, event: ToolStreamEvent) -> bytes:
+        """Encode tool stream event"""
+        return self._message([], _TOOL_STREAM, event.tool_use, event.data)
+    
+    def on_reasoning(self, event: ReasoningEvent) -> bytes:
+        """Encode reasoning event"""
+        return self._message([], _REASONING, event.data, event.metadata)
+    
+    def on_lifecycle(self, event: LifecycleEvent) -> bytes:
+        """Encode lifecycle event"""
+        out = []
+        return self._message(
+            out, _LIFECYCLE, self._intern(event.lifecycle_type, out),
+            event.message, event.force_stop_reason, event.result,
+        )
+    
+    def on_multiagent_node_start(self, event: MultiAgentNodeStartEvent) -> bytes:
+        """Encode multi-agent node start"""
+        out = []
+        return self._message(out, _NODE_START, self._intern(event.node_id, out), self._intern(event.node_type, out))
+    
+    def on_multiagent_node_stop(self, event: MultiAgentNodeStopEvent) -> bytes:
+        """Encode multi-agent node stop"""
+        out = []
+        return self._message(out, _NODE_STOP, self._intern(event.node_id, out), event.node_result)
+    
+    def on_multiagent_handoff(self, event: MultiAgentHandoffEvent) -> bytes:
+        """Encode multi-agent handoff"""
+        return self._message([], _HANDOFF, event.from_node_ids, event.to_node_ids, event.message)
+    
+    def on_multiagent_result(self, event: MultiAgentResultEvent) -> bytes:
+        """Encode multi-agent final result"""
+        return self._message([], _RESULT, event.result)
+    
+    def merge_outputs(self, outputs: list[bytes]) -> list[bytes]:
+        """Join the messages of one aprocess flush into a single chunk"""
+        return [b"".join(outputs)]
+    
+    def reset(self):
+        """Reset renderer state (start a new stream: clients need a new decoder)"""
+        super().reset()
+        self.strings.clear()
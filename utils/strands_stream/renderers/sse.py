@@ -1,11 +1,18 @@
 """SSE stream renderer for FastAPI Server-Sent Events"""
 
 import json
-from typing import Any
+from typing import Any, Callable
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 from ..events import (
     TextEvent,
     CurrentToolUseEvent,
+    ToolInputDeltaEvent,
     ToolResultEvent,
     ToolStreamEvent,
     ReasoningEvent,
@@ -19,40 +26,82 @@ from ..events import (
 from .base import BaseStreamRenderer
 
 
+def _to_jsonable(obj: Any) -> Any:
+    """Fallback for objects the encoder cannot serialize (SDK results, datetimes, ...)"""
+    if hasattr(obj, '__dict__'):
+        return {k: str(v) for k, v in obj.__dict__.items() if not k.startswith('_')}
+    return str(obj)
+
+
+if ORJSON_AVAILABLE:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def orjson_encoder(obj: Any) -> str:
+        """Encode with orjson (unserializable objects go through _to_jsonable)"""
+        return orjson.dumps(obj, default=_to_jsonable, option=_ORJSON_OPTIONS).decode()
+
+
+# Standard library encoder (unserializable objects go through _to_jsonable)
+json_encoder: Callable[[Any], str] = json.JSONEncoder(default=_to_jsonable).encode
+
+
+DEFAULT_ENCODER: Callable[[Any], str] = orjson_encoder if ORJSON_AVAILABLE else json_encoder
+
+# Pre-encoded frame prefixes of the per-token events (payloads are closed with "}\n\n")
+_TEXT_PREFIX = 'data: {"type":"text","data":'
+_TOOL_INPUT_DELTA_PREFIX = 'data: {"type":"tool_input_delta","tool_name":'
+_SOURCE_KEY = ',"source":'
+_FRAME_END = "}\n\n"
+
+
+class _TextFrame(str):
+    """SSE text frame that remembers its delta, so batched mode can repack consecutive frames"""
+    
+    source: str | None
+    data: str
+
+
 class SSEStreamRenderer(BaseStreamRenderer):
-    """Stream renderer for FastAPI Server-Sent Events (returns JSON strings)"""
+    """Stream renderer for FastAPI Server-Sent Events (returns JSON strings)
     
-    def _safe_serialize(self, obj: Any) -> Any:
-        """Try to serialize complex objects safely
-        
-        Args:
-            obj: Object to serialize
-            
-        Returns:
-            JSON-serializable representation of the object
-        """
-        if obj is None:
-            return None
-        try:
-            # Test if object is JSON serializable
-            json.dumps(obj)
-            return obj
-        except (TypeError, ValueError):
-            # Extract common attributes if available
-            if hasattr(obj, '__dict__'):
-                return {k: str(v) for k, v in obj.__dict__.items() 
-                        if not k.startswith('_')}
-            return str(obj)
+    Args:
+        parser: Event parser (default: a new StrandsEventParser)
+        debug: Enable parser debug output
+        encoder: Callable encoding a payload to a JSON string (default: orjson if
+            installed, else the standard library); objects it cannot serialize
+            must go through _to_jsonable
+        batch_deltas: Pack consecutive text deltas of the same source into one
+            SSE frame per aprocess flush (process() output is unchanged)
+    """
+    
+    def __init__(
+        self,
+        parser=None,
+        debug: bool = False,
+        encoder: Callable[[Any], str] | None = None,
+        batch_deltas: bool = False,
+    ):
+        super().__init__(parser, debug=debug)
+        self.encode = encoder or DEFAULT_ENCODER
+        self.batch_deltas = batch_deltas
+    
+    def _frame(self, payload: dict) -> str:
+        return f"data: {self.encode(payload)}\n\n"
+    
+    def _text_frame(self, data: str, source: str | None) -> str:
+        encode = self.encode
+        if source:
+            return f"{_TEXT_PREFIX}{encode(data)}{_SOURCE_KEY}{encode(source)}{_FRAME_END}"
+        return f"{_TEXT_PREFIX}{encode(data)}{_FRAME_END}"
     
     def on_text(self, event: TextEvent) -> str:
         """Format text event as SSE"""
-        payload = {
-            "type": "text",
-            "data": event.data,
-        }
-        if event.source:
-            payload["source"] = event.source
-        return f"data: {json.dumps(payload)}\n\n"
+        frame = self._text_frame(event.data, event.source)
+        if self.batch_deltas:
+            frame = _TextFrame(frame)
+            frame.source = event.source
+            frame.data = event.data
+        return frame
     
     def on_tool_use(self, event: CurrentToolUseEvent) -> str:
         """Format tool use as SSE"""
@@ -64,7 +113,18 @@ class SSEStreamRenderer(BaseStreamRenderer):
         }
         if event.source:
             payload["source"] = event.source
-        return f"data: {json.dumps(payload)}\n\n"
+        return self._frame(payload)
+    
+    def on_tool_input_delta(self, event: ToolInputDeltaEvent) -> str:
+        """Format streamed tool input characters as SSE (append-only, clients concatenate deltas)"""
+        encode = self.encode
+        frame = (
+            f"{_TOOL_INPUT_DELTA_PREFIX}{encode(event.tool_name)},\"tool_id\":{encode(event.tool_id)}"
+            f",\"delta\":{encode(event.delta)},\"offset\":{event.offset},\"checksum\":{event.checksum}"
+        )
+        if event.source:
+            frame += f"{_SOURCE_KEY}{encode(event.source)}"
+        return frame + _FRAME_END
     
     def on_tool_result(self, event: ToolResultEvent) -> str:
         """Format tool result as SSE"""
@@ -77,7 +137,7 @@ class SSEStreamRenderer(BaseStreamRenderer):
         }
         if event.source:
             payload["source"] = event.source
-        return f"data: {json.dumps(payload)}\n\n"
+        return self._frame(payload)
     
     def on_tool_stream(self, event: ToolStreamEvent) -> str:
         """Format tool stream event as SSE"""
@@ -86,7 +146,7 @@ class SSEStreamRenderer(BaseStreamRenderer):
             "tool_use": event.tool_use,
             "data": event.data,
         }
-        return f"data: {json.dumps(payload)}\n\n"
+        return self._frame(payload)
     
     def on_reasoning(self, event: ReasoningEvent) -> str:
         """Format reasoning event as SSE"""
@@ -95,7 +155,7 @@ class SSEStreamRenderer(BaseStreamRenderer):
             "data": event.data,
             "metadata": event.metadata,
         }
-        return f"data: {json.dumps(payload)}\n\n"
+        return self._frame(payload)
     
     def on_lifecycle(self, event: LifecycleEvent) -> str:
         """Format lifecycle event as SSE"""
@@ -104,9 +164,9 @@ class SSEStreamRenderer(BaseStreamRenderer):
             "lifecycle_type": event.lifecycle_type,
             "message": event.message,
             "force_stop_reason": event.force_stop_reason,
-            "result": self._safe_serialize(event.result),
+            "result": event.result,  # SDK objects are serialized by the encoder via _to_jsonable
         }
-        return f"data: {json.dumps(payload)}\n\n"
+        return self._frame(payload)
     
     def on_multiagent_node_start(self, event: MultiAgentNodeStartEvent) -> str:
         """Format multi-agent node start as SSE"""
@@ -115,7 +175,7 @@ class SSEStreamRenderer(BaseStreamRenderer):
             "node_id": event.node_id,
             "node_type": event.node_type,
         }
-        return f"data: {json.dumps(payload)}\n\n"
+        return self._frame(payload)
     
     def on_multiagent_node_stream(self, event: MultiAgentNodeStreamEvent) -> list:
         """Process multi-agent node stream (recursively process inner event)"""
@@ -127,9 +187,9 @@ class SSEStreamRenderer(BaseStreamRenderer):
         payload = {
             "type": "multiagent_node_stop",
             "node_id": event.node_id,
-            "node_result": self._safe_serialize(event.node_result),
+            "node_result": event.node_result,
         }
-        return f"data: {json.dumps(payload)}\n\n"
+        return self._frame(payload)
     
     def on_multiagent_handoff(self, event: MultiAgentHandoffEvent) -> str:
         """Format multi-agent handoff as SSE"""
@@ -139,15 +199,45 @@ class SSEStreamRenderer(BaseStreamRenderer):
             "to_node_ids": event.to_node_ids,
             "message": event.message,
         }
-        return f"data: {json.dumps(payload)}\n\n"
+        return self._frame(payload)
     
     def on_multiagent_result(self, event: MultiAgentResultEvent) -> str:
         """Format multi-agent final result as SSE"""
         payload = {
             "type": "multiagent_result",
-            "result": self._safe_serialize(event.result),
+            "result": event.result,  # SDK objects are serialized by the encoder via _to_jsonable
         }
-        return f"data: {json.dumps(payload)}\n\n"
+        return self._frame(payload)
+    
+    def merge_outputs(self, outputs: list[str]) -> list[str]:
+        """Join the SSE frames of one aprocess flush into a single chunk (one socket write)
+        
+        With batch_deltas, consecutive text frames of the same source are first
+        repacked into one frame carrying the concatenated text.
+        """
+        if self.batch_deltas:
+            outputs = self._pack_text_frames(outputs)
+        return ["".join(outputs)]
+    
+    def _pack_text_frames(self, outputs: list[str]) -> list[str]:
+        packed: list[str] = []
+        run: list[_TextFrame] = []
+        for output in outputs:
+            if run and not (isinstance(output, _TextFrame) and output.source == run[0].source):
+                packed.append(self._pack_run(run))
+                run = []
+            if isinstance(output, _TextFrame):
+                run.append(output)
+            else:
+                packed.append(output)
+        if run:
+            packed.append(self._pack_run(run))
+        return packed
+    
+    def _pack_run(self, run: list[_TextFrame]) -> str:
+        if len(run) == 1:
+            return run[0]
+        return self._text_frame("".join(frame.data for frame in run), run[0].source)
 
 
 # Backward compatibility aliases
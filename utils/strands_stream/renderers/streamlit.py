@@ -1,6 +1,7 @@
 """Streamlit stream renderer for markdown output"""
 
 import json
+import time
 from typing import Any
 
 from ..events import (
@@ -21,13 +22,110 @@ from .base import BaseStreamRenderer
 
 
 class StreamlitStreamRenderer(BaseStreamRenderer):
-    """Stream renderer for Streamlit output (returns StreamOutput objects)"""
+    """Stream renderer for Streamlit output (returns StreamOutput objects)
     
-    def __init__(self, parser=None):
+    With max_updates_per_second, outputs are accumulated per source and sent
+    as frames: at most that many per second, each with one StreamOutput per
+    source holding everything it rendered since the previous frame, so an app
+    re-renders its markdown once per frame instead of once per token. Outputs
+    other than text and reasoning (tool calls and results, lifecycle, ...)
+    send the frame at once. A tool input update is pretty-printed only when
+    the input is done changing (the source renders something else, or it has
+    not changed for a frame interval), and the reasoning blockquote markup is
+    applied once per frame. Call flush() at the end of the stream (aprocess
+    does, and also sends due frames while the stream is idle).
+    
+    Args:
+        parser: Event parser (default: a new StrandsEventParser)
+        max_updates_per_second: Frame rate limit (0: one output per event)
+    """
+    
+    # Output types accumulated until the next frame is due (others send the frame at once)
+    FRAME_TYPES = frozenset({"text", "reasoning"})
+    
+    def __init__(self, parser=None, max_updates_per_second: float = 0):
         super().__init__(parser)
         # Track displayed tool calls by (source, tool_id) or (source, tool_name) for deduplication
         self.displayed_tool_calls = set()
         self.current_reasoning_active: dict[str | None, bool] = {}  # Track reasoning state per source
+        self.frame_interval = 1 / max_updates_per_second if max_updates_per_second else 0.0
+        self._frame: dict[str | None, list[StreamOutput]] = {}  # Source -> outputs since the last frame
+        self._pending_inputs: dict[str | None, tuple[float, CurrentToolUseEvent]] = {}  # Source -> (updated, latest unprinted input)
+        self._next_frame = 0.0
+        if self.frame_interval:
+            # Only throttled renderers pay for frames (process() is called once per token)
+            self.process = self._process_frame
+    
+    def _process_frame(self, event: dict) -> list[StreamOutput]:
+        """process() with a frame rate limit: the frame when it is due, else nothing"""
+        outputs = super().process(event)
+        urgent = False
+        for output in outputs:
+            self._add_to_frame(output)
+            if output.event_type not in self.FRAME_TYPES:
+                urgent = True
+        now = time.monotonic()
+        if urgent or now >= self._next_frame:
+            return self._emit_frame(now)
+        return []
+    
+    def flush(self, final: bool = True) -> list[StreamOutput]:
+        """Send the accumulated frame (final=False: only if it is due)"""
+        if not self.frame_interval:
+            return []
+        now = time.monotonic()
+        if not final and now < self._next_frame:
+            return []
+        return self._emit_frame(now, final)
+    
+    def _add_to_frame(self, output: StreamOutput) -> None:
+        source = output.source
+        outputs = self._frame.get(source)
+        if outputs is None:
+            outputs = self._frame[source] = []
+        # The source moved on, so its pending tool input is complete
+        pending = self._pending_inputs.pop(source, None)
+        if pending is not None:
+            outputs.append(self._tool_input_output(pending[1]))
+        outputs.append(output)
+    
+    def _emit_frame(self, now: float, final: bool = False) -> list[StreamOutput]:
+        # A tool input that has not changed for a whole frame interval is complete
+        for source, (updated, event) in list(self._pending_inputs.items()):
+            if final or now - updated >= self.frame_interval:
+                del self._pending_inputs[source]
+                self._frame.setdefault(source, []).append(self._tool_input_output(event))
+        if not self._frame:
+            return []
+        self._next_frame = now + self.frame_interval
+        frame = [self._merge_frame(source, outputs) for source, outputs in self._frame.items()]
+        self._frame.clear()
+        return frame
+    
+    def _merge_frame(self, source: str | None, outputs: list[StreamOutput]) -> StreamOutput:
+        """One output with the content of a source's frame (event_type "content" if it mixes types)"""
+        parts: list[str] = []
+        reasoning: list[str] = []
+        for output in outputs:
+            if output.event_type == "reasoning":
+                reasoning.append(output.content)
+                continue
+            if reasoning:
+                parts.append("".join(reasoning).replace("\n", "\n> "))
+                reasoning.clear()
+            parts.append(output.content)
+        if reasoning:
+            parts.append("".join(reasoning).replace("\n", "\n> "))
+        event_types = {output.event_type for output in outputs}
+        event_type = event_types.pop() if len(event_types) == 1 else "content"
+        return StreamOutput(content="".join(parts), source=source, event_type=event_type)
+    
+    def _tool_input_output(self, event: CurrentToolUseEvent) -> StreamOutput:
+        return StreamOutput(
+            content=f"\n```json\n{json.dumps(event.tool_input, indent=2, ensure_ascii=False)}\n```\n\n",
+            source=event.source,
+            event_type="tool_input_update"
+        )
     
     def format_tool_display(self, tool_name: str, tool_input: dict | None) -> str:
         """Format tool name and arguments for display"""
@@ -83,12 +181,11 @@ class StreamlitStreamRenderer(BaseStreamRenderer):
         else:
             # Update - show input update (for streaming accumulation)
             if event.tool_input:
-                content = f"\n```json\n{json.dumps(event.tool_input, indent=2, ensure_ascii=False)}\n```\n\n"
-                return StreamOutput(
-                    content=content,
-                    source=event.source,
-                    event_type="tool_input_update"
-                )
+                if self.frame_interval:
+                    # Printed once the input stops changing (see _add_to_frame / _emit_frame)
+                    self._pending_inputs[event.source] = (time.monotonic(), event)
+                    return None
+                return self._tool_input_output(event)
         return None
     
     def on_tool_result(self, event: ToolResultEvent) -> StreamOutput | None:
@@ -96,6 +193,8 @@ class StreamlitStreamRenderer(BaseStreamRenderer):
         # Reset reasoning state for this source when tool result occurs
         if event.source in self.current_reasoning_active:
             self.current_reasoning_active[event.source] = False
+        # The parser sends nothing more for this call, so its dedup entry can go
+        self.displayed_tool_calls.discard((event.source, event.tool_id))
         
         if not event.data:
             return None
@@ -156,7 +255,8 @@ class StreamlitStreamRenderer(BaseStreamRenderer):
         source = None
         
         # Replace newlines with newline + > to maintain blockquote across multiple lines
-        text = event.data.replace("\n", "\n> ")
+        # (in frames, once per frame by _merge_frame)
+        text = event.data if self.frame_interval else event.data.replace("\n", "\n> ")
         
         # Add > prefix and 💭 emoji only when reasoning starts (not on every token)
         if source not in self.current_reasoning_active:
@@ -204,8 +304,8 @@ class StreamlitStreamRenderer(BaseStreamRenderer):
     
     def on_multiagent_node_stream(self, event: MultiAgentNodeStreamEvent) -> list[Any]:
         """Process multi-agent node stream (recursively process inner event)"""
-        # Recursively process inner event
-        return self.process(event.inner_event)
+        # Recursively process inner event (unthrottled: the outer process() adds it to the frame)
+        return super().process(event.inner_event)
     
     def on_multiagent_node_stop(self, event: MultiAgentNodeStopEvent) -> StreamOutput:
         """Return multi-agent node stop as StreamOutput"""
@@ -250,11 +350,28 @@ class StreamlitStreamRenderer(BaseStreamRenderer):
             event_type="multiagent_result"
         )
     
+    def merge_outputs(self, outputs: list[StreamOutput]) -> list[StreamOutput]:
+        """Concatenate consecutive text/reasoning chunks of the same source (one placeholder update per flush)"""
+        merged: list[tuple[str | None, str, list[str]]] = []  # (source, event_type, contents)
+        for output in outputs:
+            if (
+                merged
+                and output.event_type in ("text", "reasoning")
+                and merged[-1][:2] == (output.source, output.event_type)
+            ):
+                merged[-1][2].append(output.content)
+            else:
+                merged.append((output.source, output.event_type, [output.content]))
+        return [StreamOutput("".join(contents), source, event_type) for source, event_type, contents in merged]
+    
     def reset(self):
         """Reset renderer state"""
         super().reset()
         self.displayed_tool_calls.clear()
         self.current_reasoning_active.clear()
+        self._frame.clear()
+        self._pending_inputs.clear()
+        self._next_frame = 0.0
 
 
 # Backward compatibility alias
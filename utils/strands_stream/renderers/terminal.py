@@ -1,5 +1,6 @@
 """Terminal stream renderer for colored output using colorama"""
 
+import io
 import json
 from typing import Any
 
@@ -24,6 +25,7 @@ except ImportError:
 from ..events import (
     TextEvent,
     CurrentToolUseEvent,
+    ToolInputDeltaEvent,
     ToolResultEvent,
     ToolStreamEvent,
     ReasoningEvent,
@@ -48,8 +50,27 @@ class TerminalStreamRenderer(BaseStreamRenderer):
         self.tool_call_counter = 0
         self.use_colors = use_colors and COLORAMA_AVAILABLE
         self.displayed_tool_calls = {}  # Map tool_id -> tool_call_number (to track which tool calls we've seen)
+        self.streamed_tool_inputs = set()  # tool_ids whose input was printed as it streamed
         self.current_text_source: str | None | object = None  # Track current text source to show prefix only on change
         self.current_reasoning_active: bool = False  # Track if reasoning is currently active to show different color only on start
+        self.out = None  # Output stream (None: sys.stdout); aprocess captures output here
+    
+    def _print(self, *args, **kwargs) -> None:
+        print(*args, file=self.out, **kwargs)
+    
+    def render(self, event: dict) -> list[str]:
+        """Captured terminal output of one raw event (aprocess writes it per batch, not per token)"""
+        self.out = buffer = io.StringIO()
+        try:
+            self.process(event)
+        finally:
+            self.out = None
+        text = buffer.getvalue()
+        return [text] if text else []
+    
+    def merge_outputs(self, outputs: list[str]) -> list[str]:
+        """Join the captured output of one flush into a single write"""
+        return ["".join(outputs)]
     
     def _colorize(self, text: str, *colors) -> str:
         """Apply color/style to text if colors are enabled
@@ -66,15 +87,15 @@ class TerminalStreamRenderer(BaseStreamRenderer):
     def _print_status(self, icon: str, message: str, color=None) -> None:
         """Print a status message with optional color"""
         if color and self.use_colors:
-            print(self._colorize(f"{icon} {message}", color))
+            self._print(self._colorize(f"{icon} {message}", color))
         else:
-            print(f"{icon} {message}")
+            self._print(f"{icon} {message}")
     
     def on_text(self, event: TextEvent) -> None:
         """Print text chunk"""
         # If reasoning was active, add newlines before text
         if self.current_reasoning_active:
-            print("\n\n", end="", flush=True)
+            self._print("\n\n", end="", flush=True)
         # Reset reasoning state when text event occurs
         self.current_reasoning_active = False
         # Add source prefix only when source changes (not on every token)
@@ -83,16 +104,16 @@ class TerminalStreamRenderer(BaseStreamRenderer):
             self.current_text_source = event.source
             if event.source:
                 # Sub-agent text starting
-                print(f"\n{self._colorize(f'[Sub-Agent ⚡ {event.source}] ', Fore.YELLOW)}", end="", flush=True)
+                self._print(f"\n{self._colorize(f'[Sub-Agent ⚡ {event.source}] ', Fore.YELLOW)}", end="", flush=True)
             elif previous_source is self._TEXT_SOURCE_RESET:
                 # Switching back to main agent after tool event - add newline for readability
-                print("\n", end="", flush=True)
+                self._print("\n", end="", flush=True)
         
         # Sub-agent text is printed in yellow to distinguish from main agent
         if event.source:
-            print(self._colorize(event.data, Fore.MAGENTA), end="", flush=True)
+            self._print(self._colorize(event.data, Fore.MAGENTA), end="", flush=True)
         else:
-            print(event.data, end="", flush=True)
+            self._print(event.data, end="", flush=True)
         return None  # Terminal output doesn't return values
     
     def on_tool_use(self, event: CurrentToolUseEvent) -> None:
@@ -101,7 +122,7 @@ class TerminalStreamRenderer(BaseStreamRenderer):
         self.current_text_source = self._TEXT_SOURCE_RESET
         # If reasoning was active, add newlines before tool use
         if self.current_reasoning_active:
-            print("\n\n", end="", flush=True)
+            self._print("\n\n", end="", flush=True)
         # Reset reasoning state when tool use occurs
         self.current_reasoning_active = False
         
@@ -120,13 +141,22 @@ class TerminalStreamRenderer(BaseStreamRenderer):
             header = f"Tool #{tool_number}: {event.tool_name}"
             if event.source:
                 header = f"[Sub-Agent: {event.source}] {header}"
-            print(f"\n{separator}")
-            print(self._colorize(header, Style.BRIGHT, Fore.BLUE))
+            self._print(f"\n{separator}")
+            self._print(self._colorize(header, Style.BRIGHT, Fore.BLUE))
         
-        if event.tool_input:
-            print(self._colorize(json.dumps(event.tool_input, indent=2, ensure_ascii=False), Style.BRIGHT, Fore.CYAN))
+        if tool_key in self.streamed_tool_inputs:
+            # Input was already printed as it streamed (on_tool_input_delta)
+            self._print()
+        elif event.tool_input:
+            self._print(self._colorize(json.dumps(event.tool_input, indent=2, ensure_ascii=False), Style.BRIGHT, Fore.CYAN))
 
-        print(f"{separator}")
+        self._print(f"{separator}")
+        return None
+    
+    def on_tool_input_delta(self, event: ToolInputDeltaEvent) -> None:
+        """Print streamed tool input characters as they arrive (raw JSON)"""
+        self.streamed_tool_inputs.add(event.tool_id or event.tool_name)
+        self._print(self._colorize(event.delta, Fore.CYAN), end="", flush=True)
         return None
     
     def on_tool_result(self, event: ToolResultEvent) -> None:
@@ -135,12 +165,16 @@ class TerminalStreamRenderer(BaseStreamRenderer):
         self.current_text_source = self._TEXT_SOURCE_RESET
         # If reasoning was active, add newlines before tool result
         if self.current_reasoning_active:
-            print("\n\n", end="", flush=True)
+            self._print("\n\n", end="", flush=True)
         # Reset reasoning state when tool result occurs
         self.current_reasoning_active = False
+        # The parser sends nothing more for this call, so its display state can go
+        if event.tool_id:
+            self.displayed_tool_calls.pop(event.tool_id, None)
+            self.streamed_tool_inputs.discard(event.tool_id)
         
         separator = "─" * 60
-        print(separator)
+        self._print(separator)
         header_parts = ["Tool Result:"]
         if event.source:
             header_parts[0] = f"[Sub-Agent: {event.source}] Tool Result:"
@@ -151,16 +185,16 @@ class TerminalStreamRenderer(BaseStreamRenderer):
         header_parts.append(f"[content length] {len(event.data)} characters")
         
         header = "\n".join(header_parts)
-        print(self._colorize(header, Style.BRIGHT, Fore.GREEN))
-        print(separator)
+        self._print(self._colorize(header, Style.BRIGHT, Fore.GREEN))
+        self._print(separator)
         
         if event.data:
             if len(event.data) > 1000:
                 preview = event.data[:1000] + "\n...(생략)"
-                print(preview)
+                self._print(preview)
             else:
-                print(event.data)
-        print(f"{separator}\n")
+                self._print(event.data)
+        self._print(f"{separator}\n")
         return None
     
     def on_tool_stream(self, event: ToolStreamEvent) -> None:
@@ -169,7 +203,7 @@ class TerminalStreamRenderer(BaseStreamRenderer):
         self.current_text_source = self._TEXT_SOURCE_RESET
         # If reasoning was active, add newlines before tool stream
         if self.current_reasoning_active:
-            print("\n\n", end="", flush=True)
+            self._print("\n\n", end="", flush=True)
         # Reset reasoning state when tool stream occurs
         self.current_reasoning_active = False
         
@@ -179,32 +213,32 @@ class TerminalStreamRenderer(BaseStreamRenderer):
         tool_input = tool_use_dict.get("input", {})
         
         separator = "─" * 60
-        print(f"\n{separator}")
+        self._print(f"\n{separator}")
         header = f"Tool Stream: {tool_name}"
         if tool_id:
             header += f" [toolUseId: {tool_id}]"
-        print(self._colorize(header, Style.BRIGHT, Fore.MAGENTA))
-        print(separator)
+        self._print(self._colorize(header, Style.BRIGHT, Fore.MAGENTA))
+        self._print(separator)
         # Show tool_input if available
         if tool_input:
-            print(self._colorize(json.dumps(tool_input, indent=2, ensure_ascii=False), Style.BRIGHT, Fore.CYAN))
-            print(separator)
+            self._print(self._colorize(json.dumps(tool_input, indent=2, ensure_ascii=False), Style.BRIGHT, Fore.CYAN))
+            self._print(separator)
         # Show stream data
         if event.data:
             if isinstance(event.data, str):
-                print(self._colorize(event.data, Style.BRIGHT, Fore.CYAN))
+                self._print(self._colorize(event.data, Style.BRIGHT, Fore.CYAN))
             else:
-                print(self._colorize(json.dumps(event.data, indent=2, ensure_ascii=False), Style.BRIGHT, Fore.CYAN))
-        print(f"{separator}\n")
+                self._print(self._colorize(json.dumps(event.data, indent=2, ensure_ascii=False), Style.BRIGHT, Fore.CYAN))
+        self._print(f"{separator}\n")
         return None
     
     def on_reasoning(self, event: ReasoningEvent) -> None:
         """Print reasoning text with different color on start (only on first chunk to avoid inserting chars between tokens)"""
         if not self.current_reasoning_active:
             self.current_reasoning_active = True
-            print(self._colorize(f"💭 {event.data}", Fore.MAGENTA), end="", flush=True)
+            self._print(self._colorize(f"💭 {event.data}", Fore.MAGENTA), end="", flush=True)
         else:
-            print(self._colorize(event.data, Fore.MAGENTA), end="", flush=True)
+            self._print(self._colorize(event.data, Fore.MAGENTA), end="", flush=True)
         return None
     
     def on_lifecycle(self, event: LifecycleEvent) -> None:
@@ -223,7 +257,7 @@ class TerminalStreamRenderer(BaseStreamRenderer):
     def on_multiagent_node_start(self, event: MultiAgentNodeStartEvent) -> None:
         """Print multi-agent node start"""
         message = f"Node [{event.node_id}] ({event.node_type}) starting"
-        print(f"\n{self._colorize(f'🔄 {message}', Fore.CYAN)}")
+        self._print(f"\n{self._colorize(f'🔄 {message}', Fore.CYAN)}")
         return None
     
     def on_multiagent_node_stream(self, event: MultiAgentNodeStreamEvent) -> list[Any]:
@@ -239,7 +273,7 @@ class TerminalStreamRenderer(BaseStreamRenderer):
             message = f"Node [{event.node_id}] completed in {exec_time} ms"
         else:
             message = f"Node [{event.node_id}] completed"
-        print(f"\n{self._colorize(f'✅ {message}', Fore.GREEN)}")
+        self._print(f"\n{self._colorize(f'✅ {message}', Fore.GREEN)}")
         return None
     
     def on_multiagent_handoff(self, event: MultiAgentHandoffEvent) -> None:
@@ -247,9 +281,9 @@ class TerminalStreamRenderer(BaseStreamRenderer):
         from_nodes = ", ".join(event.from_node_ids)
         to_nodes = ", ".join(event.to_node_ids)
         message = f"Handoff: {from_nodes} → {to_nodes}"
-        print(f"\n{self._colorize(f'🔀 {message}', Fore.MAGENTA)}")
+        self._print(f"\n{self._colorize(f'🔀 {message}', Fore.MAGENTA)}")
         if event.message:
-            print(self._colorize(f"   Message: {event.message}", Fore.MAGENTA))
+            self._print(self._colorize(f"   Message: {event.message}", Fore.MAGENTA))
         return None
     
     def on_multiagent_result(self, event: MultiAgentResultEvent) -> None:
@@ -259,7 +293,7 @@ class TerminalStreamRenderer(BaseStreamRenderer):
             message = f"Multi-agent completed: {result.status}"
         else:
             message = "Multi-agent completed"
-        print(f"\n{self._colorize(f'📊 {message}', Fore.GREEN)}")
+        self._print(f"\n{self._colorize(f'📊 {message}', Fore.GREEN)}")
         return None
     
     def reset(self):
@@ -267,6 +301,7 @@ class TerminalStreamRenderer(BaseStreamRenderer):
         super().reset()
         self.tool_call_counter = 0
         self.displayed_tool_calls.clear()
+        self.streamed_tool_inputs.clear()
         self.current_text_source = None
         self.current_reasoning_active = False
 
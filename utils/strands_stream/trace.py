@@ -0,0 +1,213 @@
+"""Record and replay raw Strands stream events
+
+TraceRecorder appends the raw events of Agent.stream_async (including the
+sub-agent events use_skill forwards as tool_stream_event) to a trace file;
+replay() feeds them back at the recorded pace or at full speed, so the parser
+and renderers can be benchmarked without a live Bedrock stream
+(benchmarks/bench_replay.py, traces in benchmarks/traces/).
+
+File format: MessagePack records appended one after another (see wire.packb):
+    {"format": "strands-stream-trace", "version": 1, "meta": {...}}   header
+    [delay_us, event]                                                 one per event
+delay_us is the time since the previous record. Appending to an existing file
+starts a new segment with its own header. Events are stored without the SDK's
+invocation-state keys (agent, model, spans, messages, ...), which the parser
+does not read; other objects are dropped, except results, which keep the shape
+SSEStreamRenderer sends (public attributes as strings).
+
+Usage:
+    >>> async for event in trace_stream(agent.stream_async(prompt), session_id):
+    ...     yield event  # recorded when STREAM_TRACE_DIR is set
+    >>> header, records = read_trace("benchmarks/traces/pptx_skill.trace")
+    >>> async for event in replay(records, speed=1.0):  # speed=None: no delays
+    ...     renderer.process(event)
+
+Configuration (environment):
+    STREAM_TRACE_DIR: Directory for traces of every invocation (unset: no recording)
+"""
+
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterable
+
+from ..sandbox import _SAFE_SESSION_ID
+from .renderers.sse import _to_jsonable
+from .wire import Unpacker, packb
+
+TRACE_FORMAT = "strands-stream-trace"
+TRACE_VERSION = 1
+
+# Keys the SDK merges into callback events from the invocation state
+INVOCATION_STATE_KEYS = frozenset({
+    "agent",
+    "event_loop_cycle_id",
+    "event_loop_cycle_span",
+    "event_loop_cycle_trace",
+    "event_loop_parent_cycle_id",
+    "event_loop_parent_span",
+    "messages",
+    "model",
+    "request_state",
+    "system_prompt",
+    "tool_config",
+})
+
+# Keys whose objects are kept in serialized form (lifecycle and node results)
+_RESULT_KEYS = frozenset({"result", "node_result"})
+
+_DROP = object()
+
+
+def _sanitize(value: Any, key: Any = None) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool, bytes)):
+        return value
+    if isinstance(value, dict):
+        result = {}
+        for k, v in value.items():
+            if k in INVOCATION_STATE_KEYS:
+                continue
+            v = _sanitize(v, k)
+            if v is not _DROP:
+                result[k] = v
+        return result
+    if isinstance(value, (list, tuple)):
+        return [item for item in (_sanitize(item) for item in value) if item is not _DROP]
+    if key in _RESULT_KEYS:
+        return _to_jsonable(value)
+    return _DROP
+
+
+def sanitize_event(event: dict) -> dict:
+    """Serializable copy of a raw stream event (see the module docstring)"""
+    return _sanitize(event)
+
+
+class TraceRecorder:
+    """Appends raw stream events to a trace file"""
+
+    def __init__(self, path: str | Path, meta: dict | None = None):
+        """
+        Args:
+            path: Trace file (created, or appended to as a new segment)
+            meta: Free-form header data (e.g. profile, model id)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "ab")
+        self._file.write(packb({"format": TRACE_FORMAT, "version": TRACE_VERSION, "meta": meta or {}}))
+        self._last = time.perf_counter()
+        self.events = 0
+
+    def record(self, event: dict) -> None:
+        now = time.perf_counter()
+        delay_us = int((now - self._last) * 1_000_000)
+        self._last = now
+        self._file.write(packb([delay_us, sanitize_event(event)]))
+        self.events += 1
+
+    async def track(self, source: AsyncIterator[dict]) -> AsyncIterator[dict]:
+        """Pass `source` through, recording every event
+
+        The file is closed when `source` ends; close the returned generator
+        (aclose) when the consumer stops early.
+        """
+        try:
+            async for event in source:
+                self.record(event)
+                yield event
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> "TraceRecorder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def read_trace(path: str | Path) -> tuple[dict, list[tuple[float, dict]]]:
+    """Header of the first segment and all (delay seconds, event) records
+
+    A record cut off at the end of the file (e.g. by a crash) is ignored.
+
+    Raises:
+        ValueError: If the file is not a trace
+    """
+    unpacker = Unpacker()
+    with open(path, "rb") as f:
+        unpacker.feed(f.read())
+    header = None
+    records = []
+    for item in unpacker:
+        if isinstance(item, dict):
+            if item.get("format") != TRACE_FORMAT:
+                raise ValueError(f"{path} is not a stream trace")
+            header = header or item
+        elif header is None:
+            raise ValueError(f"{path} is not a stream trace")
+        else:
+            delay_us, event = item
+            records.append((delay_us / 1_000_000, event))
+    if header is None:
+        raise ValueError(f"{path} is not a stream trace")
+    return header, records
+
+
+async def replay(
+    records: str | Path | Iterable[tuple[float, dict]],
+    speed: float | None = 1.0,
+) -> AsyncIterator[dict]:
+    """Yield recorded events, paced like the original stream
+
+    Args:
+        records: Trace file or records from read_trace
+        speed: Playback speed (2.0: twice as fast); None or 0 yields without delays
+    """
+    if isinstance(records, (str, Path)):
+        _, records = read_trace(records)
+    # Sleep against the recorded timeline, so time spent by the consumer is not added up
+    start = time.perf_counter()
+    offset = 0.0
+    for delay, event in records:
+        if speed:
+            offset += delay / speed
+            wait = start + offset - time.perf_counter()
+            if wait > 0:
+                await asyncio.sleep(wait)
+        yield event
+
+
+def trace_stream(source: AsyncIterator[dict], name: str | None = None, **meta: Any) -> AsyncIterator[dict]:
+    """Record `source` into STREAM_TRACE_DIR (returns `source` itself when it is not set)
+
+    Args:
+        source: Raw events (e.g. Agent.stream_async)
+        name: File name prefix (e.g. the session id; characters other than
+            letters, digits, "_" and "-" are replaced)
+        **meta: Header data
+    """
+    if not STREAM_TRACE_DIR:
+        return source
+    prefix = _SAFE_SESSION_ID.sub("_", name) if name else "invocation"
+    path = Path(STREAM_TRACE_DIR) / f"{prefix}-{time.time_ns()}.trace"
+    return TraceRecorder(path, meta).track(source)
+
+
+STREAM_TRACE_DIR = os.environ.get("STREAM_TRACE_DIR")
+
+
+__all__ = [
+    "INVOCATION_STATE_KEYS",
+    "STREAM_TRACE_DIR",
+    "TraceRecorder",
+    "read_trace",
+    "replay",
+    "sanitize_event",
+    "trace_stream",
+]
@@ -0,0 +1,293 @@
+"""Compact binary wire format for stream events (MessagePack)
+
+Each event is one MessagePack array: a numeric event code followed by the
+event's fields in a fixed order, with trailing None fields dropped.
+Frequently repeated strings (tool names, tool ids, sources, lifecycle types,
+node ids) are interned per stream: the first occurrence is sent once as a
+STRING definition, after which the field carries the string's index. A field
+holding an int is a reference, a str is inline (the table is capped).
+
+Messages are self-delimiting, so a stream is simply their concatenation; any
+MessagePack library can read it. CompactStreamDecoder is the reference decoder
+and turns messages back into the same payload dicts SSEStreamRenderer sends.
+msgpack is used when installed, otherwise a pure-Python codec for the subset
+of types the renderer emits.
+
+Usage:
+    >>> renderer = CompactStreamRenderer()
+    >>> async for chunk in renderer.aprocess(agent.stream_async(prompt)):
+    ...     await websocket.send_bytes(chunk)
+    >>> decoder = CompactStreamDecoder()  # one per stream (client side)
+    >>> for payload in decoder.feed(chunk):
+    ...     print(payload["type"])
+"""
+
+import struct
+from typing import Any, Callable, Iterator
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# Event codes: code -> (payload type, field names)
+STRING = 31  # String definition: [31, value]; indexes count up from 0 per stream
+EVENT_FIELDS: dict[int, tuple[str, tuple[str, ...]]] = {
+    0: ("text", ("data", "source")),
+    1: ("current_tool_use", ("tool_name", "tool_id", "tool_input", "source")),
+    2: ("tool_input_delta", ("tool_name", "tool_id", "delta", "offset", "checksum", "source")),
+    3: ("tool_result", ("tool_name", "tool_id", "data", "metadata", "source")),
+    4: ("tool_stream_event", ("tool_use", "data")),
+    5: ("reasoning", ("data", "metadata")),
+    6: ("lifecycle", ("lifecycle_type", "message", "force_stop_reason", "result")),
+    7: ("multiagent_node_start", ("node_id", "node_type")),
+    8: ("multiagent_node_stop", ("node_id", "node_result")),
+    9: ("multiagent_handoff", ("from_node_ids", "to_node_ids", "message")),
+    10: ("multiagent_result", ("result",)),
+}
+EVENT_CODES = {event_type: code for code, (event_type, _) in EVENT_FIELDS.items()}
+
+# Fields whose string values are interned
+INTERNED_FIELDS = frozenset({"tool_name", "tool_id", "source", "lifecycle_type", "node_id", "node_type"})
+
+
+class _Incomplete(Exception):
+    """The buffer ends inside a message"""
+
+
+def _pack(obj: Any, out: bytearray, default: Callable[[Any], Any] | None) -> None:
+    if obj is None:
+        out.append(0xC0)
+    elif obj is True:
+        out.append(0xC3)
+    elif obj is False:
+        out.append(0xC2)
+    elif isinstance(obj, int):
+        if 0 <= obj < 0x80:
+            out.append(obj)
+        elif -0x20 <= obj < 0:
+            out.append(obj & 0xFF)
+        elif 0 <= obj <= 0xFF:
+            out += struct.pack(">BB", 0xCC, obj)
+        elif 0 <= obj <= 0xFFFF:
+            out += struct.pack(">BH", 0xCD, obj)
+        elif 0 <= obj <= 0xFFFFFFFF:
+            out += struct.pack(">BI", 0xCE, obj)
+        elif obj > 0:
+            out += struct.pack(">BQ", 0xCF, obj)
+        elif obj >= -0x80:
+            out += struct.pack(">Bb", 0xD0, obj)
+        elif obj >= -0x8000:
+            out += struct.pack(">Bh", 0xD1, obj)
+        elif obj >= -0x80000000:
+            out += struct.pack(">Bi", 0xD2, obj)
+        else:
+            out += struct.pack(">Bq", 0xD3, obj)
+    elif isinstance(obj, str):
+        data = obj.encode("utf-8")
+        n = len(data)
+        if n < 32:
+            out.append(0xA0 | n)
+        elif n <= 0xFF:
+            out += struct.pack(">BB", 0xD9, n)
+        elif n <= 0xFFFF:
+            out += struct.pack(">BH", 0xDA, n)
+        else:
+            out += struct.pack(">BI", 0xDB, n)
+        out += data
+    elif isinstance(obj, float):
+        out += struct.pack(">Bd", 0xCB, obj)
+    elif isinstance(obj, (list, tuple)):
+        n = len(obj)
+        if n < 16:
+            out.append(0x90 | n)
+        elif n <= 0xFFFF:
+            out += struct.pack(">BH", 0xDC, n)
+        else:
+            out += struct.pack(">BI", 0xDD, n)
+        for item in obj:
+            _pack(item, out, default)
+    elif isinstance(obj, dict):
+        n = len(obj)
+        if n < 16:
+            out.append(0x80 | n)
+        elif n <= 0xFFFF:
+            out += struct.pack(">BH", 0xDE, n)
+        else:
+            out += struct.pack(">BI", 0xDF, n)
+        for key, value in obj.items():
+            _pack(key, out, default)
+            _pack(value, out, default)
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        data = bytes(obj)
+        n = len(data)
+        if n <= 0xFF:
+            out += struct.pack(">BB", 0xC4, n)
+        elif n <= 0xFFFF:
+            out += struct.pack(">BH", 0xC5, n)
+        else:
+            out += struct.pack(">BI", 0xC6, n)
+        out += data
+    elif default is not None:
+        _pack(default(obj), out, None)
+    else:
+        raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+
+# Fixed-size headers: first byte -> (struct format, size)
+_SCALARS = {
+    0xCA: (">f", 4), 0xCB: (">d", 8),
+    0xCC: (">B", 1), 0xCD: (">H", 2), 0xCE: (">I", 4), 0xCF: (">Q", 8),
+    0xD0: (">b", 1), 0xD1: (">h", 2), 0xD2: (">i", 4), 0xD3: (">q", 8),
+}
+_LENGTHS = {
+    0xC4: (">B", 1, "bin"), 0xC5: (">H", 2, "bin"), 0xC6: (">I", 4, "bin"),
+    0xD9: (">B", 1, "str"), 0xDA: (">H", 2, "str"), 0xDB: (">I", 4, "str"),
+    0xDC: (">H", 2, "array"), 0xDD: (">I", 4, "array"),
+    0xDE: (">H", 2, "map"), 0xDF: (">I", 4, "map"),
+}
+
+
+def _unpack(data: bytes, pos: int) -> tuple[Any, int]:
+    if pos >= len(data):
+        raise _Incomplete
+    head = data[pos]
+    pos += 1
+    if head < 0x80:
+        return head, pos
+    if head >= 0xE0:
+        return head - 0x100, pos
+    if 0xA0 <= head <= 0xBF:
+        kind, n = "str", head & 0x1F
+    elif 0x90 <= head <= 0x9F:
+        kind, n = "array", head & 0x0F
+    elif 0x80 <= head <= 0x8F:
+        kind, n = "map", head & 0x0F
+    elif head == 0xC0:
+        return None, pos
+    elif head == 0xC2:
+        return False, pos
+    elif head == 0xC3:
+        return True, pos
+    elif head in _SCALARS:
+        fmt, size = _SCALARS[head]
+        if pos + size > len(data):
+            raise _Incomplete
+        return struct.unpack_from(fmt, data, pos)[0], pos + size
+    elif head in _LENGTHS:
+        fmt, size, kind = _LENGTHS[head]
+        if pos + size > len(data):
+            raise _Incomplete
+        n = struct.unpack_from(fmt, data, pos)[0]
+        pos += size
+    else:
+        raise ValueError(f"Unsupported MessagePack type 0x{head:02x}")
+
+    if kind in ("str", "bin"):
+        if pos + n > len(data):
+            raise _Incomplete
+        raw = data[pos:pos + n]
+        return (raw.decode("utf-8") if kind == "str" else bytes(raw)), pos + n
+    if kind == "array":
+        items = []
+        for _ in range(n):
+            item, pos = _unpack(data, pos)
+            items.append(item)
+        return items, pos
+    result = {}
+    for _ in range(n):
+        key, pos = _unpack(data, pos)
+        result[key], pos = _unpack(data, pos)
+    return result, pos
+
+
+def packb(obj: Any, default: Callable[[Any], Any] | None = None) -> bytes:
+    """Encode one object as MessagePack (default converts unsupported objects)"""
+    if MSGPACK_AVAILABLE:
+        return msgpack.packb(obj, default=default, use_bin_type=True)
+    out = bytearray()
+    _pack(obj, out, default)
+    return bytes(out)
+
+
+class Unpacker:
+    """Incremental MessagePack reader: feed() bytes, iterate complete objects"""
+
+    def __init__(self):
+        if MSGPACK_AVAILABLE:
+            self._unpacker = msgpack.Unpacker(raw=False, strict_map_key=False)
+        else:
+            self._buffer = b""
+
+    def feed(self, data: bytes) -> None:
+        if MSGPACK_AVAILABLE:
+            self._unpacker.feed(data)
+        else:
+            self._buffer += data
+
+    def __iter__(self) -> Iterator[Any]:
+        if MSGPACK_AVAILABLE:
+            yield from self._unpacker
+            return
+        pos = 0
+        try:
+            while pos < len(self._buffer):
+                obj, pos = _unpack(self._buffer, pos)
+                yield obj
+        except _Incomplete:
+            pass
+        finally:
+            self._buffer = self._buffer[pos:]
+
+
+class CompactStreamDecoder:
+    """Reference decoder: compact stream bytes -> SSEStreamRenderer payload dicts
+
+    Use one decoder per stream (the string table is per stream). Fields dropped
+    from the end of a message decode as None; "source" is only set for
+    sub-agent events, as in the SSE payloads.
+    """
+
+    def __init__(self):
+        self.strings: list[str] = []
+        self._unpacker = Unpacker()
+
+    def feed(self, data: bytes) -> list[dict]:
+        """Decode the complete messages in data (a partial message is kept for the next call)"""
+        self._unpacker.feed(data)
+        payloads = []
+        for message in self._unpacker:
+            payload = self.decode_message(message)
+            if payload is not None:
+                payloads.append(payload)
+        return payloads
+
+    def decode_message(self, message: list) -> dict | None:
+        code = message[0]
+        if code == STRING:
+            self.strings.append(message[1])
+            return None
+        event_type, fields = EVENT_FIELDS[code]
+        payload = {"type": event_type}
+        values = message[1:]
+        for index, name in enumerate(fields):
+            value = values[index] if index < len(values) else None
+            if name in INTERNED_FIELDS and isinstance(value, int):
+                value = self.strings[value]
+            if name == "source" and not value:
+                continue
+            payload[name] = value
+        return payload
+
+
+__all__ = [
+    "CompactStreamDecoder",
+    "EVENT_CODES",
+    "EVENT_FIELDS",
+    "INTERNED_FIELDS",
+    "MSGPACK_AVAILABLE",
+    "STRING",
+    "Unpacker",
+    "packb",
+]
@@ -0,0 +1,181 @@
+"""Structured, low-overhead tool telemetry
+
+Tools record one span per invocation (tool name, duration, bytes in/out, exit
+code, S3 latency, status) instead of printing several flushed log lines. Spans
+go into an in-memory ring buffer; successful spans are sampled, failures are
+always kept. Buffered spans are exported in batches as JSON lines to stdout
+through the ``strands_agent.telemetry.spans`` logger (or a custom exporter).
+That logger has its own stdout handler, so the lines reach the container log
+without any logging configuration in the entrypoints.
+
+Usage:
+    >>> from utils.telemetry import TELEMETRY
+    >>> with TELEMETRY.span("upload_to_s3", bytes_in=size) as span:
+    ...     span.s3_latency_ms = ...
+
+Configuration (environment):
+    TELEMETRY_SAMPLE_RATE: Fraction of successful spans kept (default 1.0)
+    TELEMETRY_BUFFER_SIZE: Ring buffer capacity (default 1024)
+    TELEMETRY_BATCH_SIZE: Spans per exported batch (default 50)
+"""
+
+import atexit
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Iterator
+
+logger = logging.getLogger("strands_agent.telemetry")
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """Stream handler writing to the current sys.stdout (looked up per record)"""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def stdout_logger(name: str) -> logging.Logger:
+    """Return a logger that writes its INFO records to stdout as bare lines
+
+    The logger does not propagate, so the output neither depends on nor is
+    duplicated by the application's logging configuration.
+    """
+    named = logging.getLogger(name)
+    if not any(isinstance(handler, _StdoutHandler) for handler in named.handlers):
+        named.addHandler(_StdoutHandler())
+    named.setLevel(logging.INFO)
+    named.propagate = False
+    return named
+
+
+span_logger = stdout_logger("strands_agent.telemetry.spans")
+
+
+@dataclass(slots=True)
+class ToolSpan:
+    """One tool invocation"""
+
+    tool: str
+    start_time: float
+    duration_ms: float = 0.0
+    status: str = "ok"  # ok, error, timeout, cancelled
+    bytes_in: int = 0
+    bytes_out: int = 0
+    exit_code: int | None = None
+    s3_latency_ms: float | None = None
+    error: str | None = None
+    attributes: dict = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary, excluding empty values"""
+        return {k: v for k, v in asdict(self).items() if v not in (None, {})}
+
+
+def _log_exporter(batch: list[ToolSpan]) -> None:
+    """Default exporter: one log record per batch, one JSON line per span"""
+    if span_logger.isEnabledFor(logging.INFO):
+        span_logger.info("\n".join(json.dumps(span.to_dict(), ensure_ascii=False, default=str) for span in batch))
+
+
+class TelemetryRecorder:
+    """Ring buffer of tool spans with sampling and batched export"""
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        buffer_size: int = 1024,
+        batch_size: int = 50,
+        exporter: Callable[[list[ToolSpan]], None] | None = None,
+    ):
+        self.sample_rate = sample_rate
+        self.batch_size = batch_size
+        self.exporter = exporter or _log_exporter
+        self.dropped = 0  # Spans overwritten before export
+        self._buffer: deque[ToolSpan] = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, tool: str, **attributes) -> Iterator[ToolSpan]:
+        """Time the enclosed block and record it as a span
+
+        Keyword arguments matching ToolSpan fields are set on the span, anything
+        else goes into span.attributes. Exceptions mark the span as an error and
+        are re-raised.
+        """
+        span = ToolSpan(tool=tool, start_time=time.time())
+        for key, value in attributes.items():
+            if key in ToolSpan.__dataclass_fields__:
+                setattr(span, key, value)
+            else:
+                span.attributes[key] = value
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.error = span.error or f"{type(e).__name__}: {e}"[:500]
+            raise
+        finally:
+            span.duration_ms = (time.perf_counter() - started) * 1000
+            self.record(span)
+
+    def record(self, span: ToolSpan) -> None:
+        """Add a finished span to the buffer (subject to sampling)"""
+        if span.status == "ok" and self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        batch = None
+        with self._lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1
+            self._buffer.append(span)
+            if len(self._buffer) >= self.batch_size:
+                batch = self._drain_locked()
+        if batch:
+            self._export(batch)
+
+    def flush(self) -> None:
+        """Export everything currently buffered"""
+        with self._lock:
+            batch = self._drain_locked()
+        if batch:
+            self._export(batch)
+
+    def snapshot(self) -> list[ToolSpan]:
+        """Return buffered spans without removing them"""
+        with self._lock:
+            return list(self._buffer)
+
+    def _drain_locked(self) -> list[ToolSpan]:
+        batch = list(self._buffer)
+        self._buffer.clear()
+        return batch
+
+    def _export(self, batch: list[ToolSpan]) -> None:
+        try:
+            self.exporter(batch)
+        except Exception:
+            logger.debug("Telemetry export failed", exc_info=True)
+
+
+TELEMETRY = TelemetryRecorder(
+    sample_rate=float(os.environ.get("TELEMETRY_SAMPLE_RATE", "1.0")),
+    buffer_size=int(os.environ.get("TELEMETRY_BUFFER_SIZE", "1024")),
+    batch_size=int(os.environ.get("TELEMETRY_BATCH_SIZE", "50")),
+)
+atexit.register(TELEMETRY.flush)
+
+
+__all__ = ["ToolSpan", "TelemetryRecorder", "TELEMETRY", "stdout_logger"]
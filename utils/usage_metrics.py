@@ -0,0 +1,319 @@
+"""Token, latency and cost accounting per invocation and per skill
+
+UsageCollector watches the strands event stream of one invocation and adds up
+model token usage (input, output, cache read / write), model latency and tool
+time. Events of skill sub-agents, which use_skill forwards as tool stream
+events, go into a nested collector per skill, so the summary shows which skills
+drive the Bedrock bill and the response time. The entrypoints send the summary
+as the final {"usage_summary": ...} event and add it to process-wide counters
+(USAGE_METRICS) exposed in Prometheus text format and as CloudWatch EMF lines
+written to stdout (through the ``strands_agent.usage.emf`` logger, which has its
+own stdout handler).
+
+Usage:
+    >>> usage = UsageCollector()
+    >>> async for event in usage.track(agent.stream_async(prompt)):
+    ...     yield event
+    >>> USAGE_METRICS.record(usage, profile="pptx", model=model_id)
+    >>> yield {"usage_summary": usage.summary(model_id)}
+
+Configuration (environment):
+    USAGE_PRICES: JSON of USD prices per 1M tokens by model id, e.g.
+        {"<model id>": {"input": 3.0, "output": 15.0, "cache_read": 0.3, "cache_write": 3.75}};
+        summaries include cost_usd for listed models (skills are priced with the
+        invocation's model)
+    USAGE_EMF_NAMESPACE: CloudWatch namespace of the EMF lines, empty to disable
+        (default StrandsAgent)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from .telemetry import stdout_logger
+
+emf_logger = stdout_logger("strands_agent.usage.emf")
+
+# Bedrock usage keys -> Usage fields
+_TOKEN_FIELDS = {
+    "inputTokens": "input_tokens",
+    "outputTokens": "output_tokens",
+    "cacheReadInputTokens": "cache_read_tokens",
+    "cacheWriteInputTokens": "cache_write_tokens",
+}
+
+_PRICE_KEYS = {"input": "input_tokens", "output": "output_tokens", "cache_read": "cache_read_tokens", "cache_write": "cache_write_tokens"}
+
+
+@dataclass(slots=True)
+class Usage:
+    """Model usage summed over model calls"""
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    model_calls: int = 0
+    model_latency_ms: float = 0.0
+
+    def add_metadata(self, metadata: dict) -> None:
+        """Add the metadata event of one model call"""
+        usage = metadata.get("usage") or {}
+        for key, name in _TOKEN_FIELDS.items():
+            setattr(self, name, getattr(self, name) + (usage.get(key) or 0))
+        self.model_calls += 1
+        self.model_latency_ms += (metadata.get("metrics") or {}).get("latencyMs") or 0
+
+    def add(self, other: "Usage") -> None:
+        for name in self.__slots__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        """Share of prompt tokens served from the prompt cache"""
+        prompt = self.input_tokens + self.cache_read_tokens + self.cache_write_tokens
+        return self.cache_read_tokens / prompt if prompt else 0.0
+
+    def cost_usd(self, prices: dict[str, float]) -> float:
+        """Cost for prices in USD per 1M tokens ("input", "output", "cache_read", "cache_write")"""
+        return sum(getattr(self, name) * prices.get(key, 0.0) for key, name in _PRICE_KEYS.items()) / 1e6
+
+    def to_dict(self) -> dict:
+        return {
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cache_read_tokens": self.cache_read_tokens,
+            "cache_write_tokens": self.cache_write_tokens,
+            "cache_hit_ratio": round(self.cache_hit_ratio, 4),
+            "model_calls": self.model_calls,
+            "model_latency_ms": round(self.model_latency_ms, 1),
+        }
+
+
+@dataclass(slots=True)
+class ToolUsage:
+    """Calls and wall time of one tool"""
+
+    calls: int = 0
+    errors: int = 0
+    time_ms: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {"calls": self.calls, "errors": self.errors, "time_ms": round(self.time_ms, 1)}
+
+
+class UsageCollector:
+    """Usage of one agent invocation, built from its strands event stream"""
+
+    def __init__(self):
+        self.model = Usage()  # This agent's own model calls
+        self.tools: dict[str, ToolUsage] = defaultdict(ToolUsage)
+        self.skills: dict[str, UsageCollector] = {}  # Sub-agents run by use_skill
+        self.started = time.perf_counter()
+        self._running: dict[str, tuple[str, float]] = {}  # toolUseId -> (name, start)
+
+    def observe(self, event: dict) -> None:
+        """Account one event of Agent.stream_async"""
+        if "event" in event:
+            metadata = event["event"].get("metadata")
+            if metadata:
+                self.model.add_metadata(metadata)
+        elif "tool_stream_event" in event:
+            data = event["tool_stream_event"].get("data")
+            if isinstance(data, dict) and "skill_name" in data and isinstance(data.get("event"), dict):
+                skill = self.skills.get(data["skill_name"])
+                if skill is None:
+                    skill = self.skills[data["skill_name"]] = UsageCollector()
+                skill.observe(data["event"])
+        elif "message" in event:
+            self._observe_message(event["message"])
+
+    def _observe_message(self, message: dict) -> None:
+        # Tools start once the assistant message requesting them is complete and
+        # finish with the tool result message (concurrent tools share its arrival time)
+        now = time.perf_counter()
+        for block in message.get("content", []):
+            if "toolUse" in block:
+                tool_use = block["toolUse"]
+                self._running[tool_use["toolUseId"]] = (tool_use["name"], now)
+            elif "toolResult" in block:
+                result = block["toolResult"]
+                name, started = self._running.pop(result.get("toolUseId"), (None, now))
+                if name is None:
+                    continue
+                usage = self.tools[name]
+                usage.calls += 1
+                usage.time_ms += (now - started) * 1000
+                if result.get("status") == "error":
+                    usage.errors += 1
+
+    async def track(self, source: AsyncIterator[dict]) -> AsyncIterator[dict]:
+        """Pass `source` through, observing every event"""
+        async for event in source:
+            self.observe(event)
+            yield event
+
+    def total(self) -> Usage:
+        """Model usage including all skill sub-agents"""
+        total = Usage()
+        total.add(self.model)
+        for skill in self.skills.values():
+            total.add(skill.total())
+        return total
+
+    def summary(self, model_id: str | None = None, prices: dict[str, dict] | None = None) -> dict:
+        """JSON-serializable summary (the final usage_summary event)
+
+        Args:
+            model_id: Model of the invocation (used to look up prices)
+            prices: Prices by model id, defaults to USAGE_PRICES
+        """
+        prices = USAGE_PRICES if prices is None else prices
+        price = prices.get(model_id) if model_id else None
+        total = self.total()
+        summary = {
+            **total.to_dict(),
+            "tool_time_ms": round(sum(tool.time_ms for tool in self.tools.values()), 1),
+            "duration_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "tools": {name: tool.to_dict() for name, tool in self.tools.items()},
+        }
+        if price:
+            summary["cost_usd"] = round(total.cost_usd(price), 6)
+        if self.skills:
+            summary["skills"] = {}
+            for name, skill in self.skills.items():
+                skill_total = skill.total()
+                entry = {**skill_total.to_dict(), "tools": {n: t.to_dict() for n, t in skill.tools.items()}}
+                if price:
+                    entry["cost_usd"] = round(skill_total.cost_usd(price), 6)
+                summary["skills"][name] = entry
+        return summary
+
+
+class UsageMetrics:
+    """Process-wide usage counters in Prometheus text format and CloudWatch EMF"""
+
+    def __init__(self, namespace: str = "StrandsAgent"):
+        """
+        Args:
+            namespace: CloudWatch namespace of the EMF lines ("" disables EMF)
+        """
+        self.namespace = namespace
+        self._counters: dict[tuple[str, tuple], float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def record(self, collector: UsageCollector, **labels: str) -> None:
+        """Add an invocation's usage to the counters (and log it as EMF)
+
+        Args:
+            collector: Usage of the finished invocation
+            **labels: Invocation labels, e.g. profile and model
+        """
+        rows = [(labels, collector.model, collector.tools)]
+        rows += [({**labels, "skill": name}, skill.total(), skill.tools) for name, skill in collector.skills.items()]
+        with self._lock:
+            self._counters[("agent_invocations_total", tuple(sorted(labels.items())))] += 1
+            for row_labels, usage, tools in rows:
+                key = tuple(sorted(row_labels.items()))
+                for name in _TOKEN_FIELDS.values():
+                    kind = name.removesuffix("_tokens")
+                    self._counters[("agent_tokens_total", key + (("type", kind),))] += getattr(usage, name)
+                self._counters[("agent_model_calls_total", key)] += usage.model_calls
+                self._counters[("agent_model_latency_seconds_total", key)] += usage.model_latency_ms / 1000
+                for tool, tool_usage in tools.items():
+                    tool_key = key + (("tool", tool),)
+                    self._counters[("agent_tool_calls_total", tool_key)] += tool_usage.calls
+                    self._counters[("agent_tool_errors_total", tool_key)] += tool_usage.errors
+                    self._counters[("agent_tool_seconds_total", tool_key)] += tool_usage.time_ms / 1000
+        if self.namespace and emf_logger.isEnabledFor(logging.INFO):
+            emf_logger.info(json.dumps(self.emf(collector, **labels), ensure_ascii=False))
+
+    def emf(self, collector: UsageCollector, **labels: str) -> dict:
+        """CloudWatch Embedded Metric Format record of one invocation"""
+        total = collector.total()
+        metrics = {
+            "InputTokens": (total.input_tokens, "Count"),
+            "OutputTokens": (total.output_tokens, "Count"),
+            "CacheReadTokens": (total.cache_read_tokens, "Count"),
+            "CacheWriteTokens": (total.cache_write_tokens, "Count"),
+            "CacheHitRatio": (total.cache_hit_ratio, "None"),
+            "ModelLatency": (total.model_latency_ms, "Milliseconds"),
+            "ToolTime": (sum(tool.time_ms for tool in collector.tools.values()), "Milliseconds"),
+        }
+        return {
+            "_aws": {
+                "Timestamp": int(time.time() * 1000),
+                "CloudWatchMetrics": [
+                    {
+                        "Namespace": self.namespace,
+                        "Dimensions": [sorted(labels)],
+                        "Metrics": [{"Name": name, "Unit": unit} for name, (_, unit) in metrics.items()],
+                    }
+                ],
+            },
+            **labels,
+            **{name: value for name, (value, _) in metrics.items()},
+            "skills": sorted(collector.skills),
+        }
+
+    def prometheus(self) -> str:
+        """Counters in Prometheus text exposition format"""
+        with self._lock:
+            items = sorted(self._counters.items())
+        lines = []
+        current = None
+        for (metric, labels), value in items:
+            if metric != current:
+                lines.append(f"# TYPE {metric} counter")
+                current = metric
+            rendered = ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels)
+            lines.append(f"{metric}{{{rendered}}} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+async def metrics_endpoint(request: Any) -> Any:
+    """Starlette endpoint serving USAGE_METRICS (e.g. app.add_route("/metrics", metrics_endpoint))"""
+    from starlette.responses import PlainTextResponse
+
+    return PlainTextResponse(USAGE_METRICS.prometheus(), media_type="text/plain; version=0.0.4")
+
+
+def prometheus_endpoint(*sources: Callable[[], str]) -> Callable[[Any], Awaitable[Any]]:
+    """Starlette endpoint serving the Prometheus text of several sources on one route
+
+    Example:
+        >>> app.add_route("/metrics", prometheus_endpoint(USAGE_METRICS.prometheus, ADMISSION.prometheus))
+    """
+
+    async def endpoint(request: Any) -> Any:
+        from starlette.responses import PlainTextResponse
+
+        return PlainTextResponse("".join(source() for source in sources), media_type="text/plain; version=0.0.4")
+
+    return endpoint
+
+
+USAGE_PRICES: dict[str, dict] = json.loads(os.environ.get("USAGE_PRICES") or "{}")
+
+USAGE_METRICS = UsageMetrics(namespace=os.environ.get("USAGE_EMF_NAMESPACE", "StrandsAgent"))
+
+
+__all__ = [
+    "Usage",
+    "ToolUsage",
+    "UsageCollector",
+    "UsageMetrics",
+    "USAGE_METRICS",
+    "USAGE_PRICES",
+    "metrics_endpoint",
+    "prometheus_endpoint",
+]
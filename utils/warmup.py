@@ -0,0 +1,253 @@
+"""Background warm-up of the AgentCore container at startup
+
+The first invocation after a cold start used to pay for importing strands and
+building the agent, boto3 credential resolution, the Bedrock client's TLS
+handshake, skill discovery and loading python-pptx / pptxgenjs. WarmupPhase runs
+such tasks concurrently in the background as soon as the server starts and
+exposes a readiness signal the entrypoint waits on, so the first request sees
+steady-state latency.
+
+Usage:
+    >>> from utils.warmup import WARMUP
+    >>> WARMUP.add("agent", lambda: warm_agent(AGENT_POOL, (DEFAULT_PROFILE, DEFAULT_MODEL_ID)))
+    >>> WARMUP.add("pptx_workers", start_pptx_workers, on_shutdown=stop_pptx_workers)
+    >>> app = BedrockAgentCoreApp(lifespan=WARMUP.lifespan)
+    ...
+    >>> await WARMUP.wait_ready()  # in the entrypoint
+
+A failing task is logged and recorded as a "warmup" telemetry span; it never
+blocks readiness, the work is simply done on first use instead.
+
+Configuration (environment):
+    WARMUP_ENABLED: Set to 0 to skip warm-up (default 1)
+    WARMUP_TIMEOUT_SECONDS: Longest time the warm-up phase may take (default 60)
+    PPTX_WARM_WORKERS: Set to 1 to start the warm pptx workers (default 0)
+"""
+
+import asyncio
+import inspect
+import logging
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Hashable
+
+from agentskills.prompt import ROOT_DIR
+from .agent_pool import AgentPool
+from .telemetry import TELEMETRY
+
+logger = logging.getLogger("strands_agent.warmup")
+
+PPTX_SCRIPTS_DIR = ROOT_DIR / "skills" / "pptx" / "scripts"
+
+# Same defaults as skills/pptx/scripts/warm_worker.py and warm_worker.js
+PPTX_WORKERS = {
+    "python": ([sys.executable, "warm_worker.py", "serve"], "PPTX_WORKER_SOCKET", "/tmp/pptx_py_worker.sock"),
+    "node": (["node", "warm_worker.js", "serve"], "PPTX_NODE_WORKER_SOCKET", "/tmp/pptx_node_worker.sock"),
+}
+
+_worker_processes: list[subprocess.Popen] = []
+
+
+class WarmupPhase:
+    """Concurrent startup tasks with a readiness signal"""
+
+    def __init__(self, timeout_seconds: float = 60, enabled: bool = True):
+        """
+        Args:
+            timeout_seconds: Longest time the whole phase may take before it counts as ready
+            enabled: When False, the phase is ready immediately and runs nothing
+        """
+        self.timeout_seconds = timeout_seconds
+        self.enabled = enabled
+        self.results: dict[str, dict] = {}  # Task name -> status, duration_ms, error
+        self._tasks: dict[str, Callable[[], Any]] = {}
+        self._shutdown: list[Callable[[], Any]] = []
+        self._ready: asyncio.Event | None = None
+        self._runner: asyncio.Task | None = None
+
+    def add(self, name: str, func: Callable[[], Any], on_shutdown: Callable[[], Any] | None = None) -> None:
+        """Register a warm-up task
+
+        Args:
+            name: Task name (used in results and telemetry)
+            func: Sync function (run in a worker thread) or coroutine function
+            on_shutdown: Optional sync cleanup run when the server shuts down
+        """
+        self._tasks[name] = func
+        if on_shutdown is not None:
+            self._shutdown.append(on_shutdown)
+
+    @property
+    def ready(self) -> bool:
+        return not self.enabled or (self._ready is not None and self._ready.is_set())
+
+    def start(self) -> asyncio.Task | None:
+        """Start the warm-up in the background on the running loop (idempotent)"""
+        if not self.enabled:
+            return None
+        if self._runner is None:
+            self._ready = asyncio.Event()
+            self._runner = asyncio.create_task(self._run())
+        return self._runner
+
+    async def wait_ready(self, timeout: float | None = None) -> bool:
+        """Wait until warm-up finished (starting it if the server did not)
+
+        Returns:
+            True if warm-up completed, False if `timeout` expired first
+        """
+        if self.ready:
+            return True
+        self.start()
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.ready
+
+    @asynccontextmanager
+    async def lifespan(self, app: Any) -> AsyncIterator[None]:
+        """Starlette lifespan: start warm-up with the server, clean up on shutdown"""
+        self.start()
+        try:
+            yield
+        finally:
+            if self._runner is not None and not self._runner.done():
+                self._runner.cancel()
+            for cleanup in self._shutdown:
+                try:
+                    cleanup()
+                except Exception:
+                    logger.warning("Warm-up cleanup failed", exc_info=True)
+
+    async def _run(self) -> None:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(self._run_task(name, func) for name, func in self._tasks.items())),
+                timeout=self.timeout_seconds,
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Warm-up timed out after %.0f s", self.timeout_seconds)
+        finally:
+            self._ready.set()
+            logger.info("Warm-up finished in %.0f ms: %s", (time.perf_counter() - started) * 1000, self.results)
+
+    async def _run_task(self, name: str, func: Callable[[], Any]) -> None:
+        started = time.perf_counter()
+        try:
+            with TELEMETRY.span("warmup", task=name):
+                if inspect.iscoroutinefunction(func):
+                    await func()
+                else:
+                    await asyncio.to_thread(func)
+        except Exception as e:
+            self.results[name] = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+        else:
+            self.results[name] = {"status": "ok"}
+        self.results[name]["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+
+def warm_agent(pool: AgentPool, model_id: Hashable) -> None:
+    """Build an agent into the pool and open its Bedrock connection
+
+    Building the agent imports strands and the tools. A cheap ListAsyncInvokes
+    call on the agent's own client then resolves the boto3 credentials and
+    completes the TLS handshake, so the first ConverseStream reuses both.
+    """
+    agent = pool.checkout(model_id)
+    try:
+        client = getattr(agent.model, "client", None)
+        if client is not None:
+            from botocore.exceptions import ClientError
+
+            try:
+                client.list_async_invokes(maxResults=1)
+            except ClientError:
+                pass  # e.g. AccessDenied: credentials and connection are warm all the same
+    finally:
+        pool.checkin(model_id, agent)
+
+
+def warm_skills() -> None:
+    """Discover the bundled skills (parses every SKILL.md frontmatter once)"""
+    from agentskills import discover_skills
+
+    discover_skills(ROOT_DIR / "skills")
+
+
+def _socket_alive(path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+def start_pptx_workers(wait_seconds: float = 15) -> None:
+    """Start the warm pptx workers (Python and Node) unless they are already running
+
+    The workers preload python-pptx / pptxgenjs so the pptx scripts run by the
+    shell tool skip those imports (see skills/pptx/scripts/warm_worker.py).
+    Opt-in with PPTX_WARM_WORKERS=1: the Node worker runs jobs in its own
+    process, without the shell tool's resource limits.
+    """
+    if os.name != "posix" or os.environ.get("PPTX_WARM_WORKERS", "0") != "1":
+        return  # Disabled, or no Unix sockets
+    pending = []
+    for name, (command, socket_env, default_socket) in PPTX_WORKERS.items():
+        path = os.environ.get(socket_env, default_socket)
+        if _socket_alive(path) or shutil.which(command[0]) is None:
+            continue
+        _worker_processes.append(
+            subprocess.Popen(
+                command,
+                cwd=PPTX_SCRIPTS_DIR,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,  # Not part of any shell command's process group
+            )
+        )
+        pending.append((name, path))
+
+    deadline = time.monotonic() + wait_seconds
+    for name, path in pending:
+        while not _socket_alive(path):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{name} pptx worker did not start listening on {path}")
+            time.sleep(0.05)
+
+
+def stop_pptx_workers() -> None:
+    """Terminate the workers started by start_pptx_workers"""
+    while _worker_processes:
+        process = _worker_processes.pop()
+        if process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+WARMUP = WarmupPhase(
+    timeout_seconds=float(os.environ.get("WARMUP_TIMEOUT_SECONDS", "60")),
+    enabled=os.environ.get("WARMUP_ENABLED", "1") != "0",
+)
+
+
+__all__ = [
+    "WarmupPhase",
+    "warm_agent",
+    "warm_skills",
+    "start_pptx_workers",
+    "stop_pptx_workers",
+    "WARMUP",
+]
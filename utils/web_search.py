@@ -0,0 +1,224 @@
+"""Cached, concurrent web search for the agent tools
+
+Research-heavy decks issue many overlapping queries. WebSearcher runs them
+concurrently under a rate limit on its own bounded thread pool, reuses provider
+sessions (one per pool thread), de-duplicates results by URL across queries and
+keeps results in a TTL cache keyed by the normalized query.
+
+The search backend is pluggable: anything with a
+``search(query: str, max_results: int) -> list[dict]`` method returning dicts with
+``title``, ``body`` and ``href`` keys can be installed with set_search_provider(),
+e.g. a local fake provider in tests.
+"""
+
+import asyncio
+import importlib.util
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Protocol
+
+
+class SearchProvider(Protocol):
+    """Search backend interface"""
+
+    def search(self, query: str, max_results: int) -> list[dict]:
+        """Return result dicts with title, body and href keys"""
+        ...
+
+
+class DDGSProvider:
+    """DuckDuckGo provider that reuses one DDGS session per thread
+
+    DDGS is not documented as thread-safe, and WebSearcher runs searches in
+    its pool threads, so each of those threads gets its own session. ddgs is
+    imported on the first search rather than at module import.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    @property
+    def available(self) -> bool:
+        return importlib.util.find_spec("ddgs") is not None
+
+    def search(self, query: str, max_results: int) -> list[dict]:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            try:
+                from ddgs import DDGS
+            except ImportError:
+                raise RuntimeError("duckduckgo_search package missing")
+            client = self._local.client = DDGS()
+        return list(client.text(query, max_results=max_results))
+
+
+class TTLCache:
+    """Small LRU cache whose entries expire after `ttl_seconds`"""
+
+    def __init__(self, ttl_seconds: float = 900, max_entries: int = 512):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RateLimiter:
+    """Async limiter allowing at most `rate` calls per second"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock: asyncio.Lock | None = None
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query for cache lookups (case and whitespace insensitive)"""
+    return re.sub(r"\s+", " ", query).strip().lower()
+
+
+class WebSearcher:
+    """Runs searches through a provider with caching, rate limiting and URL de-duplication"""
+
+    def __init__(
+        self,
+        provider: SearchProvider | None = None,
+        cache: TTLCache | None = None,
+        max_concurrency: int = 4,
+        rate_per_second: float = 2.0,
+    ):
+        self.provider = provider or DDGSProvider()
+        self.cache = cache if cache is not None else TTLCache()  # An empty cache is falsy
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = RateLimiter(rate_per_second)
+        # Provider calls only run on these threads, which bounds the provider sessions too
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="web-search")
+
+    def search(self, query: str, max_results: int = 5) -> list[dict]:
+        """Search a single query synchronously (cached)"""
+        key = (normalize_query(query), max_results)
+        results = self.cache.get(key)
+        if results is None:
+            results = self._executor.submit(self.provider.search, query, max_results).result()
+            self.cache.set(key, results)
+        return results
+
+    async def search_many(self, queries: list[str], max_results: int = 5) -> dict[str, list[dict] | Exception]:
+        """Search several queries concurrently
+
+        Duplicate queries (after normalization) are searched once.
+
+        Returns:
+            Mapping of each distinct query, as first spelled in `queries`, to its
+            results or to the exception raised by the provider
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        pending: dict[str, str] = {}
+        for query in queries:
+            pending.setdefault(normalize_query(query), query)
+
+        async def run(query: str) -> list[dict]:
+            key = (normalize_query(query), max_results)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+            async with semaphore:
+                await self.rate_limiter.wait()
+                results = await loop.run_in_executor(self._executor, self.provider.search, query, max_results)
+            self.cache.set(key, results)
+            return results
+
+        outcomes = await asyncio.gather(*(run(q) for q in pending.values()), return_exceptions=True)
+        return dict(zip(pending.values(), outcomes))
+
+
+def dedupe_by_url(results_per_query: dict[str, list[dict]]) -> list[tuple[str, dict]]:
+    """Flatten results keeping only the first occurrence of each URL
+
+    Returns:
+        (query, result) pairs in query order
+    """
+    seen: set[str] = set()
+    merged = []
+    for query, results in results_per_query.items():
+        for result in results:
+            url = result.get("href", "")
+            key = url.rstrip("/").lower()
+            if key and key in seen:
+                continue
+            seen.add(key)
+            merged.append((query, result))
+    return merged
+
+
+def format_result(result: dict) -> str:
+    """Format a result the way the search tools return it to the model"""
+    return f"Title: {result.get('title', '')}\nSnippet: {result.get('body', '')}\nURL: {result.get('href', '')}"
+
+
+WEB_SEARCHER = WebSearcher(
+    max_concurrency=int(os.environ.get("SEARCH_MAX_CONCURRENCY", "4")),
+    rate_per_second=float(os.environ.get("SEARCH_RATE_PER_SECOND", "2")),
+)
+
+
+def set_search_provider(provider: SearchProvider) -> None:
+    """Install a different search backend (clears the cache)"""
+    WEB_SEARCHER.provider = provider
+    WEB_SEARCHER.cache.clear()
+
+
+__all__ = [
+    "SearchProvider",
+    "DDGSProvider",
+    "TTLCache",
+    "RateLimiter",
+    "WebSearcher",
+    "WEB_SEARCHER",
+    "normalize_query",
+    "dedupe_by_url",
+    "format_result",
+    "set_search_provider",
+]